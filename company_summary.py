@@ -0,0 +1,168 @@
+import os
+import threading
+import pandas as pd
+from data_loader import DataLoader, column_types, get_store
+
+# Colonnes lues pour construire le résumé des entreprises
+SUMMARY_COLUMNS = {
+    'objects': ['id', 'name', 'category_code', 'status', 'founded_at'],
+    'funding_rounds': ['object_id', 'funded_at', 'funding_round_code', 'raised_amount',
+                       'raised_amount_usd', 'pre_money_valuation_usd'],
+    'milestones': ['object_id', 'milestone_at', 'source_url'],
+    'offices': ['object_id', 'city', 'state_code', 'region', 'country_code', 'latitude', 'longitude'],
+}
+SUMMARY_TABLES = list(SUMMARY_COLUMNS)
+
+# Dernier résumé construit par dossier de données : {dossier: (versions des tables, résumé)}
+_summaries = {}
+_lock = threading.Lock()
+
+
+def _reduce(chunks, *reducers):
+    """Apply per-group reductions to each chunk, then to the concatenated partial results,
+    in a single pass over the chunks; returns one result per reducer (None without chunks)"""
+    partials = [None] * len(reducers)
+    for chunk in chunks:
+        for i, reduce_chunk in enumerate(reducers):
+            part = reduce_chunk(chunk)
+            partials[i] = part if partials[i] is None else \
+                reduce_chunk(pd.concat([partials[i], part], ignore_index=True))
+    return partials
+
+
+def _latest(frame, date_column):
+    # Ligne la plus récente de chaque entité ; à date égale, la dernière du fichier
+    if date_column in frame:
+        frame = frame.sort_values(date_column, kind='stable', na_position='first')
+    return frame.groupby('object_id', observed=True).tail(1)
+
+
+def _first(frame, date_column=None):
+    # Première ligne de chaque entité, par date puis dans l'ordre du fichier
+    if date_column is not None and date_column in frame:
+        frame = frame.sort_values(date_column, kind='stable', na_position='last')
+    return frame.drop_duplicates('object_id')
+
+
+def _total(frame):
+    # Montant levé par entité ; sans montant connu, la somme reste manquante
+    column = next((column for column in ('total_raised_usd', 'raised_amount_usd', 'raised_amount')
+                   if column in frame), None)
+    if column is None:
+        return pd.DataFrame(columns=['object_id', 'total_raised_usd'])
+    sums = frame.groupby('object_id', observed=True)[column].sum(min_count=1)
+    return sums.rename('total_raised_usd').reset_index()
+
+
+def _latest_valuation(frame):
+    if 'pre_money_valuation_usd' not in frame:
+        return frame.iloc[:0]
+    return _latest(frame.dropna(subset=['pre_money_valuation_usd']), 'funded_at')
+
+
+def _first_milestone(frame):
+    if 'source_url' not in frame:
+        return frame.iloc[:0]
+    return _first(frame.dropna(subset=['source_url']), 'milestone_at')
+
+
+def _keyed(frame, columns):
+    """Index a reduced frame by entity id, keeping the given columns (absent ones as NA)"""
+    if frame is None:
+        return pd.DataFrame(columns=columns)
+    frame = frame.dropna(subset=['object_id']).set_index('object_id')
+    return frame.reindex(columns=columns)
+
+
+def build_company_summary(loader):
+    """Build one row per objects.id with the company's latest funding, first milestone and main office.
+
+    Every table is streamed in full, whatever the loader has loaded.
+    Args:
+        loader (DataLoader): Loader giving access to the tables.
+    Returns:
+        DataFrame: Indexed by objects.id, with the columns name, category_code,
+            status, founded_at, latest_round_code, latest_round_at,
+            latest_raised_amount, total_raised_usd, last_valuation_usd,
+            milestone_url, city, state_code, region, country_code, latitude
+            and longitude.
+    """
+    def chunks(name):
+        if not loader.has_table(name):
+            return iter(())
+        available = loader.store.csv_columns(name)
+        return loader.iter_chunks(name, [column for column in SUMMARY_COLUMNS[name] if column in available])
+
+    objects, = _reduce(chunks('objects'), lambda frame: frame.drop_duplicates('id'))
+    if objects is None:
+        return pd.DataFrame()
+    summary = objects.dropna(subset=['id']).set_index('id')
+    summary = summary.reindex(columns=['name', 'category_code', 'status', 'founded_at'])
+
+    # Financements : dernier tour par date, total levé, dernière valorisation connue
+    latest, totals, valuations = _reduce(chunks('funding_rounds'), lambda frame: _latest(frame, 'funded_at'),
+                                         _total, _latest_valuation)
+    latest = _keyed(latest, ['funding_round_code', 'funded_at', 'raised_amount'])
+    latest.columns = ['latest_round_code', 'latest_round_at', 'latest_raised_amount']
+    milestones, = _reduce(chunks('milestones'), _first_milestone)
+    offices, = _reduce(chunks('offices'), _first)
+
+    summary = summary.join([
+        latest,
+        _keyed(totals, ['total_raised_usd']),
+        _keyed(valuations, ['pre_money_valuation_usd']).rename(
+            columns={'pre_money_valuation_usd': 'last_valuation_usd'}),
+        _keyed(milestones, ['source_url']).rename(columns={'source_url': 'milestone_url'}),
+        _keyed(offices, SUMMARY_COLUMNS['offices'][1:]),
+    ])
+    # Les catégories diffèrent d'un bloc à l'autre : on les reconstruit sur le résumé
+    for column, dtype in column_types('objects', ['category_code', 'status']).items():
+        if dtype == 'category':
+            summary[column] = summary[column].astype('category')
+    return summary
+
+
+def company_summary(store=None, build=True):
+    """Return the company summary for the current data, see build_company_summary.
+
+    It is built once per version of the tables, saved as a snapshot and shared
+    by every caller of the process.
+    Args:
+        store (DataStore, optional): Store to read the tables from; the shared store by default.
+        build (bool): If False, only return the summary last built for the store's
+            data, without checking the tables or reading anything; None if there is none.
+    """
+    store = store if store is not None else get_store()
+    data_dir = os.path.abspath(store.data_dir)
+    if not build:
+        with _lock:
+            built = _summaries.get(data_dir)
+        return built[1] if built is not None else None
+    # Un loader sans requête : la clé ne dépend que des fichiers, pas de ce qu'un onglet a chargé
+    loader = DataLoader(store)
+    try:
+        versions = repr(loader.data_version(SUMMARY_TABLES))
+        with _lock:
+            built = _summaries.get(data_dir)
+            if built is None or built[0] != versions:
+                built = (versions, loader.snapshot('company_summary', SUMMARY_TABLES,
+                                                   lambda: build_company_summary(loader)))
+                _summaries[data_dir] = built
+            return built[1]
+    finally:
+        loader.release()
+
+
+def company_row(summary, company_id):
+    """Return the summary row of a company as a dict, or None if it is unknown
+    Args:
+        summary (DataFrame): See company_summary.
+        company_id: Id of the company, as stored in the tables.
+    """
+    try:
+        position = summary.index.get_loc(company_id)
+    except (KeyError, TypeError):
+        return None
+    if not isinstance(position, int):  # Identifiant en double
+        return None
+    return summary.iloc[position].to_dict()
@@ -1,87 +1,1054 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
+from snapshot import MISSING, SnapshotStore, snapshot_key
 
-class DataLoader:
-    def __init__(self):
-        self.companies = None
-        self.people = None
-        self.relationships = None
-        self.investments = None
-        self.offices = None
-        self.funding_rounds = None
-        
-    def load_data(self, n_rows=5000):  # Add n_rows parameter with default None
-        """Load all CSV files into pandas DataFrames
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # Sans pyarrow, on relit toujours les CSV
+    pa = feather = None
+
+DATA_DIR = 'data'
+CACHE_DIR = '.cache'
+SNAPSHOT_DIR = 'snapshots'
+CACHE_FORMAT = 3
+CHUNK_ROWS = 100000
+# Nombre de tables lues en parallèle par défaut
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+# Fichier CSV de chaque table
+TABLE_FILES = {
+    'people': 'people.csv',
+    'relationships': 'relationships.csv',
+    'degrees': 'degrees.csv',
+    'investments': 'investments.csv',
+    'offices': 'offices.csv',
+    'funding_rounds': 'funding_rounds.csv',
+    'objects': 'objects.csv',
+    'funds': 'funds.csv',
+    'milestones': 'milestones.csv',
+    'ipos': 'ipos.csv',
+    'acquisitions': 'acquisitions.csv',
+}
+
+
+# Types déclarés pour chaque table. Les colonnes absentes sont ignorées, toutes
+# les colonnes *_at sont converties en datetime64 et les colonnes non déclarées
+# sont lues comme des chaînes. Le type 'id' désigne les identifiants
+# "<type>:<numéro>" (p:1697, c:123...), encodés en entiers, voir encode_ids.
+SCHEMAS = {
+    'people': {
+        'id': 'int32',
+        'object_id': 'id',
+    },
+    'objects': {
+        'id': 'id',
+        'parent_id': 'id',
+        'entity_id': 'int32',
+        'entity_type': 'category',
+        'category_code': 'category',
+        'status': 'category',
+        'country_code': 'category',
+        'state_code': 'category',
+        'region': 'category',
+        'logo_width': 'float32',
+        'logo_height': 'float32',
+        'investment_rounds': 'float32',
+        'invested_companies': 'float32',
+        'funding_rounds': 'float32',
+        'milestones': 'float32',
+        'relationships': 'float32',
+        'funding_total_usd': 'float64',
+    },
+    'degrees': {
+        'id': 'int32',
+        'object_id': 'id',
+        'degree_type': 'category',
+        'institution': 'category',
+    },
+    'relationships': {
+        'id': 'int32',
+        'relationship_id': 'int32',
+        'person_object_id': 'id',
+        'relationship_object_id': 'id',
+        'is_past': 'Int8',
+        'sequence': 'float32',
+    },
+    'investments': {
+        'id': 'int32',
+        'funding_round_id': 'int32',
+        'funded_object_id': 'id',
+        'investor_object_id': 'id',
+    },
+    'offices': {
+        'id': 'int32',
+        'object_id': 'id',
+        'office_id': 'int32',
+        'region': 'category',
+        'city': 'category',
+        'state_code': 'category',
+        'country_code': 'category',
+        'latitude': 'float32',
+        'longitude': 'float32',
+    },
+    'funding_rounds': {
+        'id': 'int32',
+        'funding_round_id': 'int32',
+        'object_id': 'id',
+        'funding_round_type': 'category',
+        'funding_round_code': 'category',
+        'raised_currency_code': 'category',
+        'pre_money_currency_code': 'category',
+        'post_money_currency_code': 'category',
+        'raised_amount_usd': 'float64',
+        'raised_amount': 'float64',
+        'pre_money_valuation_usd': 'float64',
+        'pre_money_valuation': 'float64',
+        'post_money_valuation_usd': 'float64',
+        'post_money_valuation': 'float64',
+        'participants': 'float32',
+        'is_first_round': 'Int8',
+        'is_last_round': 'Int8',
+    },
+    'funds': {
+        'id': 'int32',
+        'fund_id': 'int32',
+        'object_id': 'id',
+        'raised_amount': 'float64',
+        'raised_currency_code': 'category',
+    },
+    'milestones': {
+        'id': 'int32',
+        'object_id': 'id',
+        'milestone_code': 'category',
+    },
+    'ipos': {
+        'id': 'int32',
+        'ipo_id': 'int32',
+        'object_id': 'id',
+        'valuation_amount': 'float64',
+        'valuation_currency_code': 'category',
+        'raised_amount': 'float64',
+        'raised_currency_code': 'category',
+    },
+    'acquisitions': {
+        'id': 'int32',
+        'acquisition_id': 'int32',
+        'acquiring_object_id': 'id',
+        'acquired_object_id': 'id',
+        'term_code': 'category',
+        'price_amount': 'float64',
+        'price_currency_code': 'category',
+    },
+}
+
+# Colonnes utilisées par la carte
+LOCATION_COLUMNS = ['object_id', 'city', 'state_code', 'country_code',
+                    'latitude', 'longitude', 'region']
+
+# Colonne indexée par défaut pour les recherches par entité, voir DataLoader.lookup
+INDEX_COLUMNS = {
+    'people': 'object_id',
+    'degrees': 'object_id',
+    'relationships': 'person_object_id',
+    'milestones': 'object_id',
+    'funding_rounds': 'object_id',
+    'offices': 'object_id',
+    'ipos': 'object_id',
+}
+
+# Modes de typage : 'infer' laisse pandas deviner, 'typed' applique le schéma
+# en ignorant les valeurs invalides, 'strict' lève SchemaError au moindre écart.
+SCHEMA_MODES = ('infer', 'typed', 'strict')
+
+
+class SchemaError(ValueError):
+    """Raised in strict mode when a table does not match its declared schema"""
+
+
+# Identifiants : le type d'entité ('p', 'c', 'f'...) occupe les 32 bits de poids
+# fort de la clé et le numéro les 32 bits de poids faible. L'encodage ne dépend
+# que de la valeur, donc une même clé désigne la même entité dans toutes les
+# tables, tous les blocs et tous les fichiers du cache.
+ID_PATTERN = re.compile(r'([a-z]{1,3}):(\d{1,9})')
+ID_DTYPE = 'Int64'
+
+
+def encode_id(value):
+    """Return the integer key of an id such as 'p:1697', or None if it is not an id"""
+    if isinstance(value, str):
+        match = ID_PATTERN.fullmatch(value)
+        if match:
+            prefix, number = match.groups()
+            return (int.from_bytes(prefix.encode('ascii'), 'big') << 32) | int(number)
+    return None
+
+
+def decode_id(key):
+    """Return the string form ('p:1697') of an id key; strings are returned unchanged"""
+    if isinstance(key, str) or key is None or pd.isna(key):
+        return key if isinstance(key, str) else None
+    key = int(key)
+    prefix = (key >> 32).to_bytes(3, 'big').lstrip(b'\0').decode('ascii')
+    return f"{prefix}:{key & 0xFFFFFFFF}"
+
+
+def encode_ids(values):
+    """Encode string ids as a nullable Int64 Series; invalid or missing ids become <NA>
+    Args:
+        values (Series or list): Ids such as 'p:1697'.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+    # Un même identifiant revient souvent (degrees, relationships) : seules les
+    # valeurs distinctes sont analysées.
+    codes, uniques = pd.factorize(series)
+    keys = pd.array([encode_id(value) for value in uniques], dtype=ID_DTYPE)
+    return pd.Series(keys.take(codes, allow_fill=True), index=series.index, name=series.name)
+
+
+def decode_ids(keys):
+    """Decode a Series of id keys back to their string form, for display"""
+    codes, uniques = pd.factorize(keys)
+    decoded = pd.array([decode_id(key) for key in uniques], dtype=object)
+    return pd.Series(decoded.take(codes, allow_fill=True), index=keys.index, name=keys.name)
+
+
+def id_columns(name):
+    """Return the columns of a table declared as ids"""
+    return [column for column, dtype in SCHEMAS.get(name, {}).items() if dtype == 'id']
+
+
+def decode_frame(frame, name):
+    """Return a copy of a table with its id columns decoded, e.g. for an export"""
+    frame = frame.copy()
+    for column in id_columns(name):
+        if column in frame.columns and not pd.api.types.is_object_dtype(frame[column]):
+            frame[column] = decode_ids(frame[column])
+    return frame
+
+
+def column_types(name, columns):
+    """Return the declared dtype of each of the given columns of a table"""
+    declared = SCHEMAS.get(name, {})
+    types = {}
+    for column in columns:
+        if column.endswith('_at'):
+            types[column] = 'datetime64[ns]'
+        elif column in declared:
+            types[column] = declared[column]
+    return types
+
+
+def string_columns(name, columns):
+    """Return the columns of a table that are parsed as strings (categoricals and ids included)"""
+    declared = SCHEMAS.get(name, {})
+    return [column for column in columns
+            if not column.endswith('_at') and declared.get(column, 'category') in ('category', 'id')]
+
+
+def nullable_dtype(dtype):
+    """Return the nullable pandas dtype of a numpy integer dtype, e.g. 'Int32' for 'int32', or None"""
+    return dtype.capitalize() if dtype in ('int8', 'int16', 'int32', 'int64') else None
+
+
+def apply_schema(frame, name, strict=False, columns=None):
+    """Cast the columns of a table to their declared dtypes
+    Args:
+        frame (DataFrame): Table as parsed from the CSV file.
+        name (str): Table name, see SCHEMAS.
+        strict (bool): Raise SchemaError on missing columns or invalid values
+            instead of keeping the inferred dtype. Otherwise an integer column
+            with missing values gets the nullable dtype (Int32 for int32), and
+            a column that cannot be cast is reported and keeps its dtype.
+        columns (list, optional): Projection the frame was read with. If None,
+            every declared column is expected.
+    """
+    if strict:
+        expected = set(SCHEMAS.get(name, {}))
+        if columns is not None:
+            expected &= set(columns)
+        missing = expected - set(frame.columns)
+        if missing:
+            raise SchemaError(f"{name}: missing columns {sorted(missing)}")
+    for column, dtype in column_types(name, frame.columns).items():
+        try:
+            if dtype == 'datetime64[ns]':
+                frame[column] = pd.to_datetime(frame[column], format='ISO8601',
+                                               errors='raise' if strict else 'coerce')
+            elif dtype == 'id':
+                keys = encode_ids(frame[column])
+                if strict and (keys.isna() & frame[column].notna()).any():
+                    raise ValueError("invalid ids")
+                frame[column] = keys
+            else:
+                frame[column] = frame[column].astype(dtype)
+        except (ValueError, TypeError) as e:
+            if strict:
+                raise SchemaError(f"{name}.{column}: cannot convert to {dtype} ({e})") from e
+            error = e
+            # Valeurs manquantes dans une colonne d'entiers : type nullable équivalent
+            nullable = nullable_dtype(dtype)
+            if nullable is not None and frame[column].hasnans:
+                try:
+                    frame[column] = frame[column].astype(nullable)
+                    continue
+                except (ValueError, TypeError) as cast_error:
+                    error = cast_error
+            print(f"Error typing {name}.{column} as {dtype}: {error}")
+    return frame
+
+
+def schema_signature(name, mode):
+    """Return a short hash identifying the schema a cached table was built with"""
+    declared = json.dumps(SCHEMAS.get(name, {}), sort_keys=True)
+    return hashlib.sha1(f"{mode}:{declared}".encode()).hexdigest()[:12]
+
+
+def file_hash(path, block_size=1 << 20):
+    """Return the SHA-1 of a file's content"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TableCache:
+    """Feather copies of the CSV files, rebuilt when the source file changes.
+
+    Each table is stored as <name>.feather next to a <name>.json holding the
+    size, mtime and SHA-1 of the CSV it was built from. A changed size means
+    a rebuild; a changed mtime only triggers one if the content hash differs.
+    A table typed with another schema is rebuilt as well.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _data_path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.feather")
+
+    def _meta_path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def _read_meta(self, name):
+        try:
+            with open(self._meta_path(name), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, name, meta):
+        tmp_path = self._meta_path(name) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path(name))
+
+    def is_fresh(self, name, csv_path, schema=None):
+        """Return True if the cached copy matches the current CSV file and schema"""
+        meta = self._read_meta(name)
+        if meta is None or meta.get('format') != CACHE_FORMAT:
+            return False
+        if meta.get('schema') != schema:
+            return False
+        if not os.path.exists(self._data_path(name)):
+            return False
+        stat = os.stat(csv_path)
+        if stat.st_size != meta['size']:
+            return False
+        if stat.st_mtime_ns != meta['mtime_ns']:
+            # Fichier touché : on ne reconstruit que si le contenu a changé
+            if file_hash(csv_path) != meta['sha1']:
+                return False
+            meta['mtime_ns'] = stat.st_mtime_ns
+            self._write_meta(name, meta)
+        return True
+
+    def signature(self, name):
+        """Return the SHA-1 of the CSV the cached table was built from"""
+        meta = self._read_meta(name)
+        return meta['sha1'] if meta else None
+
+    def columns(self, name):
+        """Return the column names of a cached table"""
+        return pa.ipc.open_file(self._data_path(name)).schema.names
+
+    def read(self, name, columns=None, n_rows=None):
+        """Read a cached table, only materializing the requested columns and rows"""
+        table = feather.read_table(self._data_path(name), columns=columns, memory_map=True)
+        if n_rows is not None:
+            table = table.slice(0, n_rows)
+        return _to_pandas(name, table)
+
+    def num_rows(self, name):
+        """Return the number of rows of a cached table, without reading it"""
+        return feather.read_table(self._data_path(name), columns=[], memory_map=True).num_rows
+
+    def iter_chunks(self, name, columns=None, chunksize=CHUNK_ROWS):
+        """Yield a cached table in chunks; the file is memory-mapped, not read at once"""
+        table = feather.read_table(self._data_path(name), columns=columns, memory_map=True)
+        for batch in table.to_batches(max_chunksize=chunksize):
+            yield _to_pandas(name, pa.Table.from_batches([batch]))
+
+    def write(self, name, csv_path, chunks, schema=None):
+        """Write a table from an iterator of typed chunks, one record batch per chunk"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        stat = os.stat(csv_path)
+        meta = {
+            'format': CACHE_FORMAT,
+            'schema': schema,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha1': file_hash(csv_path),
+        }
+        tmp_path = self._data_path(name) + '.tmp'
+        writer = None
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    arrow_schema = _arrow_schema(name, chunk)
+                    writer = pa.ipc.new_file(tmp_path, arrow_schema)
+                # Les catégories diffèrent d'un bloc à l'autre : on stocke des chaînes
+                for column in chunk.select_dtypes('category').columns:
+                    chunk[column] = chunk[column].astype(object)
+                writer.write_table(pa.Table.from_pandas(chunk, schema=arrow_schema, preserve_index=False))
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            raise ValueError(f"{name} is empty")
+        os.replace(tmp_path, self._data_path(name))
+        self._write_meta(name, meta)
+
+
+# Type pandas de chaque entier stocké dans le cache, valeurs manquantes comprises
+_NULLABLE_INTS = {}
+if pa is not None:
+    _NULLABLE_INTS = {pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype(),
+                      pa.int32(): pd.Int32Dtype(), pa.int64(): pd.Int64Dtype()}
+
+
+def _to_pandas(name, table):
+    """Convert a cached Arrow table to pandas, restoring the declared categoricals and ids"""
+    declared = SCHEMAS.get(name, {})
+    for i, field in enumerate(table.schema):
+        if declared.get(field.name) == 'category' and pa.types.is_string(field.type):
+            table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+    # Entiers lus en types nullables, comme depuis le CSV : ceux déclarés en
+    # numpy (int32) le redeviennent s'il ne leur manque aucune valeur
+    frame = table.to_pandas(types_mapper=_NULLABLE_INTS.get)
+    for column in frame.columns:
+        dtype = declared.get(column)
+        if nullable_dtype(dtype) is not None and not frame[column].hasnans:
+            frame[column] = frame[column].astype(dtype)
+    return frame
+
+
+def _arrow_schema(name, chunk):
+    """Arrow schema of a cached table, derived from the declared types so every chunk matches"""
+    declared = SCHEMAS.get(name, {})
+    fields = []
+    for column, dtype in chunk.dtypes.items():
+        declared_type = declared.get(column)
+        if column.endswith('_at'):
+            arrow_type = pa.timestamp('ns')
+        elif declared_type is None or declared_type == 'category':
+            arrow_type = pa.string()
+        elif declared_type == 'id':
+            arrow_type = pa.int64()
+        else:
+            arrow_type = pa.from_numpy_dtype(pd.api.types.pandas_dtype(declared_type.lower()))
+        fields.append(pa.field(column, arrow_type))
+    return pa.schema(fields)
+
+
+class RowIndex:
+    """Positions of the rows of a table grouped by the value of one column.
+
+    The rows are sorted once by key (stable, so each group keeps the file
+    order) and a hash table maps every key to its slice of that order. Looking
+    up an entity then costs O(1) instead of a scan of the whole column.
+    """
+
+    def __init__(self, keys):
+        codes, uniques = pd.factorize(keys)  # les valeurs manquantes ont le code -1
+        self._order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[self._order]
+        groups = np.arange(len(uniques))
+        self._starts = np.searchsorted(sorted_codes, groups, side='left')
+        self._stops = np.searchsorted(sorted_codes, groups, side='right')
+        self._keys = pd.Index(uniques)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def rows(self, key, limit=None):
+        """Return the positions of the rows holding `key`, in file order
         Args:
-            n_rows (int, optional): Number of rows to read from each file. If None, read all rows.
+            key: Value looked up.
+            limit (int, optional): Only return positions below this row count,
+                for a loader that sees a prefix of the table.
         """
         try:
-            self.people = pd.read_csv('data/people.csv', nrows=n_rows)
-            self.relationships = pd.read_csv('data/relationships.csv', nrows=n_rows)
-            self.degrees = pd.read_csv('data/degrees.csv', nrows=n_rows)
-
-            self.investments = pd.read_csv('data/investments.csv', nrows=n_rows)
-            self.offices = pd.read_csv('data/offices.csv', nrows=n_rows)
-            self.funding_rounds = pd.read_csv('data/funding_rounds.csv', nrows=n_rows)
-            self.objects = pd.read_csv('data/objects.csv', nrows=n_rows)
-            self.funds = pd.read_csv('data/funds.csv', nrows=n_rows)
-            self.milestones = pd.read_csv('data/milestones.csv', nrows=n_rows)
-            self.ipos = pd.read_csv('data/ipos.csv', nrows=n_rows)
+            group = self._keys.get_loc(key)
+        except (KeyError, TypeError):
+            return np.empty(0, dtype=np.intp)
+        rows = self._order[self._starts[group]:self._stops[group]]
+        return rows if limit is None else rows[rows < limit]
+
+
+def _covers(loaded, wanted):
+    """Return True if a row budget already loaded includes the wanted one (None means all rows)"""
+    return loaded is None or (wanted is not None and wanted <= loaded)
+
+
+def _covers_columns(loaded, wanted):
+    """Return True if a loaded projection includes the wanted one (None means all columns)"""
+    return loaded is None or (wanted is not None and wanted <= loaded)
+
+
+def _merge_budgets(a, b):
+    return None if a is None or b is None else max(a, b)
+
+
+def _merge_columns(a, b):
+    return None if a is None or b is None else a | b
+
+
+class DataStore:
+    """Process-wide, reference-counted store of the parsed tables.
+
+    Each table is parsed once and shared read-only by every DataLoader. It is
+    served at the largest row budget any consumer asked for, and dropped once
+    its last consumer releases it. Consumers must copy a frame before
+    modifying it.
+
+    Consumers may declare the columns they use; only the union of the
+    projections requested on a table is read.
+
+    With pyarrow installed, every CSV is converted once to a Feather file in
+    <data_dir>/.cache and later loads read that copy instead. Values derived
+    from the tables are saved in <data_dir>/.cache/snapshots, see
+    DataLoader.snapshot.
+
+    Tables are typed with SCHEMAS according to `schema` (see SCHEMA_MODES).
+    The cache is only used for typed tables.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, use_cache=True, schema='typed'):
+        if schema not in SCHEMA_MODES:
+            raise ValueError(f"Unknown schema mode: {schema}")
+        self.data_dir = data_dir
+        self.schema = schema
+        self.cache = None
+        if use_cache and feather is not None:
+            self.cache = TableCache(os.path.join(data_dir, CACHE_DIR))
+        self.snapshots = SnapshotStore(os.path.join(data_dir, CACHE_DIR, SNAPSHOT_DIR))
+        self._tables = {}   # name -> DataFrame
+        self._budgets = {}  # name -> number of rows loaded (None = all)
+        self._columns = {}  # name -> frozenset of loaded columns (None = all)
+        self._refs = {}     # name -> set of consumer keys
+        self._indexes = {}  # name -> {column: RowIndex}
+        self._lock = threading.RLock()
+        self._table_locks = {}  # name -> Lock, un seul chargement à la fois par table
+
+    def path(self, name):
+        return os.path.join(self.data_dir, TABLE_FILES[name])
+
+    def acquire(self, consumer, name, n_rows=None, columns=None):
+        """Register `consumer` on a table and return the shared frame
+        Args:
+            consumer (hashable): Key identifying the consumer.
+            name (str): Table name, see TABLE_FILES.
+            n_rows (int, optional): Rows needed by the consumer. If None, all rows.
+            columns (list, optional): Columns used by the consumer. If None, all columns.
+        """
+        wanted = frozenset(columns) if columns is not None else None
+        # Les appels concurrents sur une même table attendent le premier
+        # chargement ; des tables différentes se chargent en parallèle.
+        with self._table_lock(name):
+            with self._lock:
+                if name in self._tables:
+                    budget, projection = self._budgets[name], self._columns[name]
+                    needs_load = not (_covers(budget, n_rows) and _covers_columns(projection, wanted))
+                    budget = _merge_budgets(budget, n_rows)
+                    projection = _merge_columns(projection, wanted)
+                else:
+                    needs_load = True
+                    budget, projection = n_rows, wanted
+            if needs_load:
+                frame = self._read(name, budget, projection)
+                with self._lock:
+                    self._indexes.pop(name, None)
+                    self._tables[name] = frame
+                    self._budgets[name] = budget
+                    self._columns[name] = projection
+            with self._lock:
+                self._refs.setdefault(name, set()).add(consumer)
+                return self._tables[name]
+
+    def _table_lock(self, name):
+        with self._lock:
+            return self._table_locks.setdefault(name, threading.Lock())
+
+    def is_loaded(self, name):
+        return name in self._tables
+
+    def covers(self, name, n_rows=None, columns=None):
+        """Return True if a table is loaded with at least the given rows and columns,
+        so that acquiring it reads nothing
+        Args:
+            n_rows (int, optional): Rows needed. If None, all rows.
+            columns (frozenset, optional): Columns needed. If None, all columns.
+        """
+        with self._lock:
+            return (name in self._tables and _covers(self._budgets[name], n_rows)
+                    and _covers_columns(self._columns[name], columns))
+
+    def _project(self, name, available, projection):
+        """Return the requested columns present in the table, in file order"""
+        if projection is None:
+            return None
+        missing = projection - set(available)
+        if missing and self.schema == 'strict':
+            raise SchemaError(f"{name}: missing columns {sorted(missing)}")
+        return [column for column in available if column in projection]
+
+    def csv_columns(self, name):
+        return list(pd.read_csv(self.path(name), nrows=0).columns)
+
+    def read_csv(self, name, n_rows=None, columns=None, chunksize=None):
+        """Parse a CSV file, typed according to the schema mode
+        Args:
+            n_rows (int, optional): Number of rows to read. If None, read all rows.
+            columns (list, optional): Columns to read. If None, read all columns.
+            chunksize (int, optional): If given, return an iterator of chunks.
+        """
+        dtype = None
+        if self.schema != 'infer':
+            dtype = {column: object for column in
+                     string_columns(name, columns if columns is not None else self.csv_columns(name))}
+        reader = pd.read_csv(self.path(name), nrows=n_rows, usecols=columns, dtype=dtype,
+                             chunksize=chunksize, low_memory=False)
+        if self.schema == 'infer':
+            return reader
+        strict = self.schema == 'strict'
+        if chunksize is None:
+            return apply_schema(reader, name, strict, columns)
+        return (apply_schema(chunk, name, strict, columns) for chunk in reader)
 
+    def _cached(self, name):
+        """Return True if the table can be read from the cache, building the cache if needed.
+        Must be called with the table's lock held."""
+        if self.cache is None or self.schema == 'infer':
+            return False
+        path = self.path(name)
+        schema = schema_signature(name, self.schema)
+        if self.cache.is_fresh(name, path, schema):
+            return True
+        # Premier chargement : le CSV est converti bloc par bloc, sans être matérialisé
+        try:
+            self.cache.write(name, path, self.read_csv(name, chunksize=CHUNK_ROWS), schema)
             return True
+        except SchemaError:
+            raise
         except Exception as e:
-            print(f"Error loading data: {e}")
+            print(f"Error caching {name}: {e}")
             return False
-        
-    def load_data_map(self, n_rows=5000):  # Add n_rows parameter with default None
-        """Load CSV files into pandas DataFrames
+
+    def _read(self, name, n_rows, projection):
+        if self._cached(name):
+            columns = self._project(name, self.cache.columns(name), projection)
+            return self.cache.read(name, columns, n_rows)
+        columns = self._project(name, self.csv_columns(name), projection)
+        return self.read_csv(name, n_rows, columns)
+
+    def iter_chunks(self, name, columns=None, chunksize=CHUNK_ROWS):
+        """Yield every row of a table as typed chunks, without keeping the table in memory
         Args:
-            n_rows (int, optional): Number of rows to read from each file. If None, read all rows.
+            name (str): Table name, see TABLE_FILES.
+            columns (list, optional): Columns to read. If None, read all columns.
+            chunksize (int): Maximum number of rows per chunk.
         """
+        projection = frozenset(columns) if columns is not None else None
+        with self._table_lock(name):
+            cached = self._cached(name)
+        if cached:
+            columns = self._project(name, self.cache.columns(name), projection)
+            yield from self.cache.iter_chunks(name, columns, chunksize)
+        else:
+            columns = self._project(name, self.csv_columns(name), projection)
+            yield from self.read_csv(name, columns=columns, chunksize=chunksize)
+
+    def prepare(self, name):
+        """Build the cached copy of a table ahead of time, e.g. for a table that is only streamed
+        Returns:
+            bool: True if the table will be read from the cache.
+        """
+        with self._table_lock(name):
+            return self._cached(name)
+
+    def row_count(self, name):
+        """Return the number of rows of a table's file, or None if it is not known without reading it"""
         try:
-            self.offices = pd.read_csv('data/offices.csv', nrows=n_rows)
-            self.objects = pd.read_csv('data/objects.csv', nrows=n_rows)
-            return True
+            return self.cache.num_rows(name) if self.prepare(name) else None
         except Exception as e:
-            print(f"Error loading data: {e}")
-            return False
-        
-    def load_data_network(self, n_rows=5000):  # Add n_rows parameter with default None
-        """Load all CSV files into pandas DataFrames
+            print(f"Error counting rows of {name}: {e}")
+            return None
+
+    def version(self, name):
+        """Return a string identifying the content of a table's file and how it is typed,
+        or None if the file does not exist"""
+        path = self.path(name)
+        if not os.path.exists(path):
+            return None
+        if self.prepare(name):
+            content = self.cache.signature(name)
+        else:
+            # Sans cache, on évite de hacher tout le fichier à chaque lancement
+            stat = os.stat(path)
+            content = f"{stat.st_size}:{stat.st_mtime_ns}"
+        return f"{self.schema}:{content}"
+
+    def get(self, name):
+        """Return the shared frame of a table, or None if it is not loaded"""
+        return self._tables.get(name)
+
+    def index(self, name, column):
+        """Return the RowIndex of a loaded table on one column, built on first use
+        and kept until the table is reloaded or evicted"""
+        with self._table_lock(name):
+            frame = self._tables.get(name)
+            if frame is None or column not in frame.columns:
+                return None
+            indexes = self._indexes.setdefault(name, {})
+            if column not in indexes:
+                indexes[column] = RowIndex(frame[column])
+            return indexes[column]
+
+    def release(self, consumer, names=None):
+        """Drop the consumer's references, evicting tables nobody uses anymore"""
+        with self._lock:
+            for name in list(names if names is not None else self._refs):
+                refs = self._refs.get(name)
+                if refs is None:
+                    continue
+                refs.discard(consumer)
+                if not refs:
+                    del self._refs[name]
+                    self._tables.pop(name, None)
+                    self._budgets.pop(name, None)
+                    self._columns.pop(name, None)
+                    self._indexes.pop(name, None)
+
+    def loaded_tables(self):
+        with self._lock:
+            return {name: self._budgets[name] for name in self._tables}
+
+
+def _group_keys(chunk, by):
+    return by(chunk) if callable(by) else chunk[by]
+
+
+def stream_filter(chunks, where):
+    """Return the rows of a chunked table matching `where`
+    Args:
+        chunks (iterable): DataFrames, e.g. from DataLoader.iter_chunks.
+        where (callable): Function of a chunk returning a boolean mask.
+    """
+    parts = [chunk[where(chunk)] for chunk in chunks]
+    if not parts:
+        return pd.DataFrame()
+    # On garde au moins un bloc vide pour conserver les colonnes
+    matched = [part for part in parts if len(part)] or parts[:1]
+    return pd.concat(matched, ignore_index=True)
+
+
+def stream_group_count(chunks, by, where=None):
+    """Count rows per group over a chunked table
+    Args:
+        chunks (iterable): DataFrames, e.g. from DataLoader.iter_chunks.
+        by (str, list or callable): Grouping column(s), or a function of a chunk
+            returning the grouping key(s) as accepted by DataFrame.groupby.
+        where (callable, optional): Function of a chunk returning a boolean mask
+            of the rows to count.
+    """
+    counts = None
+    for chunk in chunks:
+        if where is not None:
+            chunk = chunk[where(chunk)]
+        part = chunk.groupby(_group_keys(chunk, by), observed=True).size()
+        counts = part if counts is None else counts.add(part, fill_value=0)
+    return counts.astype('int64') if counts is not None else pd.Series(dtype='int64')
+
+
+def stream_group_sum(chunks, by, column, where=None):
+    """Sum a column per group over a chunked table, see stream_group_count"""
+    sums = None
+    for chunk in chunks:
+        if where is not None:
+            chunk = chunk[where(chunk)]
+        part = chunk.groupby(_group_keys(chunk, by), observed=True)[column].sum()
+        sums = part if sums is None else sums.add(part, fill_value=0)
+    return sums if sums is not None else pd.Series(dtype='float64')
+
+
+def stream_top_k(chunks, column, k, largest=True):
+    """Return the k rows with the largest (or smallest) values of a column"""
+    best = None
+    for chunk in chunks:
+        candidates = chunk if best is None else pd.concat([best, chunk], ignore_index=True)
+        best = candidates.nlargest(k, column) if largest else candidates.nsmallest(k, column)
+    return best.reset_index(drop=True) if best is not None else pd.DataFrame()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide DataStore, creating it on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DataStore()
+        return _store
+
+
+class _SharedTable:
+    """Attribute exposing the store's frame for a table this loader requested.
+
+    The table is only read the first time the attribute is accessed. The store
+    may hold more rows than this loader asked for; the loader then sees a
+    prefix view of the shared frame, without copying it.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, loader, owner=None):
+        if loader is None:
+            return self
+        if self.name not in loader._requests:
+            return None
+        frame = loader._table(self.name)
+        budget = loader._requests[self.name][0]
+        if frame is None or budget is None or len(frame) <= budget:
+            return frame
+        return frame.iloc[:budget]
+
+
+class DataLoader:
+    people = _SharedTable()
+    relationships = _SharedTable()
+    degrees = _SharedTable()
+    investments = _SharedTable()
+    offices = _SharedTable()
+    funding_rounds = _SharedTable()
+    objects = _SharedTable()
+    funds = _SharedTable()
+    milestones = _SharedTable()
+    ipos = _SharedTable()
+    acquisitions = _SharedTable()
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else get_store()
+        self.companies = None
+        self._requests = {}    # name -> (n_rows, frozenset of columns) asked for
+        self._acquired = set()  # tables whose current request the store has served
+        self._key = object()
+        # Libère les tables quand le loader est détruit
+        self._finalizer = weakref.finalize(self, self.store.release, self._key)
+
+    def load(self, names, n_rows=5000, columns=None):
+        """Declare the tables this loader uses; each one is read on first access.
+        A table the store already holds with enough rows and columns is taken
+        right away, so it stays loaded whoever else releases it.
         Args:
+            names (list): Table names, see TABLE_FILES.
             n_rows (int, optional): Number of rows to read from each file. If None, read all rows.
+            columns (dict, optional): Columns used per table. Tables not listed are read whole.
         """
+        columns = columns or {}
+        for name in names:
+            if not self.has_table(name):
+                print(f"Error loading data: {self.store.path(name)} not found")
+                return False
+        for name in names:
+            wanted = frozenset(columns[name]) if columns.get(name) is not None else None
+            table_rows = n_rows
+            if name in self._requests:
+                budget, projection = self._requests[name]
+                wanted = _merge_columns(projection, wanted)
+                table_rows = _merge_budgets(budget, n_rows)
+            if self._requests.get(name) != (table_rows, wanted):
+                self._requests[name] = (table_rows, wanted)
+                self._acquired.discard(name)
+            if name not in self._acquired and self.store.covers(name, table_rows, wanted):
+                self._table(name)
+        return True
+
+    def _table(self, name):
+        """Return the shared frame of a requested table, reading it if needed"""
+        if name in self._acquired:
+            frame = self.store.get(name)
+            if frame is not None:
+                return frame
+        n_rows, projection = self._requests[name]
         try:
-            self.people = pd.read_csv('data/people.csv', nrows=n_rows)
-            self.relationships = pd.read_csv('data/relationships.csv', nrows=n_rows)
-            self.degrees = pd.read_csv('data/degrees.csv', nrows=n_rows)
-            return True
+            frame = self.store.acquire(self._key, name, n_rows, projection)
         except Exception as e:
             print(f"Error loading data: {e}")
-            return False
-        
-    def load_data_analysis(self, n_rows=5000):  # Add n_rows parameter with default None
+            return None
+        self._acquired.add(name)
+        return frame
+
+    def load_all(self, tables=None, workers=None, progress=None):
+        """Read requested tables concurrently and wait until they are loaded
+        Args:
+            tables (list, optional): Tables to read. If None, every requested table.
+            workers (int, optional): Number of tables read at the same time.
+                If None, DEFAULT_WORKERS.
+            progress (callable, optional): Called as progress(name, done, total)
+                each time a table is loaded.
+        Returns:
+            bool: True if every table was loaded.
+        """
+        names = [name for name in (tables if tables is not None else list(self._requests))
+                 if name in self._requests]
+        if not names:
+            return True
+        # Des threads suffisent : pandas et pyarrow relâchent le GIL pendant la lecture
+        loaded = True
+        with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as pool:
+            futures = {pool.submit(self._table, name): name for name in names}
+            for done, future in enumerate(as_completed(futures), 1):
+                loaded = future.result() is not None and loaded
+                if progress is not None:
+                    progress(futures[future], done, len(names))
+        return loaded
+
+    def prefetch(self, tables=None, workers=None):
+        """Read requested tables in a background thread and return that thread
+        Args:
+            tables (list, optional): Tables to warm up. If None, every requested table.
+            workers (int, optional): Number of tables read at the same time.
+        """
+        thread = threading.Thread(target=self.load_all, args=(tables, workers), daemon=True)
+        thread.start()
+        return thread
+
+    def has_table(self, name):
+        """Return True if the table's CSV file exists"""
+        return os.path.exists(self.store.path(name))
+
+    def lookup(self, name, key, column=None):
+        """Return the rows of a table whose column equals `key`, without scanning the table
+        Args:
+            name (str): Table name, see TABLE_FILES.
+            key: Value looked up, e.g. an object id key.
+            column (str, optional): Column matched. If None, INDEX_COLUMNS[name].
+        Returns:
+            DataFrame: Matching rows in file order, or None if the table is not loaded.
+        """
+        frame = getattr(self, name, None)
+        if frame is None:
+            return None
+        column = column or INDEX_COLUMNS.get(name, 'object_id')
+        index = self.store.index(name, column)
+        if index is None:
+            return frame[frame[column] == key]
+        return frame.iloc[index.rows(key, len(frame))]
+
+    def data_version(self, names):
+        """Return what the given tables look like to this loader: file version, rows and columns"""
+        versions = []
+        for name in names:
+            n_rows, projection = self._requests.get(name, (None, None))
+            columns = sorted(projection) if projection is not None else None
+            versions.append([name, self.store.version(name), n_rows, columns])
+        return versions
+
+    def snapshot(self, name, tables, compute, params=None):
+        """Return a value derived from some tables, restored from disk while they are unchanged
+        Args:
+            name (str): Name of the snapshot file.
+            tables (list): Tables the value is computed from.
+            compute (callable): Function computing the value when there is no valid snapshot.
+            params (optional): Anything else the value depends on, see snapshot_key.
+        """
+        key = snapshot_key(self.data_version(tables), params)
+        value = self.store.snapshots.load(name, key)
+        if value is MISSING:
+            value = compute()
+            self.store.snapshots.save(name, key, value)
+        return value
+
+    def id_keys(self, ids):
+        """Return ids such as 'p:1697' in the form the tables store them
+        Args:
+            ids (list): Ids as strings, e.g. read back from profiles.json.
+        """
+        if self.store.schema == 'infer':
+            return list(ids)
+        return [key for key in map(encode_id, ids) if key is not None]
+
+    def iter_chunks(self, name, columns=None, chunksize=CHUNK_ROWS):
+        """Yield every row of a table as typed chunks, see DataStore.iter_chunks"""
+        return self.store.iter_chunks(name, columns, chunksize)
+
+    def release(self):
+        """Give the loaded tables back to the shared store"""
+        self.store.release(self._key)
+        self._requests.clear()
+        self._acquired.clear()
+
+    def load_data(self, n_rows=5000, columns=None):  # Add n_rows parameter with default None
         """Load all CSV files into pandas DataFrames
         Args:
             n_rows (int, optional): Number of rows to read from each file. If None, read all rows.
+            columns (dict, optional): Columns used per table. Tables not listed are read whole.
         """
-        try:
-            self.degrees = pd.read_csv('data/degrees.csv', nrows=n_rows)
-            self.investments = pd.read_csv('data/investments.csv', nrows=n_rows)
-            self.funding_rounds = pd.read_csv('data/funding_rounds.csv', nrows=n_rows)
-            self.objects = pd.read_csv('data/objects.csv', nrows=n_rows)
-            self.funds = pd.read_csv('data/funds.csv', nrows=n_rows)
-            self.ipos = pd.read_csv('data/ipos.csv', nrows=n_rows)
+        return self.load(['people', 'relationships', 'degrees', 'investments', 'offices',
+                          'funding_rounds', 'objects', 'funds', 'milestones', 'ipos'], n_rows, columns)
+
+    def load_data_map(self, n_rows=5000, columns=None):  # Add n_rows parameter with default None
+        """Load CSV files into pandas DataFrames
+        Args:
+            n_rows (int, optional): Number of rows to read from each file. If None, read all rows.
+            columns (dict, optional): Columns used per table. Tables not listed are read whole.
+        """
+        return self.load(['offices', 'objects'], n_rows, columns)
+
+    def load_data_network(self, n_rows=5000, columns=None):  # Add n_rows parameter with default None
+        """Load all CSV files into pandas DataFrames
+        Args:
+            n_rows (int, optional): Number of rows to read from each file. If None, read all rows.
+            columns (dict, optional): Columns used per table. Tables not listed are read whole.
+        """
+        return self.load(['people', 'relationships', 'degrees'], n_rows, columns)
+
+    def load_data_analysis(self, n_rows=5000, columns=None):  # Add n_rows parameter with default None
+        """Load all CSV files into pandas DataFrames
+        Args:
+            n_rows (int, optional): Number of rows to read from each file. If None, read all rows.
+            columns (dict, optional): Columns used per table. Tables not listed are read whole.
+        """
+        return self.load(['degrees', 'investments', 'funding_rounds', 'objects', 'funds', 'ipos'],
+                         n_rows, columns)
 
-            return True
-        except Exception as e:
-            print(f"Error loading data: {e}")
-            return False
-        
-    
-    
     def get_startup_locations(self):
         """Return offices data for mapping"""
         if self.offices is not None:
-            return self.offices[['object_id', 'city', 'state_code', 'country_code', 
-                                'latitude', 'longitude', 'region']].dropna(subset=['latitude', 'longitude'])
-        return pd.DataFrame()
\ No newline at end of file
+            return self.offices[LOCATION_COLUMNS].dropna(subset=['latitude', 'longitude'])
+        return pd.DataFrame()
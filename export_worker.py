@@ -0,0 +1,171 @@
+import os
+from PyQt5.QtCore import QThread, pyqtSignal
+from data_loader import decode_frame
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Sans pyarrow, pas d'export Parquet
+    pa = pq = None
+
+# Lignes écrites par bloc
+EXPORT_CHUNK_ROWS = 50000
+# Nombre maximal de lignes d'une feuille Excel, en-tête compris
+XLSX_MAX_ROWS = 1048576
+
+# Formats proposés : {filtre du dialogue de fichier: format}
+EXPORT_FORMATS = {
+    "CSV (*.csv)": 'csv',
+    "Parquet (*.parquet)": 'parquet',
+    "Excel (*.xlsx)": 'xlsx',
+}
+
+
+class ExportCancelled(Exception):
+    """Raised inside a writer when the export is cancelled"""
+
+
+def view_chunks(frame, rows, chunksize=EXPORT_CHUNK_ROWS):
+    """Yield the given rows of a frame, in order, one chunk at a time
+    Args:
+        frame (DataFrame): Source frame.
+        rows (ndarray): Positions of the rows to export, e.g. FrameView.rows.
+        chunksize (int): Maximum number of rows per chunk.
+    """
+    if len(rows) == 0:
+        yield frame.iloc[:0]  # Fichier avec les seuls en-têtes
+    for start in range(0, len(rows), chunksize):
+        yield frame.take(rows[start:start + chunksize])
+
+
+def _write_csv(path, chunks):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(f, header=header, index=False)
+            header = False
+            yield len(chunk)
+
+
+def _write_parquet(path, chunks):
+    if pq is None:
+        raise ImportError("pyarrow is required for Parquet exports")
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                # Une colonne vide dans le premier bloc peut être remplie plus loin
+                for i, field in enumerate(schema):
+                    if pa.types.is_null(field.type):
+                        schema = schema.set(i, field.with_type(pa.string()))
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_xlsx(path, chunks):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    n_rows = 1
+    for chunk in chunks:
+        if n_rows == 1:
+            sheet.append([str(column) for column in chunk.columns])
+        n_rows += len(chunk)
+        if n_rows > XLSX_MAX_ROWS:
+            raise ValueError(f"Excel sheets are limited to {XLSX_MAX_ROWS - 1} rows, use CSV or Parquet")
+        # Les valeurs manquantes deviennent des cellules vides
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False):
+            sheet.append(list(row))
+        yield len(chunk)
+    workbook.save(path)
+
+
+WRITERS = {
+    'csv': _write_csv,
+    'parquet': _write_parquet,
+    'xlsx': _write_xlsx,
+}
+
+
+def export_chunks(path, file_format, chunks, table=None, progress=None, cancelled=None):
+    """Write chunks of a table to a file; the file is only created if the export completes
+    Args:
+        path (str): Destination file.
+        file_format (str): 'csv', 'parquet' or 'xlsx', see WRITERS.
+        chunks (iterable): DataFrames to write, in order.
+        table (str, optional): Table the chunks come from; its id columns are written as text.
+        progress (callable, optional): Called with the number of rows written so far.
+        cancelled (callable, optional): Returns True when the export should stop.
+    Returns:
+        int: Number of rows written.
+    Raises:
+        ExportCancelled: If `cancelled` returned True; nothing is left on disk.
+    """
+    if table is not None:
+        chunks = (decode_frame(chunk, table) for chunk in chunks)
+    tmp_path = path + '.tmp'
+    n_rows = 0
+    try:
+        for written in WRITERS[file_format](tmp_path, chunks):
+            n_rows += written
+            if progress is not None:
+                progress(n_rows)
+            if cancelled is not None and cancelled():
+                raise ExportCancelled()
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return n_rows
+
+
+class ExportWorker(QThread):
+    """Writes a table to a file in a background thread.
+
+    `chunks` is a callable returning the chunks to write, so that reading the
+    data happens on the worker thread too. Call requestInterruption() to cancel;
+    the partial file is deleted.
+    """
+
+    # Avancement (0-100, -1 si le total est inconnu) et message
+    progress = pyqtSignal(int, str)
+    # Succès et message final
+    done = pyqtSignal(bool, str)
+
+    def __init__(self, path, file_format, chunks, table=None, total_rows=None, parent=None):
+        """
+        Args:
+            path (str): Destination file.
+            file_format (str): 'csv', 'parquet' or 'xlsx'.
+            chunks (callable): Returns an iterable of DataFrames to write.
+            table (str, optional): Table the chunks come from, for decoding ids.
+            total_rows (int, optional): Number of rows expected, for the progress.
+            parent (QObject, optional): Qt parent.
+        """
+        super().__init__(parent)
+        self.path = path
+        self.file_format = file_format
+        self.chunks = chunks
+        self.table = table
+        self.total_rows = total_rows
+
+    def _report(self, n_rows):
+        percent = min(100, n_rows * 100 // self.total_rows) if self.total_rows else -1
+        self.progress.emit(percent, f"{n_rows} lignes exportées")
+
+    def run(self):
+        try:
+            n_rows = export_chunks(self.path, self.file_format, self.chunks(), self.table,
+                                   self._report, self.isInterruptionRequested)
+            self.done.emit(True, f"{n_rows} lignes exportées vers {self.path}")
+        except ExportCancelled:
+            self.done.emit(False, "Export annulé")
+        except Exception as e:
+            print(f"Error exporting to {self.path}: {e}")
+            self.done.emit(False, f"Erreur lors de l'export : {e}")
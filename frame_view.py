@@ -0,0 +1,144 @@
+import re
+import numpy as np
+import pandas as pd
+from data_loader import decode_ids, encode_id
+
+# Filtre de comparaison : opérateur suivi d'une valeur, ex. ">= 1000000"
+COMPARISON_PATTERN = re.compile(r'\s*(>=|<=|!=|=|>|<)\s*(.*?)\s*$')
+
+OPERATORS = {
+    '=': lambda values, value: values == value,
+    '!=': lambda values, value: values != value,
+    '>': lambda values, value: values > value,
+    '>=': lambda values, value: values >= value,
+    '<': lambda values, value: values < value,
+    '<=': lambda values, value: values <= value,
+}
+
+
+class FrameView:
+    """Sorted and filtered view of a DataFrame, as an array of row positions.
+
+    The frame itself is never copied: sorting computes a permutation of the
+    rows with a vectorized argsort, cached per column so that switching the
+    direction or coming back to a column is free, and each column filter
+    computes a boolean mask. `rows` holds the positions of the visible rows,
+    in display order.
+    """
+
+    def __init__(self, frame, id_columns=()):
+        self.frame = frame
+        self.id_columns = set(id_columns)
+        self.rows = np.arange(len(frame))
+        self.sort_column = None
+        self.ascending = True
+        # Filtres actifs : {colonne: (expression, masque)}
+        self.filters = {}
+        # Tris déjà calculés : {colonne: (permutation croissante, nombre de valeurs non manquantes)}
+        self._orders = {}
+        # Identifiants décodés, pour filtrer sur leur forme texte : {colonne: (codes, textes)}
+        self._decoded = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _order(self, column):
+        """Return the ascending permutation of a column, missing values last"""
+        if column not in self._orders:
+            values = pd.Series(self.frame[column].array, copy=False)
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Catégories dans l'ordre d'apparition (cache Feather) : on trie sur leurs valeurs
+                values = values.cat.set_categories(values.cat.categories.sort_values(), ordered=True)
+            order = values.sort_values(kind='stable', na_position='last').index.to_numpy()
+            self._orders[column] = (order, int(values.notna().sum()))
+        return self._orders[column]
+
+    def sort(self, column, ascending=True):
+        """Sort the view on a column; None restores the frame's order
+        Args:
+            column (str): Column to sort on, or None.
+            ascending (bool): Sort direction; missing values always come last.
+        """
+        self.sort_column = column
+        self.ascending = ascending
+        self._update()
+
+    def set_filter(self, column, expression):
+        """Filter the view on a column; an empty expression removes the filter.
+
+        The expression is either a comparison ('> 1000', '= p:12', '!= USA'),
+        or a text searched, case-insensitively, in the column's values.
+        Filters on several columns are combined.
+        Args:
+            column (str): Column to filter.
+            expression (str): Filter expression.
+        Raises:
+            ValueError: If the value of a comparison does not fit the column.
+        """
+        expression = (expression or '').strip()
+        if not expression:
+            self.filters.pop(column, None)
+        else:
+            self.filters[column] = (expression, self._mask(column, expression))
+        self._update()
+
+    def clear_filters(self):
+        """Remove every filter"""
+        self.filters.clear()
+        self._update()
+
+    def _decoded_ids(self, column):
+        """Return the factorized text form of an id column"""
+        if column not in self._decoded:
+            codes, uniques = pd.factorize(self.frame[column])
+            texts = decode_ids(pd.Series(uniques)).fillna('').to_numpy(dtype=str)
+            self._decoded[column] = (codes, texts)
+        return self._decoded[column]
+
+    def _comparison_value(self, column, text):
+        """Convert the value of a comparison to the type of the column"""
+        values = self.frame[column]
+        if column in self.id_columns and not pd.api.types.is_object_dtype(values):
+            key = encode_id(text)
+            if key is None:
+                raise ValueError(f"invalid id '{text}'")
+            return key
+        if pd.api.types.is_bool_dtype(values):
+            return text.lower() in ('1', 'true', 'vrai', 'oui')
+        if pd.api.types.is_numeric_dtype(values):
+            return float(text)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return pd.Timestamp(text)
+        return text
+
+    def _mask(self, column, expression):
+        """Return the boolean mask of the rows matching an expression"""
+        values = self.frame[column]
+        match = COMPARISON_PATTERN.match(expression)
+        if match and match.group(2):
+            operator, text = match.groups()
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Catégories non ordonnées : on compare leurs valeurs
+                values = values.astype(object)
+            result = OPERATORS[operator](values, self._comparison_value(column, text))
+            return np.asarray(pd.Series(result, copy=False).fillna(False), dtype=bool)
+        needle = expression.lower()
+        if column in self.id_columns and not pd.api.types.is_object_dtype(values):
+            codes, texts = self._decoded_ids(column)
+            matches = np.char.find(np.char.lower(texts), needle) >= 0
+            return np.where(codes >= 0, matches[codes], False)
+        if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+            values = values.astype(str)
+        return values.str.contains(needle, case=False, regex=False, na=False).to_numpy(dtype=bool)
+
+    def _update(self):
+        """Recompute the visible rows from the current sort and filters"""
+        if self.sort_column is None:
+            rows = np.arange(len(self.frame))
+        else:
+            order, n_valid = self._order(self.sort_column)
+            rows = order if self.ascending else np.concatenate([order[:n_valid][::-1], order[n_valid:]])
+        if self.filters:
+            mask = np.logical_and.reduce([mask for _, mask in self.filters.values()])
+            rows = rows[mask[rows]]
+        self.rows = rows
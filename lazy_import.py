@@ -0,0 +1,78 @@
+import importlib
+import sys
+import threading
+import time
+
+# Durée d'import de chaque module importé via timed_import : {nom: secondes}
+IMPORT_TIMES = {}
+_lock = threading.Lock()
+
+
+def timed_import(name):
+    """Import a module, recording how long it took if it was not already imported"""
+    already_imported = name in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    if not already_imported:
+        with _lock:
+            IMPORT_TIMES.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class LazyImport:
+    """Stand-in for a module, or for one of its attributes, imported on first use.
+
+    Attribute access and calls are forwarded to the real object, so
+    `nx = lazy_import('networkx')` can be used like `import networkx as nx`
+    and `FigureCanvas = lazy_import('matplotlib.backends.backend_qt5agg',
+    'FigureCanvasQTAgg')` like the class itself, for construction.
+    """
+
+    def __init__(self, module, attribute=None):
+        self._module = module
+        self._attribute = attribute
+        self._target = None
+
+    def _load(self):
+        if self._target is None:
+            target = timed_import(self._module)
+            if self._attribute is not None:
+                target = getattr(target, self._attribute)
+            self._target = target
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        name = self._module + (f".{self._attribute}" if self._attribute else '')
+        state = 'loaded' if self._target is not None else 'not loaded'
+        return f"<lazy {name} ({state})>"
+
+
+def lazy_import(module, attribute=None):
+    """Return a LazyImport for a module, or for one attribute of it
+    Args:
+        module (str): Module name, e.g. 'sklearn.neighbors'.
+        attribute (str, optional): Name imported from the module, as in
+            `from module import attribute`.
+    """
+    return LazyImport(module, attribute)
+
+
+def import_report():
+    """Return the recorded import times as (module, seconds), slowest first"""
+    with _lock:
+        return sorted(IMPORT_TIMES.items(), key=lambda item: item[1], reverse=True)
+
+
+def print_import_report():
+    """Print how long each recorded module took to import"""
+    report = import_report()
+    print("Import times:")
+    for name, seconds in report:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+    print(f"  {sum(seconds for _, seconds in report) * 1000:8.1f} ms  total")
@@ -1,43 +1,64 @@
 import sys
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QTimer
-from mainwindow import MainWindow
+from PyQt5.QtCore import Qt, QCoreApplication
 from splash_screen import SplashScreen
+from lazy_import import lazy_import, print_import_report
+
+# Importés une fois l'écran de démarrage affiché (pandas, onglets...)
+mainwindow = lazy_import('mainwindow')
+startup_loader = lazy_import('startup_loader')
 
 def load_data(splash, window):
-    steps = [
-        (10, "Loading data files..."),
-        (30, "Initializing map..."),
-        (50, "Processing data..."),
-        (70, "Setting up interface..."),
-        (90, "Finalizing..."),
-        (100, "Ready!")
-    ]
-    
-    for i, (progress, message) in enumerate(steps):
-        def update(p=progress, m=message):
-            splash.update_progress(p, m)
-            if p == 100:
-                window.show()
-                splash.finish(window)
-        
-        # Add delay between updates
-        QTimer.singleShot(i * 500, update)
+    """Load every tab's data in a worker thread. The window is shown as soon
+    as the default tab's data is ready; the other tabs are built when first
+    opened, or in the background once everything is loaded."""
+    tabs = mainwindow.TABS
+    loader = startup_loader.StartupLoader(tabs, parent=window)
+
+    def report(progress, message):
+        if splash.isVisible():
+            splash.update_progress(progress, message)
+        else:
+            window.statusBar().showMessage(message, 3000)
+
+    def data_ready(key):
+        window.data_ready(key)
+        if key == tabs[0][0]:
+            window.show()
+            splash.finish(window)
+
+    loader.progress.connect(report)
+    loader.stage_ready.connect(data_ready)
+    loader.derived_ready.connect(window.derived_ready)
+    # Chaque étape garde ses tables jusqu'à ce que son onglet les ait prises
+    window.tab_built.connect(loader.release_stage)
+    loader.finished.connect(window.start_idle_build)
+    # À la fermeture, le chargement s'arrête après l'onglet en cours
+    QApplication.instance().aboutToQuit.connect(loader.requestInterruption)
+    QApplication.instance().aboutToQuit.connect(loader.wait)
+    loader.start()
+    return loader
 
 def main():
+    # QtWebEngine (onglet Carte) est importé après la création de l'application
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
-    
+    if '--import-report' in sys.argv:
+        app.aboutToQuit.connect(print_import_report)
+
     # Create and show splash screen
     splash = SplashScreen()
     splash.show()
-    
-    # Create main window (but don't show it yet)
-    window = MainWindow()
-    
+    splash.update_progress(0, "Loading modules...")
+    app.processEvents()
+
+    # Create main window (but don't show it yet); each tab is built when first opened
+    window = mainwindow.MainWindow(loading=[key for key, _, _ in mainwindow.TABS])
+
     # Start loading sequence
-    QTimer.singleShot(100, lambda: load_data(splash, window))
-    
+    load_data(splash, window)
+
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,4 +1,5 @@
-from PyQt5.QtWidgets import QMainWindow, QTabWidget, QWidget, QVBoxLayout
+from PyQt5.QtWidgets import QMainWindow, QTabWidget, QWidget, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from tabs.map_tab import MapTab
 from tabs.data_tab import DataTab
 from tabs.network_tab import NetworkTab
@@ -6,27 +7,141 @@ from tabs.prediction_tab import PredictionTab
 from tabs.investment_analysis_tab import InvestmentAnalysisTab
 from tabs.search_tab import SearchTab
 from tabs.profile_match_tab import ProfileMatchTab
+from tabs.profile_search_tab import ProfileSearchTab
 
-class MainWindow(QMainWindow):
+# Onglets dans l'ordre d'affichage : (clé, titre, classe)
+TABS = [
+    ('map', "Carte", MapTab),
+    ('data', "Données", DataTab),
+    ('network', "Réseaux", NetworkTab),
+    ('investment', "Analyse d'Investissement", InvestmentAnalysisTab),
+    ('profile_match', "Correspondance de Profil", ProfileMatchTab),
+    ('prediction', "Prédiction de Succès", PredictionTab),
+    ('search', "Recherche", SearchTab),
+    ('profile_search', "Recherche de Profils", ProfileSearchTab),
+]
+# Délai entre deux onglets construits en arrière-plan (ms)
+IDLE_BUILD_MS = 1000
+
+class LazyTab(QWidget):
+    """Lightweight page shown in the tab bar until the real tab is built"""
     def __init__(self):
+        super().__init__()
+        self.widget = None
+        self.failed = False
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.message = QLabel("Chargement des données...")
+        self.message.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.message)
+
+    def set_widget(self, widget):
+        self.message.hide()
+        self.layout().addWidget(widget)
+        self.widget = widget
+
+class MainWindow(QMainWindow):
+    # Clé d'un onglet construit, ou dont la construction a échoué
+    tab_built = pyqtSignal(str)
+
+    def __init__(self, lazy=True, loading=()):
+        """
+        Args:
+            lazy (bool): Only build a tab the first time it is shown. If False,
+                every tab is built right away.
+            loading (list): Keys of the tabs whose data is still being loaded;
+                they are built once data_ready is called for them.
+        """
         super().__init__()
         self.setWindowTitle("Startup Analysis Tool")
         self.setGeometry(100, 100, 1200, 800)
-        
+
         # Création du widget d'onglets
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
-        
-        # Création de l'onglet ProfileMatch en premier
-        self.profile_match_tab = ProfileMatchTab()
-        
-        # Ajout des onglets
-        self.tabs.addTab(MapTab(), "Carte")
-        self.tabs.addTab(DataTab(), "Données")
-        self.tabs.addTab(NetworkTab(), "Réseaux")
-        
-        
-        self.tabs.addTab(InvestmentAnalysisTab(), "Analyse d'Investissement")
-        self.tabs.addTab(self.profile_match_tab, "Correspondance de Profil")
-        self.tabs.addTab(PredictionTab(self.profile_match_tab), "Prédiction de Succès")
-        self.tabs.addTab(SearchTab(), "Recherche")
\ No newline at end of file
+        self.profile_match_tab = None
+        self._loading = set(loading)
+        self._idle_timer = None
+
+        # Ajout des onglets : une page vide par onglet, remplie à la première activation
+        self.pages = {}
+        for key, title, _ in TABS:
+            self.pages[key] = LazyTab()
+            self.tabs.addTab(self.pages[key], title)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+
+        if lazy:
+            self._on_tab_changed(self.tabs.currentIndex())
+        else:
+            for key, _, _ in TABS:
+                self.build_tab(key)
+
+    def _on_tab_changed(self, index):
+        for key, page in self.pages.items():
+            if page is self.tabs.widget(index):
+                self.build_tab(key)
+
+    def data_ready(self, key):
+        """Called once the data of a tab is loaded; builds it if it is the current tab"""
+        self._loading.discard(key)
+        if self.tabs.currentWidget() is self.pages[key]:
+            self.build_tab(key)
+
+    def derived_ready(self, key):
+        """Called once the data a tab derives from whole tables is built; a tab
+        already built is told through its derived_data_ready method, if it has one"""
+        refresh = getattr(self.pages[key].widget, 'derived_data_ready', None)
+        if refresh is not None:
+            refresh()
+
+    def build_tab(self, key):
+        """Build the tab registered under `key` in TABS, unless it is built or its data is loading
+        Returns:
+            QWidget: The tab, or None if it could not be built yet.
+        """
+        page = self.pages[key]
+        if page.widget is not None:
+            return page.widget
+        if key in self._loading:
+            return None
+        tab_class = next(tab for tab in TABS if tab[0] == key)[2]
+        try:
+            # L'onglet Prédiction réutilise les profils de l'onglet Correspondance
+            if tab_class is PredictionTab:
+                if self.build_tab('profile_match') is None:
+                    return None
+                tab = PredictionTab(self.profile_match_tab)
+            else:
+                tab = tab_class()
+        except Exception as e:
+            print(f"Error building tab {key}: {e}")
+            page.failed = True
+            page.message.setText(f"Error: {e}")
+            self.tab_built.emit(key)
+            return None
+        if tab_class is ProfileMatchTab:
+            self.profile_match_tab = tab
+        page.set_widget(tab)
+        self.tab_built.emit(key)
+        return tab
+
+    def build_next_tab(self):
+        """Build the first tab that is not built yet and whose data is ready
+        Returns:
+            bool: True if a tab was built.
+        """
+        for key, page in self.pages.items():
+            if page.widget is None and not page.failed and self.build_tab(key) is not None:
+                return True
+        return False
+
+    def start_idle_build(self, interval=IDLE_BUILD_MS):
+        """Build the remaining tabs one at a time in the background, every `interval` ms"""
+        if self._idle_timer is None:
+            self._idle_timer = QTimer(self)
+            self._idle_timer.timeout.connect(self._build_idle_tab)
+        self._idle_timer.start(interval)
+
+    def _build_idle_tab(self):
+        if not self.build_next_tab():
+            self._idle_timer.stop()
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from search_index import TokenIndex, intersect_sorted
+
+# Colonnes lues pour construire l'index des profils
+PROFILE_COLUMNS = {
+    'people': ['object_id', 'first_name', 'last_name'],
+    'degrees': ['object_id', 'institution'],
+    'relationships': ['person_object_id', 'relationship_object_id'],
+    'offices': ['object_id', 'city'],
+}
+# Champs de recherche d'un profil
+PROFILE_FIELDS = ['name', 'institution', 'city']
+
+
+class ProfileIndex:
+    """Per-field word indexes over people, for multi-criteria profile search.
+
+    Rows are the positions of the people table. `name` indexes first and last
+    names, `institution` the institutions of a person's degrees, and `city` the
+    cities of the offices of the companies a person has a relationship with.
+    A query gives a term per field; each field returns a sorted list of
+    positions and the lists are intersected, smallest first.
+    """
+
+    def __init__(self, people, degrees=None, relationships=None, offices=None):
+        """
+        Args:
+            people (DataFrame): People, with object_id, first_name and last_name.
+            degrees (DataFrame, optional): Degrees, with object_id and institution.
+            relationships (DataFrame, optional): Relationships, with person_object_id and relationship_object_id.
+            offices (DataFrame, optional): Offices, with object_id and city.
+        """
+        n_people = len(people)
+        # Position de chaque personne ; en cas de doublon, la première
+        ids = pd.Index(people['object_id'])
+        first = ~ids.duplicated()
+        person_ids, person_positions = ids[first], np.flatnonzero(first)
+        names = people['first_name'].fillna('').astype(str) + ' ' + people['last_name'].fillna('').astype(str)
+        self.fields = {'name': TokenIndex(names.str.strip(), np.arange(n_people), n_people)}
+
+        def person_texts(ids, texts):
+            # Rattache chaque texte à la position de la personne ; les inconnues sont écartées
+            found = person_ids.get_indexer(ids)
+            known = found >= 0
+            return TokenIndex(pd.Series(np.asarray(texts, dtype=object)[known]),
+                              person_positions[found[known]], n_people)
+
+        if degrees is not None:
+            self.fields['institution'] = person_texts(degrees['object_id'], degrees['institution'])
+        if relationships is not None and offices is not None:
+            # Villes des bureaux des entreprises liées à chaque personne
+            cities = offices.dropna(subset=['object_id', 'city']).drop_duplicates(['object_id', 'city'])
+            links = relationships.merge(cities, left_on='relationship_object_id', right_on='object_id')
+            self.fields['city'] = person_texts(links['person_object_id'], links['city'])
+        self.n_people = n_people
+
+    def __len__(self):
+        return self.n_people
+
+    def search(self, criteria):
+        """Return the sorted positions of the people matching every criterion
+        Args:
+            criteria (dict): {field: term}, see PROFILE_FIELDS; empty terms are ignored.
+                Every word of a term must start a word of the field.
+        """
+        postings = []
+        for field, term in criteria.items():
+            if not term or not term.strip():
+                continue
+            index = self.fields.get(field)
+            if index is None:  # Table absente : aucun profil ne peut correspondre
+                return np.array([], dtype=np.int64)
+            postings.append(index.search(term))
+        if not postings:
+            return np.arange(self.n_people)
+        return intersect_sorted(postings)
+
+    def values(self, field, position):
+        """Return the values of a field for a person, e.g. the institutions of their degrees"""
+        index = self.fields.get(field)
+        return index.values(position) if index is not None else []
@@ -0,0 +1,101 @@
+import sys
+from collections import OrderedDict
+
+# Mémoire maximale occupée par les résultats gardés, en octets (estimation)
+RESULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def rows_size(rows):
+    """Estimate the memory held by a list of result rows, in bytes"""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for cell in row:
+            size += sys.getsizeof(cell)
+            if isinstance(cell, tuple):  # Lien ('View', url)
+                size += sum(sys.getsizeof(part) for part in cell)
+    return size
+
+
+def normalize_term(term):
+    """Return a search term lowercased, with its whitespace collapsed"""
+    return ' '.join(term.lower().split())
+
+
+class ResultCache:
+    """Least recently used cache of search results.
+
+    Entries are keyed by (search type, normalized term, data version) and hold
+    the result rows built so far, with the number of matches; the least
+    recently used ones are dropped once the rows kept exceed `max_bytes`. When
+    a search type is looked up with a new data version, its entries for the
+    previous version are dropped, as they can no longer be hit.
+    """
+
+    def __init__(self, max_bytes=RESULT_CACHE_BYTES):
+        """
+        Args:
+            max_bytes (int): Memory cap of the rows kept, see rows_size.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.n_bytes = 0
+        self._entries = OrderedDict()  # (type, terme, version) -> (lignes, correspondances, taille)
+        self._versions = {}            # type -> version des entrées gardées
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _key(self, search_type, term, version):
+        version = repr(version)
+        if self._versions.get(search_type) != version:
+            self.invalidate(search_type)
+            self._versions[search_type] = version
+        return search_type, normalize_term(term), version
+
+    def get(self, search_type, term, version):
+        """Return the cached (rows, number of matches) of a search, or None
+        Args:
+            search_type (str): Kind of search, e.g. "Search Person".
+            term (str): Searched term, normalized with normalize_term.
+            version: Version of the tables the results are built from, e.g. DataLoader.data_version.
+        """
+        key = self._key(search_type, term, version)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[:2]
+
+    def put(self, search_type, term, version, rows, n_matches=None):
+        """Keep the rows of a search, evicting the least recently used ones over the cap
+        Args:
+            search_type (str): Kind of search.
+            term (str): Searched term.
+            version: Version of the tables the rows are built from.
+            rows (list): Result rows built so far, best first; results larger than the cap are not kept.
+            n_matches (int, optional): Number of matches, when only the first ones have rows.
+        """
+        key = self._key(search_type, term, version)
+        size = rows_size(rows)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.n_bytes -= self._entries.pop(key)[2]
+        self._entries[key] = (rows, len(rows) if n_matches is None else n_matches, size)
+        self.n_bytes += size
+        while self.n_bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.n_bytes -= evicted
+
+    def invalidate(self, search_type=None):
+        """Drop the entries of a search type, or every entry"""
+        for key in [key for key in self._entries if search_type is None or key[0] == search_type]:
+            self.n_bytes -= self._entries.pop(key)[2]
+        if search_type is None:
+            self._versions.clear()
+        else:
+            self._versions.pop(search_type, None)
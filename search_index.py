@@ -0,0 +1,446 @@
+import re
+import zlib
+import numpy as np
+import pandas as pd
+
+# Longueur des n-grammes indexés
+GRAM_SIZE = 3
+# Sépare les champs d'un même texte : aucun terme recherché ne le contient,
+# un terme ne peut donc pas correspondre à cheval sur deux champs
+FIELD_SEPARATOR = '\x1f'
+# Distance d'édition maximale de la recherche approximative
+MAX_EDIT_DISTANCE = 2
+# Seul ce préfixe des mots sert à générer les suppressions (comme SymSpell)
+PREFIX_LENGTH = 7
+TOKEN_PATTERN = re.compile(r'\w+')
+# Accents séparés des lettres par la décomposition NFKD
+COMBINING_MARKS = r'[\u0300-\u036f]'
+# Rangs des résultats, du meilleur au moins bon : nom égal au terme, commençant
+# par le terme (ou l'un de ses mots), le contenant, ou seulement approchant
+RANK_EXACT, RANK_PREFIX, RANK_SUBSTRING, RANK_FUZZY = range(4)
+
+
+def _fields_texts(frame, columns):
+    """Join the given text columns of each row, missing values as empty strings"""
+    fields = [frame[column].where(frame[column].notna(), '').astype(str) for column in columns]
+    return [FIELD_SEPARATOR.join(values) for values in zip(*fields)]
+
+
+def intersect_sorted(postings):
+    """Return the positions present in every one of several sorted position arrays
+    Args:
+        postings (list): Sorted arrays of distinct positions; at least one.
+    """
+    postings = sorted(postings, key=len)
+    candidates = postings[0]
+    for other in postings[1:]:
+        if not len(candidates):
+            break
+        # Appartenance par recherche dichotomique dans une liste triée
+        found = np.searchsorted(other, candidates)
+        found[found == len(other)] = 0
+        candidates = candidates[other[found] == candidates]
+    return candidates
+
+
+def normalize_texts(texts):
+    """Lowercase texts and strip their accents ('Université' -> 'universite'); missing ones become ''
+    Args:
+        texts (Series): Texts to normalize.
+    """
+    texts = texts.where(texts.notna(), '').astype(str)
+    return texts.str.normalize('NFKD').str.replace(COMBINING_MARKS, '', regex=True).str.lower()
+
+
+def _gram_keys(codes):
+    """Pack each run of GRAM_SIZE consecutive code points into one integer"""
+    keys = np.zeros(len(codes) - GRAM_SIZE + 1, dtype=np.uint64)
+    for i in range(GRAM_SIZE):
+        # 21 bits suffisent pour tout point de code Unicode
+        keys |= codes[i:len(codes) - GRAM_SIZE + 1 + i].astype(np.uint64) << np.uint64(21 * (GRAM_SIZE - 1 - i))
+    return keys
+
+
+def _text_codes(text):
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+class TrigramIndex:
+    """Inverted index of the trigrams of short texts, for substring search.
+
+    Texts are lowercased once, when the index is built. Trigrams are packed
+    into integers; `grams` holds the distinct ones, sorted, and the postings
+    of grams[g] (the sorted positions of the texts containing it) are
+    positions[offsets[g]:offsets[g + 1]]. A query intersects the postings of
+    its trigrams, starting with the shortest, then checks the few remaining
+    candidates against the text. Terms shorter than a trigram fall back to a
+    scan of the lowercased texts.
+    """
+
+    def __init__(self, texts):
+        """
+        Args:
+            texts (iterable): One text per row, None or NaN for missing values.
+        """
+        self.texts = np.array([text.lower() if isinstance(text, str) else '' for text in texts],
+                              dtype=object)
+        # Tous les textes bout à bout : on calcule les n-grammes de toutes les
+        # positions d'un coup et on écarte ceux qui chevauchent deux textes
+        lengths = np.fromiter(map(len, self.texts), dtype=np.int64, count=len(self.texts))
+        codes = _text_codes(''.join(self.texts))
+        if len(codes) < GRAM_SIZE:
+            keys, rows = np.array([], dtype=np.uint64), np.array([], dtype=np.int32)
+        else:
+            rows = np.repeat(np.arange(len(self.texts), dtype=np.int32), lengths)
+            keys = _gram_keys(codes)
+            inside = rows[:len(keys)] == rows[GRAM_SIZE - 1:]
+            keys, rows = keys[inside], rows[:len(keys)][inside]
+        # Tri stable : les positions restent croissantes pour chaque n-gramme,
+        # les doublons (n-gramme répété dans un texte) deviennent adjacents
+        order = np.argsort(keys, kind='stable')
+        keys, rows = keys[order], rows[order]
+        distinct = np.ones(len(keys), dtype=bool)
+        distinct[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+        keys, self.positions = keys[distinct], rows[distinct]
+        self.grams, starts = np.unique(keys, return_index=True)
+        self.offsets = np.append(starts, len(keys)).astype(np.int64)
+
+    @classmethod
+    def from_frame(cls, frame, columns):
+        """Index one or more text columns of a frame; a row matches if any of its columns does
+        Args:
+            frame (DataFrame): Source table.
+            columns (list): Text columns to index, e.g. ['first_name', 'last_name'].
+        """
+        return cls(_fields_texts(frame, columns))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def _postings(self, key):
+        gram = np.searchsorted(self.grams, key)
+        if gram == len(self.grams) or self.grams[gram] != key:
+            return None
+        return self.positions[self.offsets[gram]:self.offsets[gram + 1]]
+
+    def search(self, term, candidates=None):
+        """Return the sorted positions of the texts containing a term, case-insensitively
+        Args:
+            term (str): Substring to look for.
+            candidates (ndarray, optional): Sorted positions known to contain every
+                match, e.g. the matches of a shorter term contained in this one;
+                only those are checked.
+        """
+        term = term.lower()
+        if candidates is not None:
+            return self._verify(np.asarray(candidates), term)
+        if not term:
+            return np.arange(len(self.texts))
+        if len(term) < GRAM_SIZE:
+            return np.flatnonzero([term in text for text in self.texts])
+        postings = []
+        for key in np.unique(_gram_keys(_text_codes(term))):
+            gram_postings = self._postings(key)
+            if gram_postings is None:
+                return np.array([], dtype=np.int32)
+            postings.append(gram_postings)
+        candidates = intersect_sorted(postings)
+        if not len(candidates):
+            return candidates
+        # Les n-grammes peuvent être présents sans se suivre : on vérifie le texte
+        return self._verify(candidates, term)
+
+    def _verify(self, candidates, term):
+        """Keep the candidates whose text contains the (lowercased) term"""
+        texts = self.texts[candidates]
+        return candidates[np.fromiter((term in text for text in texts), dtype=bool, count=len(texts))]
+
+    def ranks(self, positions, term):
+        """Return the rank of the texts at the given positions, which contain a term, see match_ranks"""
+        return match_ranks(self.texts[positions], term)
+
+
+def scan_search(frame, columns, term, candidates=None):
+    """Return the sorted positions of the rows where any of the columns contains a term,
+    case-insensitively, by scanning the columns; gives the same positions as
+    TrigramIndex.from_frame(frame, columns).search
+    Args:
+        frame (DataFrame): Table to search.
+        columns (list): Text columns to search.
+        term (str): Substring to look for.
+        candidates (ndarray, optional): Sorted positions to restrict the scan to.
+    """
+    positions = np.arange(len(frame)) if candidates is None else np.asarray(candidates)
+    rows = frame.iloc[positions] if candidates is not None else frame
+    mask = np.zeros(len(rows), dtype=bool)
+    for column in columns:
+        values = rows[column].where(rows[column].notna(), '').astype(str)
+        mask |= values.str.lower().str.contains(term.lower(), regex=False).to_numpy(dtype=bool)
+    return positions[mask]
+
+
+def scan_ranks(frame, columns, positions, term):
+    """Return the rank of the rows at the given positions, which contain a term, without
+    an index; gives the same ranks as TrigramIndex.from_frame(frame, columns).ranks"""
+    return match_ranks(_fields_texts(frame.iloc[positions], columns), term)
+
+
+def allowed_distance(word):
+    """Return how many edits a query word may be away from a name word"""
+    if len(word) <= 2:
+        return 0
+    return 1 if len(word) <= 4 else MAX_EDIT_DISTANCE
+
+
+def edit_distance(a, b, max_distance):
+    """Return the optimal string alignment distance between two words (insertions,
+    deletions, substitutions and swaps of adjacent letters), or max_distance + 1
+    if it is larger than max_distance"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word, distance):
+    """Return the strings obtained by deleting up to `distance` letters from a word's prefix"""
+    results = {word[:PREFIX_LENGTH]}
+    frontier = set(results)
+    for _ in range(distance):
+        frontier = {text[:i] + text[i + 1:] for text in frontier for i in range(len(text))}
+        results |= frontier
+    return results
+
+
+def _hash(text):
+    # Hachage stable d'un processus à l'autre (l'index est sauvegardé dans un instantané) ;
+    # les collisions ne font qu'ajouter des candidats, tous vérifiés ensuite
+    return zlib.crc32(text.encode('utf-8'))
+
+
+class FuzzyIndex:
+    """Approximate name search, tolerant to typos ('jonh smith' finds 'John Smith').
+
+    Texts are split into lowercased words. Following SymSpell, every word of
+    the vocabulary is stored under each string obtained by deleting up to
+    MAX_EDIT_DISTANCE letters from its prefix; a query word generates its own
+    deletions, and the vocabulary words sharing one of them are the candidates,
+    checked with the edit distance. The deletions are kept as sorted hashes in
+    numpy arrays, and each vocabulary word maps to the sorted positions of the
+    texts containing it, as in TrigramIndex.
+
+    A text scores the mean, over the query words, of the best similarity
+    (1 - distance / length) of its words to that query word.
+    """
+
+    def __init__(self, texts):
+        """
+        Args:
+            texts (iterable): One text per row, None or NaN for missing values.
+        """
+        word_ids = {}
+        words, rows = [], []
+        n_texts = 0
+        for row, text in enumerate(texts):
+            n_texts += 1
+            if not isinstance(text, str):
+                continue
+            for word in set(TOKEN_PATTERN.findall(text.lower())):
+                words.append(word_ids.setdefault(word, len(word_ids)))
+                rows.append(row)
+        self.n_texts = n_texts
+        self.words = np.array(list(word_ids), dtype=object)
+        # Positions des textes contenant chaque mot : rows[offsets[w]:offsets[w + 1]]
+        words = np.array(words, dtype=np.int32)
+        order = np.argsort(words, kind='stable')
+        self.rows = np.array(rows, dtype=np.int32)[order]
+        self.offsets = np.zeros(len(word_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(words, minlength=len(word_ids)), out=self.offsets[1:])
+        # Suppressions de chaque mot du vocabulaire, triées par hachage
+        hashes, delete_words = [], []
+        for word_id, word in enumerate(self.words):
+            word_hashes = [_hash(text) for text in _deletes(word, MAX_EDIT_DISTANCE)]
+            hashes.extend(word_hashes)
+            delete_words.extend([word_id] * len(word_hashes))
+        hashes = np.array(hashes, dtype=np.uint32)
+        order = np.argsort(hashes, kind='stable')
+        self.delete_hashes = hashes[order]
+        self.delete_words = np.array(delete_words, dtype=np.int32)[order]
+
+    @classmethod
+    def from_frame(cls, frame, columns):
+        """Index one or more text columns of a frame, see TrigramIndex.from_frame"""
+        return cls(_fields_texts(frame, columns))
+
+    def __len__(self):
+        return self.n_texts
+
+    def similar_words(self, word):
+        """Return {vocabulary word id: similarity} for the words close to a query word"""
+        word = word.lower()
+        max_distance = allowed_distance(word)
+        hashes = np.array([_hash(text) for text in _deletes(word, max_distance)], dtype=np.uint32)
+        starts = np.searchsorted(self.delete_hashes, hashes, side='left')
+        stops = np.searchsorted(self.delete_hashes, hashes, side='right')
+        candidates = np.unique(np.concatenate([self.delete_words[start:stop]
+                                               for start, stop in zip(starts, stops)] or [[]]).astype(np.int32))
+        similar = {}
+        for word_id in candidates:
+            candidate = self.words[word_id]
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                similar[int(word_id)] = 1 - distance / max(len(word), len(candidate))
+        return similar
+
+    def search(self, query, k=100):
+        """Return the positions of the k texts closest to a query, best first, and their scores
+        Args:
+            query (str): Words to look for, e.g. 'jonh smith'.
+            k (int): Maximum number of results.
+        Returns:
+            tuple: (positions, scores) as numpy arrays; scores are in (0, 1], 1 for an exact match.
+        """
+        query_words = TOKEN_PATTERN.findall(query.lower())
+        if not query_words:
+            return np.array([], dtype=np.int64), np.array([])
+        scores = np.zeros(self.n_texts)
+        for word in query_words:
+            # Meilleure similarité de chaque texte pour ce mot de la requête
+            best = np.zeros(self.n_texts)
+            for word_id, similarity in self.similar_words(word).items():
+                rows = self.rows[self.offsets[word_id]:self.offsets[word_id + 1]]
+                best[rows] = np.maximum(best[rows], similarity)
+            scores += best
+        scores /= len(query_words)
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        # Meilleurs scores d'abord, puis ordre de la table
+        order = np.lexsort((matched, -scores[matched]))
+        return matched[order], scores[matched[order]]
+
+
+def _match_rank(text, term):
+    fields = [field for field in text.split(FIELD_SEPARATOR) if field]
+    name = ' '.join(fields)
+    if name == term or term in fields:
+        return RANK_EXACT
+    if f" {term}" in f" {name}":
+        return RANK_PREFIX
+    return RANK_SUBSTRING
+
+
+def match_ranks(texts, term):
+    """Return the rank of texts containing a term: RANK_EXACT, RANK_PREFIX or RANK_SUBSTRING
+    Args:
+        texts (iterable): Texts as indexed, e.g. TrigramIndex.texts[positions];
+            the fields of a text are also compared with the term joined by spaces.
+        term (str): Term the texts contain.
+    """
+    term = term.lower()
+    ranks = [_match_rank(text.lower(), term) for text in texts]
+    return np.array(ranks, dtype=np.int64)
+
+
+def top_k(ranks, k, tie_breaker=None):
+    """Return the indices of the k best results, best first, without sorting the others.
+
+    Results are ordered by rank, then by decreasing tie_breaker (missing values
+    last), then by index. The rank at which the k-th result falls is found by
+    counting; only the results of that rank are partitioned on the tie-breaker.
+    Args:
+        ranks (ndarray): Rank of each result, see RANK_EXACT.
+        k (int): Number of results to return.
+        tie_breaker (array-like, optional): Value ordering the results of a same rank, highest first.
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    if tie_breaker is None:
+        values = np.zeros(len(ranks))
+    else:
+        values = np.nan_to_num(np.asarray(tie_breaker, dtype=float), nan=-np.inf)
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    if k < len(ranks):
+        last = np.searchsorted(np.cumsum(np.bincount(ranks)), k)
+        better = np.flatnonzero(ranks < last)
+        tied = np.flatnonzero(ranks == last)
+        needed = k - len(better)
+        # Valeur du dernier résultat gardé ; à valeur égale, l'ordre de la table départage
+        threshold = -np.partition(-values[tied], needed - 1)[needed - 1]
+        above = tied[values[tied] > threshold]
+        at = tied[values[tied] == threshold][:needed - len(above)]
+        selected = np.concatenate([better, above, at])
+    else:
+        selected = np.arange(len(ranks))
+    return selected[np.lexsort((selected, -values[selected], ranks[selected]))]
+
+
+class TokenIndex:
+    """Inverted index of the words of a text field, for word-prefix search.
+
+    Several texts may belong to the same row (a person's degrees, the cities of
+    the companies they worked for). Words are normalized with normalize_texts;
+    `words` holds the distinct ones, sorted, so that the words starting with a
+    prefix form a contiguous range, and the postings of words[w] (sorted row
+    positions) are rows[offsets[w]:offsets[w + 1]]. The texts themselves are
+    kept, sorted by row, to display the values a row matched on.
+    """
+
+    def __init__(self, texts, rows, n_rows):
+        """
+        Args:
+            texts (Series): Texts, missing values allowed.
+            rows (array-like): Row position of each text.
+            n_rows (int): Number of rows of the indexed table.
+        """
+        self.n_rows = n_rows
+        texts = pd.Series(np.asarray(texts, dtype=object))
+        rows = np.asarray(rows, dtype=np.int64)
+        order = np.argsort(rows, kind='stable')
+        self.text_rows, self.texts = rows[order], texts.to_numpy()[order]
+        words = normalize_texts(texts).str.findall(TOKEN_PATTERN.pattern)
+        words = pd.Series(words.to_numpy(), index=rows).explode().dropna()
+        codes, vocabulary = pd.factorize(words, sort=True)
+        self.words = np.asarray(vocabulary, dtype=object)
+        # Un entier par couple (mot, ligne) : le tri les range par mot puis par ligne
+        pairs = np.unique(codes.astype(np.int64) * max(n_rows, 1) + words.index.to_numpy(dtype=np.int64))
+        codes, self.rows = np.divmod(pairs, max(n_rows, 1))
+        self.offsets = np.zeros(len(self.words) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(self.words)), out=self.offsets[1:])
+
+    def __len__(self):
+        return self.n_rows
+
+    def prefix_rows(self, prefix):
+        """Return the sorted positions of the rows with a word starting with a (normalized) prefix"""
+        start = np.searchsorted(self.words, prefix, side='left')
+        stop = np.searchsorted(self.words, prefix + '\U0010ffff', side='left')
+        if stop - start == 1:
+            return self.rows[self.offsets[start]:self.offsets[stop]]
+        return np.unique(self.rows[self.offsets[start]:self.offsets[stop]])
+
+    def search(self, term):
+        """Return the sorted positions of the rows having, for each word of a term, a word starting with it
+        Args:
+            term (str): Words to look for, e.g. 'stanford univ'.
+        """
+        prefixes = TOKEN_PATTERN.findall(normalize_texts(pd.Series([term])).iloc[0])
+        if not prefixes:
+            return np.arange(self.n_rows)
+        return intersect_sorted([self.prefix_rows(prefix) for prefix in prefixes])
+
+    def values(self, position):
+        """Return the distinct texts of a row, in their original order"""
+        start, stop = np.searchsorted(self.text_rows, [position, position + 1])
+        return list(dict.fromkeys(text for text in self.texts[start:stop] if isinstance(text, str)))
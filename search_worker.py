@@ -0,0 +1,169 @@
+import traceback
+import pandas as pd
+from PyQt5.QtCore import QThread, pyqtSignal
+from company_summary import company_row, company_summary
+
+# Résultats envoyés à l'affichage par lot
+SEARCH_BATCH_ROWS = 100
+
+
+def person_row(data_loader, person):
+    """Build the result row of a person
+    Args:
+        data_loader (DataLoader): Loader holding degrees and relationships.
+        person (dict): Row of the people table.
+    """
+    name = f"{person.get('first_name', '')} {person.get('last_name', '')}".strip()
+    company = person.get('affiliation_name', 'N/A')
+    object_id = person.get('object_id')
+
+    # Get degree information
+    degree_info = "N/A"
+    university = "N/A"
+    if data_loader.degrees is not None and pd.notna(object_id):
+        person_degrees = data_loader.lookup('degrees', object_id)
+        if not person_degrees.empty:
+            degree = person_degrees.iloc[0]
+            degree_type = degree.get('degree_type', '')
+            subject = degree.get('subject', '')
+            degree_info = f"{degree_type} in {subject}".strip()
+            university = degree.get('institution', 'N/A')
+
+    # Get title from relationships
+    title = "N/A"
+    if data_loader.relationships is not None and pd.notna(object_id):
+        person_relationships = data_loader.lookup('relationships', object_id)
+        if not person_relationships.empty:
+            # Get the first non-null title
+            titles = person_relationships['title'].dropna()
+            if not titles.empty:
+                title = titles.iloc[0]
+
+    return [name, company, degree_info, university, title]
+
+
+def _money(value):
+    return f"${value:,.2f}" if pd.notna(value) else 'N/A'
+
+
+def startup_summary(data_loader):
+    """Return the company summary startup rows are built from, see startup_row
+    Args:
+        data_loader (DataLoader): Loader whose store holds the summarized tables.
+    """
+    return company_summary(data_loader.store)
+
+
+def startup_row(data_loader, startup, summary):
+    """Build the result row of a startup from the company summary
+    Args:
+        data_loader (DataLoader): Unused, for a signature common to the row builders.
+        startup (dict): Row of the objects table.
+        summary (DataFrame): Company summary, see startup_summary.
+    """
+    summary = company_row(summary, startup.get('id')) if summary is not None else None
+    if summary is None:  # Entreprise absente du résumé : seules ses propres colonnes sont connues
+        summary = startup
+
+    def value(column):
+        return summary.get(column) if pd.notna(summary.get(column)) else 'N/A'
+
+    founded = value('founded_at')
+    founded = str(founded).split()[0] if founded != 'N/A' else 'N/A'
+    milestone_url = value('milestone_url')
+    return [startup.get('name', ''), value('category_code'), value('status'), founded,
+            ('View', milestone_url) if milestone_url != 'N/A' else 'N/A',
+            value('latest_round_code'), _money(summary.get('latest_raised_amount')),
+            _money(summary.get('last_valuation_usd'))]
+
+
+def fund_row(data_loader, fund):
+    """Build the result row of a fund
+    Args:
+        data_loader (DataLoader): Unused, for a signature common to the row builders.
+        fund (dict): Row of the funds table.
+    """
+    # Fund name
+    name = str(fund['name'])
+
+    # Date
+    date_str = str(fund['funded_at']).split()[0] if pd.notna(fund['funded_at']) else 'N/A'
+
+    # Amount
+    amount_str = f"${fund['raised_amount']:,.2f}" if pd.notna(fund['raised_amount']) else 'N/A'
+
+    # Source description
+    source = str(fund['source_description'])
+
+    # URL (stored as tuple for special handling)
+    url = ('View', fund['source_url']) if pd.notna(fund['source_url']) else 'N/A'
+
+    return [name, date_str, amount_str, source, url]
+
+
+class SearchWorker(QThread):
+    """Runs one search in a background thread and streams its result rows.
+
+    `find` returns the matching rows to build, with the number of matches of
+    the search (a page may hold only the first ones) and a state of the search
+    that `done` hands back to the GUI thread, e.g. for the next page to reuse.
+    `make_row` turns each of these rows into a result row, and `row_context`,
+    called once per search, returns the data its rows share. All three run on
+    the worker thread.
+    Rows are emitted SEARCH_BATCH_ROWS at a time, with the share of matches
+    processed so far. Every signal carries the search's generation, so that
+    the tab can ignore a search it has replaced; requestInterruption() stops
+    the worker before its next batch, or earlier where `find` checks it.
+    """
+
+    # Génération, lignes de résultats
+    batch = pyqtSignal(int, list)
+    # Génération, avancement (0-100)
+    progress = pyqtSignal(int, int)
+    # Génération, nombre de correspondances, état de la recherche
+    done = pyqtSignal(int, int, object)
+    # Génération, message d'erreur
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, generation, data_loader, find, make_row, row_context=None, parent=None):
+        """
+        Args:
+            generation (int): Identifies this search among the tab's searches.
+            data_loader (DataLoader): Loader passed to make_row.
+            find (callable): find(cancelled) returns (DataFrame of the matching rows to build,
+                number of matches, state of the search), or None if cancelled() became True.
+            make_row (callable): make_row(data_loader, row) returns a result row.
+            row_context (callable, optional): row_context(data_loader) returns a value
+                passed to every make_row call, as make_row(data_loader, row, context).
+            parent (QObject, optional): Qt parent.
+        """
+        super().__init__(parent)
+        self.generation = generation
+        self.data_loader = data_loader
+        self.find = find
+        self.make_row = make_row
+        self.row_context = row_context
+
+    def run(self):
+        try:
+            found = self.find(self.isInterruptionRequested)
+            if found is None:
+                return
+            matches, n_matches, state = found
+            # Données communes aux lignes, lues une fois pour toute la page
+            context = () if self.row_context is None else (self.row_context(self.data_loader),)
+            self.progress.emit(self.generation, 0)
+            n_results = 0
+            for start in range(0, len(matches), SEARCH_BATCH_ROWS):
+                if self.isInterruptionRequested():
+                    return
+                records = matches.iloc[start:start + SEARCH_BATCH_ROWS].to_dict('records')
+                rows = [self.make_row(self.data_loader, record, *context) for record in records]
+                n_results += len(rows)
+                self.batch.emit(self.generation, rows)
+                self.progress.emit(self.generation, n_results * 100 // len(matches))
+            self.done.emit(self.generation, n_matches, state)
+        except Exception as e:
+            print(f"Error during search: {str(e)}")
+            traceback.print_exc()
+            self.failed.emit(self.generation, str(e))
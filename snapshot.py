@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+import pickle
+
+# Incrémenter quand le contenu des instantanés change de forme
+SNAPSHOT_FORMAT = 1
+
+# Valeur renvoyée par SnapshotStore.load quand il n'y a pas d'instantané valide
+MISSING = object()
+
+
+def snapshot_key(versions, params=None):
+    """Return the key of a derived value, from the versions of its input tables
+    Args:
+        versions (list): Versions of the input tables, see DataLoader.data_version.
+        params (optional): Anything else the value depends on (mappings, settings...);
+            compared through its repr.
+    """
+    payload = json.dumps([SNAPSHOT_FORMAT, versions, repr(params)], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class SnapshotStore:
+    """Derived values (fitted models, graphs, aggregates) pickled to disk.
+
+    Each value is stored as <name>.pkl together with the key of the data it
+    was computed from; it is only restored while that key still matches, and
+    saving a new value replaces the previous one.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.pkl")
+
+    def load(self, name, key):
+        """Return the value saved under `name` for `key`, or MISSING"""
+        try:
+            with open(self._path(name), 'rb') as f:
+                saved_key, value = pickle.load(f)
+        except FileNotFoundError:
+            return MISSING
+        except Exception as e:  # Fichier tronqué, bibliothèque mise à jour...
+            print(f"Error reading snapshot {name}: {e}")
+            return MISSING
+        return value if saved_key == key else MISSING
+
+    def save(self, name, key, value):
+        """Save a value under `name` for `key`; returns False if it could not be written"""
+        tmp_path = self._path(name) + '.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(name))
+            return True
+        except Exception as e:
+            print(f"Error saving snapshot {name}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def clear(self):
+        """Delete every saved snapshot"""
+        if os.path.isdir(self.directory):
+            for file_name in os.listdir(self.directory):
+                if file_name.endswith('.pkl'):
+                    os.remove(os.path.join(self.directory, file_name))
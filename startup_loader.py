@@ -0,0 +1,98 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from data_loader import DataLoader, INDEX_COLUMNS, get_store
+
+
+class StartupLoader(QThread):
+    """Load the data of every tab in a worker thread, one tab after the other.
+
+    Each stage is a (key, title, tab class) triple. The tables declared in the
+    tab's DATA_REQUESTS are read into the shared store and their row indexes
+    built; a table already read by an earlier stage is only read again if the
+    tab needs more rows or columns. stage_ready is then emitted, so the tab can
+    be built on the GUI thread without reading any file. The tables in
+    STREAMED_TABLES then get their cached copy prepared, and each function of
+    DERIVED_DATA is called with the store, to build (or restore) the data the
+    tab derives from whole tables; derived_ready is emitted once it is done.
+
+    Each stage keeps its tables in the store until release_stage is called,
+    once its tab is built and holds its own references; a tab built late, e.g.
+    when first opened, thus finds its tables already read.
+    """
+    progress = pyqtSignal(int, str)
+    stage_ready = pyqtSignal(str)
+    derived_ready = pyqtSignal(str)
+
+    def __init__(self, stages, store=None, parent=None):
+        super().__init__(parent)
+        self.stages = stages
+        self.store = store if store is not None else get_store()
+        # Un loader par étape : garde les tables de l'onglet dans le store partagé
+        # jusqu'à sa construction
+        self.loaders = {key: DataLoader(self.store) for key, _, _ in stages}
+
+    def _steps(self, tab):
+        requests = getattr(tab, 'DATA_REQUESTS', {})
+        indexed = [name for name in requests if name in INDEX_COLUMNS]
+        return (len(requests) + len(indexed) + len(getattr(tab, 'STREAMED_TABLES', []))
+                + len(getattr(tab, 'DERIVED_DATA', [])))
+
+    def release_stage(self, key):
+        """Drop a stage's references to its tables, once its tab holds its own
+        (or failed to be built), so that unused ones can be evicted"""
+        loader = self.loaders.get(key)
+        if loader is not None:
+            loader.release()
+
+    def run(self):
+        total = sum(self._steps(tab) for _, _, tab in self.stages) or 1
+        done = 0
+
+        def report(message):
+            self.progress.emit(min(100, done * 100 // total), message)
+
+        for key, title, tab in self.stages:
+            if self.isInterruptionRequested():
+                return
+            stage_end = done + self._steps(tab)
+            loader = self.loaders[key]
+            # Seuls les besoins de l'onglet ; le store y ajoute ceux des étapes
+            # précédentes : une table déjà lue n'est relue que si l'onglet en demande davantage
+            requests = []
+            for name, (n_rows, columns) in getattr(tab, 'DATA_REQUESTS', {}).items():
+                if loader.has_table(name):
+                    loader.load([name], n_rows, {name: columns})
+                    requests.append(name)
+            if requests:
+                report(f"{title}: loading {len(requests)} tables...")
+
+            def loaded(name, count, n_tables):
+                nonlocal done
+                done += 1
+                report(f"{title}: loaded {name} ({count}/{n_tables})")
+
+            loader.load_all(requests, progress=loaded)
+
+            for name in requests:
+                if name in INDEX_COLUMNS:
+                    report(f"{title}: indexing {name}...")
+                    self.store.index(name, INDEX_COLUMNS[name])
+                    done += 1
+            self.stage_ready.emit(key)
+
+            # Données tirées des tables entières : l'onglet est déjà affichable
+            for name in getattr(tab, 'STREAMED_TABLES', []):
+                report(f"{title}: preparing {name}...")
+                if loader.has_table(name):
+                    self.store.prepare(name)
+                done += 1
+            for build in getattr(tab, 'DERIVED_DATA', []):
+                report(f"{title}: building {build.__name__}...")
+                try:
+                    build(self.store)
+                except Exception as e:
+                    print(f"Error building {build.__name__}: {e}")
+                done += 1
+
+            done = stage_end  # tables absentes comprises
+            self.derived_ready.emit(key)
+        self.progress.emit(100, "Ready!")
@@ -1,38 +1,146 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
-                           QTableView, QPushButton)
-from PyQt5.QtCore import Qt, QAbstractTableModel
+                           QTableView, QPushButton, QHeaderView, QLineEdit, QLabel,
+                           QProgressBar, QFileDialog)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
-from data_loader import DataLoader
+from data_loader import DataLoader, decode_ids, id_columns
+from export_worker import EXPORT_CHUNK_ROWS, EXPORT_FORMATS, ExportWorker, view_chunks
+from frame_view import FrameView
+
+# Table affichée pour chaque entrée du sélecteur
+TABLES = {
+    'Personnes': 'people',
+    'Relations': 'relationships',
+    'Investissements': 'investments',
+    'Bureaux': 'offices',
+}
+
+# Lignes converties en texte d'un coup, par colonne
+BLOCK_ROWS = 1024
+# Nombre maximal de blocs de texte gardés en mémoire
+MAX_BLOCKS = 512
+# Lignes ajoutées à la vue à chaque fetchMore
+FETCH_ROWS = 10000
+# Hauteur fixe des lignes, en pixels
+ROW_HEIGHT = 22
+# Lignes exportées pour chaque entrée du sélecteur d'export
+EXPORT_SCOPES = ["Table complète", "Vue filtrée"]
 
 class PandasModel(QAbstractTableModel):
-    def __init__(self, data):
+    """Read-only table model over a DataFrame, for frames of millions of rows.
+
+    Rows are shown through a FrameView, which sorts and filters them without
+    copying the frame. Cells are read from the columns' arrays and converted to
+    text a block of BLOCK_ROWS displayed rows at a time, when the block is first
+    painted; the MAX_BLOCKS most recently used blocks are kept. Rows are handed
+    to the view FETCH_ROWS at a time through canFetchMore/fetchMore.
+    """
+
+    def __init__(self, data, id_columns=()):
         super().__init__()
         self._data = data
+        self.view = FrameView(data, id_columns)
+        # Tableaux des colonnes : numpy (sans copie) pour les dtypes numpy,
+        # tableau pandas pour les autres (Int64 des identifiants, string...)
+        self._columns = [data[column].array if isinstance(data[column].dtype, pd.api.extensions.ExtensionDtype)
+                         else data[column].to_numpy()
+                         for column in data.columns]
+        # Positions des colonnes d'identifiants, affichées sous leur forme texte
+        self._id_positions = {i for i, column in enumerate(data.columns) if column in id_columns}
+        self._headers = [str(column) for column in data.columns]
+        self._index = data.index.to_numpy()
+        self._blocks = OrderedDict()
+        self._loaded_rows = min(FETCH_ROWS, len(self.view))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
 
-    def rowCount(self, parent=None):
-        return self._data.shape[0]
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded_rows < len(self.view)
 
-    def columnCount(self, parent=None):
-        return self._data.shape[1]
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(FETCH_ROWS, len(self.view) - self._loaded_rows)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded_rows, self._loaded_rows + count - 1)
+        self._loaded_rows += count
+        self.endInsertRows()
+
+    def _block(self, column, block):
+        """Return the display strings of one block of a column, converting it on first use"""
+        key = (column, block)
+        strings = self._blocks.get(key)
+        if strings is not None:
+            self._blocks.move_to_end(key)
+            return strings
+        start = block * BLOCK_ROWS
+        rows = self.view.rows[start:start + BLOCK_ROWS]
+        values = pd.Series(self._columns[column].take(rows), copy=False)
+        if column in self._id_positions and not pd.api.types.is_object_dtype(values):
+            values = decode_ids(values).fillna(str(pd.NA))
+        strings = np.asarray(values.astype(str), dtype=object)
+        self._blocks[key] = strings
+        if len(self._blocks) > MAX_BLOCKS:
+            self._blocks.popitem(last=False)
+        return strings
 
     def data(self, index, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole:
-            value = self._data.iloc[index.row(), index.column()]
-            return str(value)
+        if role == Qt.DisplayRole and index.isValid():
+            row = index.row()
+            return self._block(index.column(), row // BLOCK_ROWS)[row % BLOCK_ROWS]
         return None
 
-    def headerData(self, section, orientation, role):
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role == Qt.DisplayRole:
             if orientation == Qt.Horizontal:
-                return str(self._data.columns[section])
+                return self._headers[section]
             if orientation == Qt.Vertical:
-                return str(self._data.index[section])
+                return str(self._index[self.view.rows[section]])
         return None
 
+    def _reset(self, update):
+        """Apply a change of the view's rows and redisplay from the top"""
+        self.beginResetModel()
+        try:
+            update()
+        finally:
+            self._blocks.clear()
+            self._loaded_rows = min(FETCH_ROWS, len(self.view))
+            self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # Une colonne négative rétablit l'ordre de la table
+        name = self._data.columns[column] if 0 <= column < len(self._columns) else None
+        self._reset(lambda: self.view.sort(name, order == Qt.AscendingOrder))
+
+    def set_filter(self, column, expression):
+        """Filter the rows on a column, see FrameView.set_filter
+        Args:
+            column (str): Column name.
+            expression (str): Filter expression; empty to remove the filter.
+        """
+        self._reset(lambda: self.view.set_filter(column, expression))
+
+    def clear_filters(self):
+        """Remove every filter"""
+        self._reset(self.view.clear_filters)
+
 class DataTab(QWidget):
+    # Tables lues à la construction de l'onglet : {table: (lignes, colonnes)}
+    # Toutes les lignes : le modèle ne convertit en texte que les blocs affichés
+    DATA_REQUESTS = {name: (None, None) for name in TABLES.values()}
+
     def __init__(self):
         super().__init__()
         self.data_loader = DataLoader()
+        self.export_worker = None
         self.init_ui()
         
     def init_ui(self):
@@ -41,46 +149,156 @@ class DataTab(QWidget):
         # Contrôles
         controls_layout = QHBoxLayout()
         self.table_selector = QComboBox()
-        self.table_selector.addItems([
-            'Personnes', 
-            'Relations', 
-            'Investissements', 
-            'Bureaux'
-        ])
+        self.table_selector.addItems(list(TABLES))
         controls_layout.addWidget(self.table_selector)
         
-        export_btn = QPushButton("Exporter vers Excel")
-        controls_layout.addWidget(export_btn)
+        # Filtre sur une colonne : texte recherché ou comparaison (> 1000, = p:12...)
+        self.filter_column = QComboBox()
+        controls_layout.addWidget(self.filter_column)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filtrer (texte, > 1000, = p:12...)")
+        controls_layout.addWidget(self.filter_input)
+        clear_btn = QPushButton("Effacer les filtres")
+        controls_layout.addWidget(clear_btn)
+        
+        self.export_scope = QComboBox()
+        self.export_scope.addItems(EXPORT_SCOPES)
+        controls_layout.addWidget(self.export_scope)
+        self.export_btn = QPushButton("Exporter...")
+        controls_layout.addWidget(self.export_btn)
         
         layout.addLayout(controls_layout)
         
         # Vue du tableau
         self.table_view = QTableView()
+        # Hauteur de ligne fixe : la vue n'a pas à mesurer chaque ligne
+        vertical_header = self.table_view.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(ROW_HEIGHT)
+        self.table_view.setWordWrap(False)
+        self.table_view.setSortingEnabled(True)
         layout.addWidget(self.table_view)
         
+        # Ligne d'état : nombre de lignes affichées et avancement de l'export
+        status_layout = QHBoxLayout()
+        self.rows_label = QLabel()
+        status_layout.addWidget(self.rows_label)
+        self.export_progress = QProgressBar()
+        self.export_progress.setVisible(False)
+        status_layout.addWidget(self.export_progress)
+        self.cancel_export_btn = QPushButton("Annuler l'export")
+        self.cancel_export_btn.setVisible(False)
+        status_layout.addWidget(self.cancel_export_btn)
+        layout.addLayout(status_layout)
+        
         # Connexion des signaux
         self.table_selector.currentTextChanged.connect(self.load_table)
-        export_btn.clicked.connect(self.export_to_excel)
+        self.export_btn.clicked.connect(self.choose_export_file)
+        self.cancel_export_btn.clicked.connect(self.cancel_export)
+        self.filter_input.returnPressed.connect(self.apply_filter)
+        self.filter_column.currentTextChanged.connect(self.show_filter)
+        clear_btn.clicked.connect(self.clear_filters)
         
         # Chargement initial
-        self.data_loader.load_data()
+        self.data_loader.load(list(self.DATA_REQUESTS), n_rows=None)
         self.load_table(self.table_selector.currentText())
         
     def load_table(self, table_name):
-        if table_name == 'Personnes':
-            data = self.data_loader.people
-        elif table_name == 'Relations':
-            data = self.data_loader.relationships
-        elif table_name == 'Investissements':
-            data = self.data_loader.investments
-        else:  # Bureaux
-            data = self.data_loader.offices
+        table = TABLES.get(table_name, 'offices')
+        data = getattr(self.data_loader, table)
             
-        model = PandasModel(data)
+        model = PandasModel(data, id_columns(table))
         self.table_view.setModel(model)
+        # Sans tri tant que l'utilisateur n'a pas cliqué sur un en-tête
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.filter_column.blockSignals(True)
+        self.filter_column.clear()
+        self.filter_column.addItems([str(column) for column in data.columns])
+        self.filter_column.blockSignals(False)
+        self.filter_input.clear()
+        self.update_rows_label()
+        
+    def apply_filter(self):
+        model = self.table_view.model()
+        column = self.filter_column.currentText()
+        if model is None or not column:
+            return
+        try:
+            model.set_filter(column, self.filter_input.text())
+        except (ValueError, TypeError) as e:
+            print(f"Error filtering {column}: {e}")
+        self.update_rows_label()
+        
+    def show_filter(self, column):
+        # Affiche le filtre déjà appliqué à la colonne choisie
+        model = self.table_view.model()
+        expression = model.view.filters.get(column, ('',))[0] if model is not None else ''
+        self.filter_input.setText(expression)
+        
+    def clear_filters(self):
+        model = self.table_view.model()
+        if model is not None:
+            model.clear_filters()
+        self.filter_input.clear()
+        self.update_rows_label()
+        
+    def update_rows_label(self):
+        model = self.table_view.model()
+        if model is not None:
+            self.rows_label.setText(f"{len(model.view)} / {len(model.view.frame)} lignes")
+        
+    def choose_export_file(self):
+        table = TABLES.get(self.table_selector.currentText(), 'offices')
+        path, file_filter = QFileDialog.getSaveFileName(
+            self, "Exporter", f"{table}_export.csv", ";;".join(EXPORT_FORMATS))
+        if path:
+            self.export(path, EXPORT_FORMATS.get(file_filter, 'csv'),
+                        self.export_scope.currentText() == EXPORT_SCOPES[1])
+        
+    def export(self, path, file_format, filtered=False):
+        """Export the selected table in a background thread
+        Args:
+            path (str): Destination file.
+            file_format (str): 'csv', 'parquet' or 'xlsx'.
+            filtered (bool): Export only the rows of the current view, in their
+                displayed order; otherwise every row of the table's file.
+        """
+        if self.export_worker is not None:
+            return
+        table = TABLES.get(self.table_selector.currentText(), 'offices')
+        model = self.table_view.model()
+        if filtered and model is not None:
+            frame, rows = model.view.frame, model.view.rows
+            chunks = lambda: view_chunks(frame, rows)
+            total_rows = len(rows)
+        else:
+            # Toute la table, lue par blocs depuis le fichier plutôt que les lignes chargées
+            store = self.data_loader.store
+            chunks = lambda: store.iter_chunks(table, chunksize=EXPORT_CHUNK_ROWS)
+            total_rows = store.row_count(table)
+        self.export_worker = ExportWorker(path, file_format, chunks, table, total_rows, self)
+        self.export_worker.progress.connect(self.show_export_progress)
+        self.export_worker.done.connect(self.export_finished)
+        self.export_btn.setEnabled(False)
+        self.export_progress.setRange(0, 100 if total_rows else 0)
+        self.export_progress.setValue(0)
+        self.export_progress.setVisible(True)
+        self.cancel_export_btn.setVisible(True)
+        self.export_worker.start()
+        
+    def show_export_progress(self, percent, message):
+        if percent >= 0:
+            self.export_progress.setValue(percent)
+        self.export_progress.setFormat(message)
+        
+    def cancel_export(self):
+        if self.export_worker is not None:
+            self.export_worker.requestInterruption()
         
-    def export_to_excel(self):
-        table_name = self.table_selector.currentText()
-        if hasattr(self.data_loader, table_name.lower()):
-            data = getattr(self.data_loader, table_name.lower())
-            data.to_excel(f"{table_name.lower()}_export.xlsx")
+    def export_finished(self, success, message):
+        self.export_worker.wait()
+        self.export_worker = None
+        self.export_btn.setEnabled(True)
+        self.export_progress.setVisible(False)
+        self.cancel_export_btn.setVisible(False)
+        self.rows_label.setText(message)
@@ -1,20 +1,34 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox, 
                           QPushButton, QLabel, QTableWidget, QTableWidgetItem)
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
-from data_loader import DataLoader
+from data_loader import DataLoader, stream_group_count, stream_group_sum
+from lazy_import import lazy_import
 from PyQt5.QtCore import Qt
 import webbrowser
 import numpy as np
 
+# Importés à la construction de l'onglet seulement
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+FigureCanvas = lazy_import('matplotlib.backends.backend_qt5agg', 'FigureCanvasQTAgg')
+NavigationToolbar = lazy_import('matplotlib.backends.backend_qt5agg', 'NavigationToolbar2QT')
+
+# Colonnes lues par les graphiques. Les tables sont parcourues en entier, par
+# blocs, au lieu d'être chargées en mémoire.
+ANALYSIS_COLUMNS = {
+    'degrees': ['degree_type', 'institution', 'graduated_at'],
+    'funding_rounds': ['funded_at', 'raised_amount_usd'],
+    'objects': ['category_code', 'status', 'founded_at'],
+    'funds': ['funded_at', 'raised_amount'],
+}
+
 class InvestmentAnalysisTab(QWidget):
+  # Tables parcourues par blocs : seule leur copie en cache est préparée à l'avance
+  STREAMED_TABLES = list(ANALYSIS_COLUMNS)
+
   def __init__(self):
       super().__init__()
       self.data_loader = DataLoader()
-      self.data_loader.load_data_analysis(n_rows=50000)
       self.init_ui()
       
   def init_ui(self):
@@ -65,6 +79,22 @@ class InvestmentAnalysisTab(QWidget):
       selected_viz = self.viz_selector.currentText()
       self.figure.clear()
       
+      try:
+          self.draw_plot(selected_viz)
+      except Exception as e:
+          print(f"Error updating plot: {e}")
+          
+      self.canvas.draw()
+
+  def chunks(self, table):
+      """Iterate over a whole table, in blocks"""
+      return self.data_loader.iter_chunks(table, ANALYSIS_COLUMNS[table])
+
+  def aggregate(self, name, tables, compute, params=None):
+      """Return an aggregate over whole tables, read back from disk while they are unchanged"""
+      return self.data_loader.snapshot(f"investment_{name}", tables, compute, params)
+
+  def draw_plot(self, selected_viz):
       if selected_viz == "Investment Growth Rate":
           self.ax = self.figure.add_subplot(111)
           self.plot_growth_rate()
@@ -81,27 +111,13 @@ class InvestmentAnalysisTab(QWidget):
           self.plot_funds_analysis()
       elif selected_viz == "IPO Analysis":
           self.plot_ipo_analysis()
-          
-      self.canvas.draw()
 
   def plot_degree_distribution(self):
-      if self.data_loader.degrees is not None:
+      if self.data_loader.has_table('degrees'):
           # Create two subplots
           ax1 = self.figure.add_subplot(121)
           ax2 = self.figure.add_subplot(122)
           
-          # Clean and prepare the data
-          df = self.data_loader.degrees.copy()
-          df['graduated_at'] = pd.to_datetime(df['graduated_at'])
-          df['decade'] = (df['graduated_at'].dt.year // 10) * 10
-          
-          # Filter out decades after 2000
-          df = df[df['decade'] <= 2000]
-          
-          # Standardize degree types
-          df['degree_type'] = df['degree_type'].fillna('Unknown')
-          df['degree_type'] = df['degree_type'].str.upper()
-          
           # Group common degrees
           degree_mapping = {
               'BS': 'Bachelor',
@@ -116,12 +132,24 @@ class InvestmentAnalysisTab(QWidget):
               'DOCTORATE': 'PhD'
           }
           
-          df['degree_category'] = df['degree_type'].apply(
-              lambda x: next((v for k, v in degree_mapping.items() if k in str(x)), 'Other')
-          )
+          def decade(chunk):
+              return (pd.to_datetime(chunk['graduated_at']).dt.year // 10) * 10
+          
+          def degree_keys(chunk):
+              # Standardize degree types
+              degree_type = chunk['degree_type'].astype(object).fillna('Unknown').str.upper()
+              degree_category = degree_type.apply(
+                  lambda x: next((v for k, v in degree_mapping.items() if k in str(x)), 'Other')
+              )
+              return [decade(chunk).rename('decade'), degree_category.rename('degree_category')]
+          
+          # Count degrees per decade and category, filtering out decades after 2000
+          counts = self.aggregate('degrees', ['degrees'], lambda: stream_group_count(
+              self.chunks('degrees'), degree_keys, where=lambda chunk: decade(chunk) <= 2000
+          ), degree_mapping)
           
           # Plot 1: Top 10 Degree Types
-          degree_counts = df['degree_category'].value_counts().head(10)
+          degree_counts = counts.groupby(level='degree_category').sum().sort_values(ascending=False).head(10)
           colors = sns.color_palette("husl", n_colors=len(degree_counts))
           bars = ax1.bar(range(len(degree_counts)), degree_counts.values, color=colors)
           ax1.set_title('Top 10 Degree Types')
@@ -137,7 +165,7 @@ class InvestmentAnalysisTab(QWidget):
                       ha='center', va='bottom')
           
           # Plot 2: Evolution of Degree Types Over Time
-          decade_degree = pd.crosstab(df['decade'], df['degree_category'])
+          decade_degree = counts.unstack(fill_value=0)
           decade_degree = decade_degree.loc[decade_degree.index.dropna()]
           
           # Plot stacked area chart
@@ -156,33 +184,31 @@ class InvestmentAnalysisTab(QWidget):
           plt.tight_layout()
 
   def plot_growth_rate(self):
-      df = self.data_loader.funding_rounds
-      if df is not None:
-          df['funded_at'] = pd.to_datetime(df['funded_at'])
-          df = df.set_index('funded_at')
-          
-          # Changed 'Y' to 'YE' for year-end frequency
-          yearly_investments = df['raised_amount_usd'].resample('YE').sum()
+      if self.data_loader.has_table('funding_rounds'):
+          # Sum investments per year, keeping the years without any round
+          yearly_investments = self.aggregate('growth', ['funding_rounds'], lambda: stream_group_sum(
+              self.chunks('funding_rounds'),
+              lambda chunk: pd.to_datetime(chunk['funded_at']).dt.year,
+              'raised_amount_usd'
+          ))
+          yearly_investments = yearly_investments.reindex(
+              range(int(yearly_investments.index.min()), int(yearly_investments.index.max()) + 1),
+              fill_value=0
+          )
           growth_rate = yearly_investments.pct_change() * 100
           
           # Plot
-          self.ax.plot(growth_rate.index.year, growth_rate.values)
+          self.ax.plot(growth_rate.index, growth_rate.values)
           self.ax.set_title('Year-over-Year Investment Growth Rate')
           self.ax.set_xlabel('Year')
           self.ax.set_ylabel('Growth Rate (%)')
           plt.xticks(rotation=45)
 
   def plot_university_analysis(self):
-      if self.data_loader.degrees is not None:
+      if self.data_loader.has_table('degrees'):
           # Create subplot
           ax = self.figure.add_subplot(111)
           
-          # Clean and prepare the data
-          df = self.data_loader.degrees.copy()
-          
-          # Clean institution names
-          df['institution'] = df['institution'].fillna('Unknown')
-          
           # Standardize common university names
           def standardize_university(name):
               name = str(name).strip()
@@ -198,10 +224,14 @@ class InvestmentAnalysisTab(QWidget):
                   return 'UCLA'
               return name
           
-          df['institution'] = df['institution'].apply(standardize_university)
+          # Clean institution names and count degrees per university
+          universities = self.aggregate('universities', ['degrees'], lambda: stream_group_count(
+              self.chunks('degrees'),
+              lambda chunk: chunk['institution'].astype(object).fillna('Unknown').apply(standardize_university)
+          ))
           
           # Get top 10 universities
-          top_universities = df['institution'].value_counts().head(10)
+          top_universities = universities.sort_values(ascending=False).head(10)
           
           # Create bar plot
           colors = sns.color_palette("husl", n_colors=len(top_universities))
@@ -229,7 +259,7 @@ class InvestmentAnalysisTab(QWidget):
           plt.tight_layout()
 
   def plot_sector_analysis(self):
-      if self.data_loader.objects is not None:
+      if self.data_loader.has_table('objects'):
           # Clear the current figure
           self.figure.clear()
           
@@ -237,11 +267,11 @@ class InvestmentAnalysisTab(QWidget):
           ax1 = self.figure.add_subplot(211)  # 2 rows, 1 column, first plot
           ax2 = self.figure.add_subplot(212)  # 2 rows, 1 column, second plot
           
-          # Get data
-          df = self.data_loader.objects.copy()
-          
           # First subplot - Original bar chart
-          sector_counts = df['category_code'].value_counts().head(15)
+          sector_counts = self.aggregate('sectors', ['objects'], lambda: stream_group_count(
+              self.chunks('objects'), 'category_code'
+          ))
+          sector_counts = sector_counts.sort_values(ascending=False).head(15)
           sector_counts = sector_counts.dropna()
           sector_counts = sector_counts[sector_counts.index != '']
           
@@ -289,21 +319,22 @@ class InvestmentAnalysisTab(QWidget):
                        'ecommerce', 'search', 'hardware', 'news', 'government', 'nonprofit', 'local']
           }
           
-          # Convert founded_at to datetime
-          df['founded_at'] = pd.to_datetime(df['founded_at'])
-          df['founding_year'] = df['founded_at'].dt.year
-          
           # Create category_group column
           def get_category_group(category):
               for group, categories in category_groups.items():
                   if category in categories:
                       return group
               return 'other'
-              
-          df['category_group'] = df['category_code'].apply(get_category_group)
           
+          def year_and_group(chunk):
+              founding_year = pd.to_datetime(chunk['founded_at']).dt.year.rename('founding_year')
+              category_group = chunk['category_code'].astype(object).apply(get_category_group)
+              return [founding_year, category_group.rename('category_group')]
+              
           # Group by year and category_group
-          yearly_categories = df.groupby(['founding_year', 'category_group']).size().unstack(fill_value=0)
+          yearly_categories = self.aggregate('sector_years', ['objects'], lambda: stream_group_count(
+              self.chunks('objects'), year_and_group
+          ), category_groups).unstack(fill_value=0)
           
           # Filter data from 1960 onwards before plotting
           yearly_categories = yearly_categories[yearly_categories.index >= 1960]
@@ -324,25 +355,25 @@ class InvestmentAnalysisTab(QWidget):
           self.figure.tight_layout()
 
   def plot_funds_analysis(self):
-      if self.data_loader.funds is not None:
+      if self.data_loader.has_table('funds'):
           self.figure.clear()
           
           ax1 = self.figure.add_subplot(211)  
           ax2 = self.figure.add_subplot(212)  
           
-          # Convert funded_at to datetime if not already
-          self.data_loader.funds['funded_at'] = pd.to_datetime(self.data_loader.funds['funded_at'])
+          def funded_year(chunk):
+              return pd.to_datetime(chunk['funded_at']).dt.year
           
           # Group by year and count number of funds
-          yearly_funds = self.data_loader.funds.groupby(
-              self.data_loader.funds['funded_at'].dt.year
-          ).size().reset_index()
+          yearly_funds = self.aggregate('fund_counts', ['funds'], lambda: stream_group_count(
+              self.chunks('funds'), funded_year
+          )).reset_index()
           yearly_funds.columns = ['year', 'count']
           
           # Group by year and sum raised amounts
-          yearly_amounts = self.data_loader.funds.groupby(
-              self.data_loader.funds['funded_at'].dt.year
-          )['raised_amount'].sum().reset_index()
+          yearly_amounts = self.aggregate('fund_amounts', ['funds'], lambda: stream_group_sum(
+              self.chunks('funds'), funded_year, 'raised_amount'
+          )).reset_index()
           yearly_amounts.columns = ['year', 'amount']
           
           # Plot 1: Number of funds
@@ -383,27 +414,19 @@ class InvestmentAnalysisTab(QWidget):
           self.canvas.draw()
 
   def plot_ipo_analysis(self):
-      if self.data_loader.objects is not None:
+      if self.data_loader.has_table('objects'):
           # Clear the current figure
           self.figure.clear()
           
           # Create subplot
           ax = self.figure.add_subplot(111)
           
-          # Get IPO data
-          df = self.data_loader.objects.copy()
-          
-          # Print columns to debug
-          print("Available columns:", df.columns.tolist())
-          
-          # Check for IPO status in 'status' column
-          ipo_data = df[df['status'] == 'ipo']
-          
-          # Convert founded_at to datetime and extract year
-          ipo_data['year'] = pd.to_datetime(ipo_data['founded_at']).dt.year
-          
-          # Count IPOs by year
-          ipo_by_year = ipo_data.groupby('year').size().reset_index()
+          # Count IPOs (status 'ipo') by founding year
+          ipo_by_year = self.aggregate('ipos', ['objects'], lambda: stream_group_count(
+              self.chunks('objects'),
+              lambda chunk: pd.to_datetime(chunk['founded_at']).dt.year.rename('year'),
+              where=lambda chunk: chunk['status'] == 'ipo'
+          )).reset_index()
           ipo_by_year.columns = ['year', 'count']
           
           # Sort by year
@@ -1,15 +1,35 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                           QSpinBox, QComboBox, QPushButton,
                           QGroupBox, QFormLayout)
-from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtCore import QUrl
-import folium
-from folium.plugins import MarkerCluster, HeatMap
 import tempfile
 import pandas as pd
-from data_loader import DataLoader
+from company_summary import SUMMARY_TABLES, company_summary
+from data_loader import DataLoader, LOCATION_COLUMNS
+from lazy_import import lazy_import
+
+# Importés à la construction de la carte seulement
+QWebEngineView = lazy_import('PyQt5.QtWebEngineWidgets', 'QWebEngineView')
+folium = lazy_import('folium')
+MarkerCluster = lazy_import('folium.plugins', 'MarkerCluster')
+HeatMap = lazy_import('folium.plugins', 'HeatMap')
+
+# Colonnes lues par la carte
+MAP_COLUMNS = {
+    'offices': LOCATION_COLUMNS,
+}
+MAP_ROWS = 10000
+# Colonnes du résumé des entreprises affichées dans les popups
+POPUP_COLUMNS = ['name', 'category_code', 'total_raised_usd']
 
 class MapTab(QWidget):
+  # Tables lues à la construction de l'onglet : {table: (lignes, colonnes)}
+  DATA_REQUESTS = {name: (MAP_ROWS, columns) for name, columns in MAP_COLUMNS.items()}
+  # Tables parcourues en entier pour le résumé des entreprises (noms des popups)
+  STREAMED_TABLES = SUMMARY_TABLES
+  # Résumé construit (ou relu) au chargement, pas à l'affichage de la carte
+  DERIVED_DATA = [company_summary]
+
   def __init__(self):
       super().__init__()
       self.layout = QVBoxLayout(self)
@@ -112,24 +132,31 @@ class MapTab(QWidget):
           # Return limited unfiltered data as fallback
           return locations.head(self.company_count.value())
       
+  def company_details(self, row):
+      """Return the category and total raised lines of a popup, for those that are known"""
+      details = ""
+      if pd.notnull(row.get('category_code')):
+          details += f"Category: {row['category_code']}<br>"
+      if pd.notnull(row.get('total_raised_usd')):
+          details += f"Total Raised: ${row['total_raised_usd']:,.0f}<br>"
+      return details
+      
   def load_map(self):
       # Load startup location data
-      self.data_loader.load_data_map(n_rows = 10000)
+      self.data_loader.load(list(MAP_COLUMNS), n_rows=MAP_ROWS, columns=MAP_COLUMNS)
       locations = self.data_loader.get_startup_locations()
       
-      # Merge with objects to get company names
-      if self.data_loader.objects is not None:
-          locations = pd.merge(
-              locations,
-              self.data_loader.objects[['id', 'name']],
-              left_on='object_id',
-              right_on='id',
-              how='left'
-          )
-      
       # Apply filters
       filtered_locations = self.filter_data(locations)
       
+      # Company names and details of the markers, looked up by id in the company summary
+      # built while loading; without it, the popups only show the office
+      summary = company_summary(self.data_loader.store, build=False)
+      if summary is not None and not filtered_locations.empty and not summary.empty:
+          details = summary[POPUP_COLUMNS].reindex(filtered_locations['object_id'])
+          filtered_locations = filtered_locations.assign(
+              **{column: details[column].to_numpy() for column in POPUP_COLUMNS})
+      
       # Create base map centered on US
       m = folium.Map(location=[39.8283, -98.5795], zoom_start=4)
       
@@ -145,6 +172,7 @@ class MapTab(QWidget):
                   #Balise HTML
                   popup_text = (
                       f"<b>Company:</b> {company_name}<br>"
+                      f"{self.company_details(row)}"
                       f"City: {row.get('city', 'N/A')}<br>"
                       f"State: {row.get('state_code', 'N/A')}<br>"
                       f"Region: {row.get('region', 'N/A')}<br>"
@@ -169,6 +197,7 @@ class MapTab(QWidget):
                   company_name = row.get('name', 'Unknown Company')
                   popup_text = (
                       f"<b>Company:</b> {company_name}<br>"
+                      f"{self.company_details(row)}"
                       f"City: {row.get('city', 'N/A')}<br>"
                       f"State: {row.get('state_code', 'N/A')}<br>"
                       f"Region: {row.get('region', 'N/A')}<br>"
@@ -184,6 +213,10 @@ class MapTab(QWidget):
       m.save(temp_file.name)
       self.web_view.setUrl(QUrl.fromLocalFile(temp_file.name))
       
+  def derived_data_ready(self):
+      """Redraw the map once the company summary is built, for the names of the popups"""
+      self.load_map()
+      
   def update_map(self):
       """Reload the map with current filter settings"""
       self.load_map()
\ No newline at end of file
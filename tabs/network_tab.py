@@ -1,17 +1,30 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 import pandas as pd
 import numpy as np
 from data_loader import DataLoader
+from lazy_import import lazy_import
+
+# Importés à la construction de l'onglet seulement
+nx = lazy_import('networkx')
+plt = lazy_import('matplotlib.pyplot')
+FigureCanvas = lazy_import('matplotlib.backends.backend_qt5agg', 'FigureCanvasQTAgg')
+NavigationToolbar = lazy_import('matplotlib.backends.backend_qt5agg', 'NavigationToolbar2QT')
+
+# Colonnes lues pour le graphe
+NETWORK_COLUMNS = {
+    'people': ['object_id', 'first_name', 'last_name', 'affiliation_name'],
+    'degrees': ['object_id', 'degree_type', 'subject', 'institution'],
+}
+NETWORK_ROWS = 10000
 
 class NetworkTab(QWidget):
+    # Tables lues à la construction de l'onglet : {table: (lignes, colonnes)}
+    DATA_REQUESTS = {name: (NETWORK_ROWS, columns) for name, columns in NETWORK_COLUMNS.items()}
+
     def __init__(self):
         super().__init__()
         self.data_loader = DataLoader()
-        self.data_loader.load_data_network(n_rows=10000)
+        self.data_loader.load(list(NETWORK_COLUMNS), n_rows=NETWORK_ROWS, columns=NETWORK_COLUMNS)
         self.init_ui()
         
     def init_ui(self):
@@ -36,96 +49,25 @@ class NetworkTab(QWidget):
         self.create_network()
         
     def create_network(self):
-        if self.data_loader.degrees is not None and self.data_loader.people is not None:
+        if self.data_loader.has_table('degrees') and self.data_loader.has_table('people'):
+            # Le graphe et sa disposition sont relus depuis le disque tant que les données n'ont pas changé
+            network = self.data_loader.snapshot('network', ['degrees', 'people'], self.build_network)
+            if network is None:
+                return
+
             # Clear the figure
             self.figure.clear()
             
-            # Prepare the data
-            df = self.data_loader.degrees.copy()
-            
-            # Join with people data to get full names and affiliations
-            people_df = self.data_loader.people.copy()
-            people_df['full_name'] = people_df['first_name'].fillna('') + ' ' + people_df['last_name'].fillna('')
-            people_df['full_name'] = people_df['full_name'].str.strip()
-            
-            df = df.merge(people_df[['object_id', 'full_name', 'affiliation_name']], 
-                         left_on='object_id', 
-                         right_on='object_id', 
-                         how='left')
-            
-            # Clean the data
-            df = df.dropna(subset=['full_name', 'institution'])
-            df['institution'] = df['institution'].fillna('Unknown Institution')
-            df['affiliation_name'] = df['affiliation_name'].fillna('Unknown Company')
-            
-            # Standardize institution names
-            def standardize_institution(name):
-                name = str(name).strip()
-                if pd.isna(name) or name == '':
-                    return 'Unknown Institution'
-                # Add common variations of university names
-                if 'MIT' in name or 'Massachusetts Institute of Technology' in name:
-                    return 'MIT'
-                if 'Stanford' in name:
-                    return 'Stanford University'
-                if 'Harvard' in name:
-                    return 'Harvard University'
-                if 'Berkeley' in name:
-                    return 'UC Berkeley'
-                return name
-            
-            df['institution'] = df['institution'].apply(standardize_institution)
-            
-            # Create the graph
-            G = nx.Graph()
-            
-            # Add edges from the dataframe
-            G = nx.from_pandas_edgelist(df, source='full_name', target='institution',
-                                      edge_attr=['degree_type', 'subject'])
-            
-            # Add company attributes
-            nx.set_node_attributes(G, pd.Series(df['affiliation_name'].values, 
-                                              index=df['full_name']).to_dict(), 'company')
-            nx.set_node_attributes(G, pd.Series(np.nan, 
-                                              index=df['institution']).to_dict(), 'company')
-            
-            # Get the largest connected component
-            components = list(nx.connected_components(G))
-            largest_component = max(components, key=len)
-            subgraph = G.subgraph(largest_component)
-            
-            # Calculate network metrics
-            try:
-                n_components = len(components)
-                component_sizes = [len(c) for c in components]
-                
-                self.desc_label.setText(
-                    f"Network Statistics:\n"
-                    f"Total number of nodes: {G.number_of_nodes()}\n"
-                    f"Total number of edges: {G.number_of_edges()}\n"
-                    f"Number of components: {n_components}\n"
-                    f"Largest component size: {len(largest_component)}\n"
-                    f"Average component size: {np.mean(component_sizes):.2f}"
-                )
-            except nx.NetworkXError as e:
-                self.desc_label.setText(f"Network metrics calculation error: {str(e)}")
-            
+            self.desc_label.setText(network['stats'])
+            subgraph, pos = network['subgraph'], network['pos']
+
             # Create a new axes object
             ax = self.figure.add_subplot(111)
             
-            # Calculate node sizes based on degree centrality
-            centrality = nx.degree_centrality(subgraph)
-            node_sizes = [centrality[node] * 3000 for node in subgraph.nodes()]  # Reduced multiplier
-            
-            # Create node colors based on type (person, institution)
-            node_colors = ['lightblue' if node in df['full_name'].values 
-                          else 'lightgreen' for node in subgraph.nodes()]
-            
             # Draw the network with adjusted parameters
-            pos = nx.spring_layout(subgraph, k=2/np.sqrt(len(subgraph.nodes())), iterations=50) #Fruchterman-Reingold
             nx.draw(subgraph, pos,
-                   node_size=node_sizes,
-                   node_color=node_colors,
+                   node_size=network['node_sizes'],
+                   node_color=network['node_colors'],
                    with_labels=True,
                    font_size=6,
                    font_weight='bold',
@@ -134,7 +76,7 @@ class NetworkTab(QWidget):
                    ax=ax)
             
             # Add a title
-            ax.set_title(f"Education Network: Largest Component of {len(largest_component)} Nodes", pad=20)
+            ax.set_title(f"Education Network: Largest Component of {len(subgraph)} Nodes", pad=20)
             
             # Add legend
             ax.plot([], [], 'o', color='lightblue', label='People')
@@ -144,3 +86,100 @@ class NetworkTab(QWidget):
             # Adjust layout and draw
             self.figure.tight_layout()
             self.canvas.draw()
+
+    def build_network(self):
+        """Build the education graph and lay out its largest component
+        Returns:
+            dict: Statistics text, largest component, its layout, node sizes and colors,
+                or None if the tables could not be loaded.
+        """
+        if self.data_loader.degrees is None or self.data_loader.people is None:
+            return None
+
+        # Prepare the data
+        df = self.data_loader.degrees.copy()
+        
+        # Join with people data to get full names and affiliations
+        people_df = self.data_loader.people.copy()
+        people_df['full_name'] = people_df['first_name'].fillna('') + ' ' + people_df['last_name'].fillna('')
+        people_df['full_name'] = people_df['full_name'].str.strip()
+        
+        df = df.merge(people_df[['object_id', 'full_name', 'affiliation_name']], 
+                     left_on='object_id', 
+                     right_on='object_id', 
+                     how='left')
+        
+        # Clean the data
+        df = df.dropna(subset=['full_name', 'institution'])
+        df['institution'] = df['institution'].astype(object).fillna('Unknown Institution')
+        df['affiliation_name'] = df['affiliation_name'].fillna('Unknown Company')
+        
+        # Standardize institution names
+        def standardize_institution(name):
+            name = str(name).strip()
+            if pd.isna(name) or name == '':
+                return 'Unknown Institution'
+            # Add common variations of university names
+            if 'MIT' in name or 'Massachusetts Institute of Technology' in name:
+                return 'MIT'
+            if 'Stanford' in name:
+                return 'Stanford University'
+            if 'Harvard' in name:
+                return 'Harvard University'
+            if 'Berkeley' in name:
+                return 'UC Berkeley'
+            return name
+        
+        df['institution'] = df['institution'].apply(standardize_institution)
+        
+        # Create the graph
+        G = nx.Graph()
+        
+        # Add edges from the dataframe
+        G = nx.from_pandas_edgelist(df, source='full_name', target='institution',
+                                  edge_attr=['degree_type', 'subject'])
+        
+        # Add company attributes
+        nx.set_node_attributes(G, pd.Series(df['affiliation_name'].values, 
+                                          index=df['full_name']).to_dict(), 'company')
+        nx.set_node_attributes(G, pd.Series(np.nan, 
+                                          index=df['institution']).to_dict(), 'company')
+        
+        # Get the largest connected component
+        components = list(nx.connected_components(G))
+        largest_component = max(components, key=len)
+        subgraph = G.subgraph(largest_component).copy()
+        
+        # Calculate network metrics
+        try:
+            n_components = len(components)
+            component_sizes = [len(c) for c in components]
+            
+            stats = (
+                f"Network Statistics:\n"
+                f"Total number of nodes: {G.number_of_nodes()}\n"
+                f"Total number of edges: {G.number_of_edges()}\n"
+                f"Number of components: {n_components}\n"
+                f"Largest component size: {len(largest_component)}\n"
+                f"Average component size: {np.mean(component_sizes):.2f}"
+            )
+        except nx.NetworkXError as e:
+            stats = f"Network metrics calculation error: {str(e)}"
+        
+        # Calculate node sizes based on degree centrality
+        centrality = nx.degree_centrality(subgraph)
+        node_sizes = [centrality[node] * 3000 for node in subgraph.nodes()]  # Reduced multiplier
+        
+        # Create node colors based on type (person, institution)
+        node_colors = ['lightblue' if node in df['full_name'].values 
+                      else 'lightgreen' for node in subgraph.nodes()]
+        
+        # Lay out the network
+        pos = nx.spring_layout(subgraph, k=2/np.sqrt(len(subgraph.nodes())), iterations=50) #Fruchterman-Reingold
+        return {
+            'stats': stats,
+            'subgraph': subgraph,
+            'pos': pos,
+            'node_sizes': node_sizes,
+            'node_colors': node_colors,
+        }
@@ -2,12 +2,27 @@ import json
 import pandas as pd
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, QComboBox,
     QLabel, QPushButton, QTextEdit)
+from data_loader import DataLoader, stream_filter
+
+# Colonnes lues pour la prédiction. Les tables sont parcourues en entier, par
+# blocs, et seules les lignes des profils concernés sont gardées.
+PREDICTION_COLUMNS = {
+    'relationships': ['person_object_id', 'relationship_object_id', 'title'],
+    'funding_rounds': ['object_id', 'funded_at', 'raised_amount_usd'],
+    'acquisitions': ['acquired_object_id', 'price_amount'],
+    'ipos': ['object_id', 'valuation_amount'],
+    'degrees': ['object_id', 'degree_type', 'subject'],
+}
 
 class PredictionTab(QWidget):
+    # Tables parcourues par blocs : seule leur copie en cache est préparée à l'avance
+    STREAMED_TABLES = list(PREDICTION_COLUMNS)
+
     def __init__(self, profile_match_tab):
         super().__init__()
         self.profile_match_tab = profile_match_tab
         self.profile_match_tab.profiles_updated.connect(self.reload_profiles)
+        self.data_loader = DataLoader()
         self.init_ui()
         self.load_profiles()
 
@@ -52,6 +67,13 @@ class PredictionTab(QWidget):
         except Exception as e:
             self.results_area.setText(f"Error loading profiles: {str(e)}")
 
+    def matching_rows(self, table, column, ids):
+        """Return the rows of a whole table whose `column` is one of `ids`; missing ids match nothing"""
+        # Un identifiant manquant ferait correspondre toutes les lignes sans identifiant
+        ids = {key for key in ids if pd.notna(key)}
+        return stream_filter(self.data_loader.iter_chunks(table, PREDICTION_COLUMNS[table]),
+                             lambda chunk: chunk[column].isin(ids))
+
     def predict_success(self):
         try:
             selected_profile = self.profile_selector.currentText()
@@ -60,14 +82,18 @@ class PredictionTab(QWidget):
                 return
 
             matched_profiles = self.profiles[selected_profile]['matched_profiles']
-            person_ids = [profile['object_id'] for profile in matched_profiles]
-
-            # Load necessary data
-            relationships_df = pd.read_csv('data/relationships.csv')
-            funding_rounds_df = pd.read_csv('data/funding_rounds.csv')
-            acquisitions_df = pd.read_csv('data/acquisitions.csv')
-            ipos_df = pd.read_csv('data/ipos.csv')
-            degrees_df = pd.read_csv('data/degrees.csv')
+            person_ids = self.data_loader.id_keys(profile['object_id'] for profile in matched_profiles)
+
+            # Load necessary data, restricted to the matched people and the companies they founded
+            degrees_df = self.matching_rows('degrees', 'object_id', person_ids)
+            relationships_df = self.matching_rows('relationships', 'person_object_id', person_ids)
+            company_ids = relationships_df.loc[
+                relationships_df['title'].str.contains('Founder', case=False, na=False),
+                'relationship_object_id'
+            ]
+            funding_rounds_df = self.matching_rows('funding_rounds', 'object_id', company_ids)
+            acquisitions_df = self.matching_rows('acquisitions', 'acquired_object_id', company_ids)
+            ipos_df = self.matching_rows('ipos', 'object_id', company_ids)
             
             results_text = f"Success Prediction for {selected_profile}:\n\n"
             results_text += f"Based on {len(person_ids)} similar founder profiles\n\n"
@@ -9,13 +9,28 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, QLineEdit,
 from PyQt5.QtCore import Qt
 import pandas as pd
 from datetime import datetime
-from sklearn.preprocessing import StandardScaler
-from sklearn.neighbors import NearestNeighbors
 import numpy as np
 import os
-from data_loader import DataLoader
+from data_loader import DataLoader, decode_id
+from lazy_import import lazy_import
+
+# Importés à la construction de l'onglet seulement
+StandardScaler = lazy_import('sklearn.preprocessing', 'StandardScaler')
+NearestNeighbors = lazy_import('sklearn.neighbors', 'NearestNeighbors')
+
+# Colonnes lues pour la correspondance de profils
+PROFILE_COLUMNS = {
+    'people': ['object_id', 'first_name', 'last_name'],
+    'degrees': ['object_id', 'degree_type', 'graduated_at', 'created_at'],
+}
 
 class ProfileMatchTab(QWidget):
+    # Tables lues à la construction de l'onglet : {table: (lignes, colonnes)}
+    DATA_REQUESTS = {
+        'people': (5000, PROFILE_COLUMNS['people']),
+        'degrees': (None, PROFILE_COLUMNS['degrees']),
+    }
+
     # Add signal at the class level
     profiles_updated = pyqtSignal()  # Add this at the top of the class
     
@@ -23,7 +38,7 @@ class ProfileMatchTab(QWidget):
         super().__init__()
         # Initialize data loader
         self.data_loader = DataLoader()
-        self.data_loader.load_data()
+        self.data_loader.load(['people'], columns=PROFILE_COLUMNS)
         
         # Define degree mapping at initialization
         self.degree_type_mapping = {
@@ -224,46 +239,68 @@ class ProfileMatchTab(QWidget):
     def prepare_data(self):
         try:
             # Read education data
-            df = pd.read_csv('data/degrees.csv')
+            if not self.data_loader.load(['degrees'], n_rows=None, columns=PROFILE_COLUMNS):
+                self.results_area.setText("Error: Could not load degrees data")
+                return False
 
-            # Convert dates to datetime
-            df['graduated_at'] = pd.to_datetime(df['graduated_at'])
-            df['created_at'] = pd.to_datetime(df['created_at'])
+            # Le modèle est relu depuis le disque tant que les diplômes n'ont pas changé
+            prepared = self.data_loader.snapshot('profile_match', ['degrees'], self.fit_model,
+                                                 params=self.degree_type_mapping)
+            if prepared is None:
+                self.results_area.setText("Error: No valid data after preprocessing")
+                return False
+            self.processed_data, self.X, self.X_scaled, self.scaler, self.nn_model = prepared
 
-            # Extract graduation year from graduated_at
-            df['graduation_year'] = df['graduated_at'].dt.year
+            return True
 
-            # Calculate the time difference (experience before starting company)
-            df['experience_years'] = (df['created_at'].dt.year - df['graduation_year'])
+        except Exception as e:
+            self.results_area.setText(f"Error preparing data: {str(e)}")
+            return False
 
-            # Map degree types to numerical values
-            df['degree_level'] = df['degree_type'].map(self.degree_type_mapping)
+    def fit_model(self):
+        """Preprocess the degrees and fit the scaler and the nearest neighbors model
+        Returns:
+            tuple: (processed data, features, scaled features, scaler, model),
+                or None if no row is usable.
+        """
+        df = self.data_loader.degrees.copy()
 
-            # Drop rows with missing values
-            df = df.dropna(subset=['graduation_year', 'degree_level'])
+        # Convert dates to datetime
+        df['graduated_at'] = pd.to_datetime(df['graduated_at'])
+        df['created_at'] = pd.to_datetime(df['created_at'])
 
-            if len(df) == 0:
-                self.results_area.setText("Error: No valid data after preprocessing")
-                return False
+        # Extract graduation year from graduated_at
+        df['graduation_year'] = df['graduated_at'].dt.year
+
+        # Calculate the time difference (experience before starting company)
+        df['experience_years'] = (df['created_at'].dt.year - df['graduation_year'])
+
+        # Map degree types to numerical values
+        df['degree_level'] = df['degree_type'].map(self.degree_type_mapping)
 
-            # Prepare feature matrix
-            self.X = df[['degree_level', 'experience_years']].values
+        # Drop rows with missing values
+        df = df.dropna(subset=['graduation_year', 'degree_level'])
 
-            # Store processed data
-            self.processed_data = df
+        if len(df) == 0:
+            return None
 
+        # Prepare feature matrix
+        X = df[['degree_level', 'experience_years']].values
+
+        try:
             # Initialize and fit scaler
-            self.X_scaled = self.scaler.fit_transform(self.X)
+            scaler = StandardScaler()
+            X_scaled = scaler.fit_transform(X)
 
             # Initialize and fit nearest neighbors model
-            self.nn_model = NearestNeighbors(n_neighbors=min(5, len(df)), metric='euclidean')
-            self.nn_model.fit(self.X_scaled)
+            nn_model = NearestNeighbors(n_neighbors=min(5, len(df)), metric='euclidean')
+            nn_model.fit(X_scaled)
+        except ValueError as e:
+            # Années manquantes : find_matches n'utilise que processed_data
+            print(f"Error fitting model: {e}")
+            X_scaled = nn_model = None
 
-            return True
-
-        except Exception as e:
-            self.results_area.setText(f"Error preparing data: {str(e)}")
-            return False
+        return df, X, X_scaled, scaler, nn_model
 
     def find_matches(self):
         try:
@@ -305,9 +342,7 @@ class ProfileMatchTab(QWidget):
                 # Get person's name from people.csv using object_id
                 person_name = "Unknown"
                 if self.data_loader.people is not None:
-                    person_data = self.data_loader.people[
-                        self.data_loader.people['object_id'] == profile['object_id']
-                    ]
+                    person_data = self.data_loader.lookup('people', profile['object_id'])
                     if not person_data.empty:
                         first_name = person_data.iloc[0].get('first_name', '')
                         last_name = person_data.iloc[0].get('last_name', '')
@@ -325,7 +360,7 @@ class ProfileMatchTab(QWidget):
                     'degree_type': profile['degree_type'],
                     'experience_years': int(profile['experience_years']),
                     'similarity': float(similarity),
-                    'object_id': profile['object_id']
+                    'object_id': decode_id(profile['object_id'])
                 })
 
             self.results_area.setText(results_text)
@@ -1,61 +1,110 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem
-import csv
+import sys
+import os
+import threading
+
+# Add parent directory to path to import data_loader
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_loader import DataLoader
+from profile_index import PROFILE_COLUMNS, ProfileIndex
+
+# Lignes lues par table : toutes, la recherche porte sur l'ensemble des profils
+PROFILE_ROWS = None
+# Nombre maximal de profils affichés
+PROFILE_RESULTS = 500
 
 class ProfileSearchTab(QWidget):
+    # Tables lues à la construction de l'onglet : {table: (lignes, colonnes)}
+    DATA_REQUESTS = {name: (PROFILE_ROWS, columns) for name, columns in PROFILE_COLUMNS.items()}
+
     def __init__(self):
         super().__init__()
-        
+        self.data_loader = DataLoader()
+        self.data_loader.load(list(PROFILE_COLUMNS), n_rows=PROFILE_ROWS, columns=PROFILE_COLUMNS)
+        # Index des profils, construit (ou relu depuis un instantané) en arrière-plan
+        self.profile_index = None
+        self.index_thread = threading.Thread(target=self.build_index, daemon=True)
+        self.index_thread.start()
+
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
-        
+
         # Input fields
         input_layout = QHBoxLayout()
-        
+
         self.name_input = QLineEdit()
         self.name_input.setPlaceholderText("Enter Name")
         input_layout.addWidget(QLabel("Name:"))
         input_layout.addWidget(self.name_input)
-        
+
         self.university_input = QLineEdit()
         self.university_input.setPlaceholderText("Enter University")
         input_layout.addWidget(QLabel("University:"))
         input_layout.addWidget(self.university_input)
-        
+
         self.city_input = QLineEdit()
         self.city_input.setPlaceholderText("Enter City")
         input_layout.addWidget(QLabel("City:"))
         input_layout.addWidget(self.city_input)
-        
+
+        for field_input in (self.name_input, self.university_input, self.city_input):
+            field_input.returnPressed.connect(self.search_profiles)
+
         self.layout.addLayout(input_layout)
-        
+
         # Search button
         self.search_button = QPushButton("Search")
         self.search_button.clicked.connect(self.search_profiles)
         self.layout.addWidget(self.search_button)
-        
+
+        # Nombre de profils trouvés
+        self.status_label = QLabel("")
+        self.layout.addWidget(self.status_label)
+
         # Results table
         self.results_table = QTableWidget()
         self.results_table.setColumnCount(3)
         self.results_table.setHorizontalHeaderLabels(["Name", "University", "City"])
         self.layout.addWidget(self.results_table)
-    
+
+    def build_index(self):
+        people = self.data_loader.people
+        if people is None:
+            return
+        try:
+            self.profile_index = self.data_loader.snapshot(
+                'profile_index', list(PROFILE_COLUMNS),
+                lambda: ProfileIndex(people, self.data_loader.degrees,
+                                     self.data_loader.relationships, self.data_loader.offices))
+        except Exception as e:
+            print(f"Error indexing profiles: {e}")
+
     def search_profiles(self):
-        name = self.name_input.text().strip().lower()
-        university = self.university_input.text().strip().lower()
-        city = self.city_input.text().strip().lower()
-        
-        results = []
-        
-        with open("people.csv", "r") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if (not name or name in row["name"].lower()) and \
-                   (not university or university in row["university"].lower()) and \
-                   (not city or city in row["city"].lower()):
-                    results.append([row["name"], row["university"], row["city"]])
-        
+        criteria = {
+            'name': self.name_input.text().strip(),
+            'institution': self.university_input.text().strip(),
+            'city': self.city_input.text().strip(),
+        }
+        if not any(criteria.values()):
+            return
+
+        index = self.profile_index
+        if index is None or self.data_loader.people is None or len(index) != len(self.data_loader.people):
+            self.status_label.setText("Building the profile index, please try again in a moment...")
+            return
+
+        # Une liste triée de personnes par critère, intersectées
+        positions = index.search(criteria)
+        results = [["; ".join(index.values(field, position)) for field in ('name', 'institution', 'city')]
+                   for position in positions[:PROFILE_RESULTS]]
+
+        status = f"{len(positions)} profiles found"
+        if len(positions) > PROFILE_RESULTS:
+            status += f", showing the first {PROFILE_RESULTS}"
+        self.status_label.setText(status)
+
         # Display results in the table
         self.results_table.setRowCount(len(results))
         for i, result in enumerate(results):
             for j, value in enumerate(result):
-                self.results_table.setItem(i, j, QTableWidgetItem(value))
\ No newline at end of file
+                self.results_table.setItem(i, j, QTableWidgetItem(value))
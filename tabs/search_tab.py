@@ -1,24 +1,357 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
-                           QProgressBar, QComboBox, QCheckBox)
-from PyQt5.QtCore import Qt
+                           QLineEdit, QPushButton, QTableView, QHeaderView,
+                           QProgressBar, QComboBox, QCheckBox, QStyledItemDelegate,
+                           QStyleOptionButton, QStyle, QApplication)
+from PyQt5.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex, QEvent, pyqtSignal
+import numpy as np
 import pandas as pd
 import sys
 import os
-import traceback
+import threading
 
 # Add parent directory to path to import data_loader
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from company_summary import SUMMARY_TABLES, company_summary
 from data_loader import DataLoader
+from result_cache import ResultCache, normalize_term
+from search_index import RANK_FUZZY, FuzzyIndex, TrigramIndex, scan_ranks, scan_search, top_k
+from search_worker import SearchWorker, fund_row, person_row, startup_row, startup_summary
+
+# Colonnes lues par chaque type de recherche
+SEARCH_COLUMNS = {
+    'people': ['object_id', 'first_name', 'last_name', 'affiliation_name'],
+    'degrees': ['object_id', 'degree_type', 'subject', 'institution'],
+    'relationships': ['person_object_id', 'title'],
+    'objects': ['id', 'name', 'category_code', 'status', 'founded_at'],
+    'funds': ['name', 'funded_at', 'raised_amount', 'source_description', 'source_url'],
+}
+SEARCH_ROWS = 50000
+# Colonnes de texte indexées pour la recherche par nom de chaque table
+NAME_INDEXES = {
+    'people': ['first_name', 'last_name'],
+    'objects': ['name'],
+    'funds': ['name'],
+}
+# Délai entre la dernière frappe et la recherche, en millisecondes
+SEARCH_DELAY_MS = 250
+# Longueur minimale d'un terme pour lancer la recherche pendant la frappe
+LIVE_SEARCH_MIN_CHARS = 3
+# Nombre de noms approchants proposés quand aucun nom ne contient le terme
+FUZZY_RESULTS = 50
+# Lignes de résultats construites à la fois ; "Plus de résultats" construit les suivantes
+SEARCH_PAGE_ROWS = 100
+# Pour chaque type de recherche : (table, construction d'une ligne, données communes
+# aux lignes d'une page, colonne départageant les résultats de même rang, la plus
+# grande valeur d'abord)
+SEARCHES = {
+    "Search Person": ('people', person_row, None, None),
+    "Search Startup": ('objects', startup_row, startup_summary, 'total_raised_usd'),
+    "Search Fund": ('funds', fund_row, None, 'raised_amount'),
+}
+# Tables dont dépendent les résultats de chaque type de recherche
+SEARCH_TABLES = {
+    "Search Person": ['people', 'degrees', 'relationships'],
+    "Search Startup": SUMMARY_TABLES,
+    "Search Fund": ['funds'],
+}
+
+# Rôle des données portant l'URL d'une cellule de lien
+URL_ROLE = Qt.UserRole
+
+class ResultsModel(QAbstractTableModel):
+    """Search results, stored column-wise for fast N/A filtering.
+
+    Each column is a numpy object array, grown by doubling as batches of
+    results arrive, next to a boolean array marking its 'N/A' cells. Hiding the
+    rows with N/A in some columns is a single mask over those arrays; the view
+    shows the positions of the remaining rows. URL cells hold ('View', url)
+    tuples: they display 'View' and give the URL through URL_ROLE.
+    """
+
+    def __init__(self, columns=()):
+        super().__init__()
+        self.set_columns(columns)
+
+    def set_columns(self, columns):
+        """Clear the results and set the column headers"""
+        self.beginResetModel()
+        self._headers = list(columns)
+        self._values = np.empty((0, len(self._headers)), dtype=object, order='F')
+        self._na = np.zeros((0, len(self._headers)), dtype=bool, order='F')
+        self._n_results = 0
+        self._visible = np.array([], dtype=np.int64)
+        self._hidden_na = np.zeros(len(self._headers), dtype=bool)
+        self._message = None
+        self.endResetModel()
+
+    def clear(self):
+        self.set_columns(self._headers)
+
+    def __len__(self):
+        return self._n_results
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 1 if self._message is not None else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, URL_ROLE):
+            return None
+        if self._message is not None:
+            return self._message if role == Qt.DisplayRole and index.column() == 0 else None
+        value = self._values[self._visible[index.row()], index.column()]
+        if isinstance(value, tuple) and len(value) == 2:  # For URL buttons
+            return value[0] if role == Qt.DisplayRole else value[1]
+        return str(value) if role == Qt.DisplayRole else None
+
+    def set_message(self, message):
+        """Show a single message row (no results, error...) instead of the results"""
+        self.beginResetModel()
+        self._message = message
+        self.endResetModel()
+
+    def _visible_rows(self, start, stop):
+        """Return the positions of the rows in [start, stop) that pass the N/A filter"""
+        hidden = self._na[start:stop][:, self._hidden_na].any(axis=1)
+        return start + np.flatnonzero(~hidden)
+
+    def append_rows(self, rows):
+        """Add a batch of result rows; each row is a list with one value per column"""
+        if not rows:
+            return
+        start, stop = self._n_results, self._n_results + len(rows)
+        if stop > len(self._values):
+            capacity = max(stop, 2 * len(self._values), 1024)
+            values = np.empty((capacity, len(self._headers)), dtype=object, order='F')
+            values[:start] = self._values[:start]
+            na = np.zeros((capacity, len(self._headers)), dtype=bool, order='F')
+            na[:start] = self._na[:start]
+            self._values, self._na = values, na
+        for column in range(len(self._headers)):
+            # Une Series garde les tuples des liens comme des valeurs uniques
+            cells = pd.Series([row[column] if column < len(row) else '' for row in rows], dtype=object)
+            self._values[start:stop, column] = cells.to_numpy()
+            self._na[start:stop, column] = (cells.astype(str) == 'N/A').to_numpy()
+        self._n_results = stop
+        new_rows = self._visible_rows(start, stop)
+        if len(new_rows) and self._message is None:
+            first = len(self._visible)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            self._visible = np.concatenate([self._visible, new_rows])
+            self.endInsertRows()
+        else:
+            self._visible = np.concatenate([self._visible, new_rows])
+
+    def set_hidden_na(self, hidden):
+        """Hide the rows with 'N/A' in the given columns
+        Args:
+            hidden (list): One bool per column, True to hide the rows with N/A in it.
+        """
+        self.beginResetModel()
+        self._hidden_na = np.array(hidden, dtype=bool)
+        self._visible = self._visible_rows(0, self._n_results)
+        self.endResetModel()
+
+class UrlDelegate(QStyledItemDelegate):
+    """Draws link cells (see URL_ROLE) as buttons and emits clicked(url) when one is clicked,
+    without creating a widget per cell"""
+
+    clicked = pyqtSignal(str)
+
+    def _button(self, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data(Qt.DisplayRole)
+        button.state = QStyle.State_Enabled | (option.state & QStyle.State_MouseOver)
+        return button
+
+    def paint(self, painter, option, index):
+        if index.data(URL_ROLE) is None:
+            super().paint(painter, option, index)
+            return
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, self._button(option, index), painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        url = index.data(URL_ROLE)
+        if url is not None and event.type() == QEvent.MouseButtonRelease \
+                and event.button() == Qt.LeftButton and option.rect.contains(event.pos()):
+            self.clicked.emit(str(url))
+            return True
+        return super().editorEvent(event, model, option, index)
 
 class SearchTab(QWidget):
+    # Tables lues à la construction de l'onglet : {table: (lignes, colonnes)}
+    DATA_REQUESTS = {name: (SEARCH_ROWS, columns) for name, columns in SEARCH_COLUMNS.items()}
+    # Tables parcourues en entier pour le résumé des entreprises
+    STREAMED_TABLES = SUMMARY_TABLES
+
     def __init__(self):
         super().__init__()
         self.data_loader = DataLoader()
-        self.data_loader.load_data(n_rows=50000)
+        self.data_loader.load(list(SEARCH_COLUMNS), n_rows=SEARCH_ROWS, columns=SEARCH_COLUMNS)
+        # Les tables ne servent qu'à la première recherche : on les lit en arrière-plan
+        self.data_loader.prefetch()
+        # Index des noms, construits (ou relus depuis un instantané) en arrière-plan
+        self.name_indexes = {}
+        self.fuzzy_indexes = {}
+        self.company_summary = None
+        # Dernière recherche par table : {table: (terme, table lue, positions trouvées)},
+        # rendue par le worker de la recherche
+        self.previous_matches = {}
+        self.index_thread = threading.Thread(target=self.build_name_indexes, daemon=True)
+        self.index_thread.start()
+        # Recherche en cours ; chaque nouvelle recherche incrémente la génération
+        self.search_worker = None
+        self.search_generation = 0
+        # Classement de la dernière recherche, rendu par son worker : ((table, terme),
+        # table lue, noms contenant le terme, positions, rangs, départage)
+        self.ranking = None
+        # Résultats des recherches récentes, et ceux de la recherche affichée :
+        # (type, terme, version des tables), lignes construites, nombre de correspondances
+        self.result_cache = ResultCache()
+        # Version des tables lues par l'onglet, par type de recherche ; relevée une
+        # fois en arrière-plan, sans cache des résultats d'ici là
+        self.data_versions = {}
+        self.current_search = None
+        self.shown_rows = []
+        self.n_matches = 0
         self.init_ui()
-        self.current_results = []
         
+    def build_name_indexes(self):
+        # Les tables de l'onglet ne changent plus : leur version sert de clé au cache
+        try:
+            self.data_versions = {search_type: self.data_loader.data_version(tables)
+                                  for search_type, tables in SEARCH_TABLES.items()}
+        except Exception as e:
+            print(f"Error reading the data version: {e}")
+        # Les index exacts d'abord : la recherche approximative ne sert qu'en secours
+        self.build_indexes(self.name_indexes, 'search', TrigramIndex)
+        # Résumé des entreprises, lu par chaque ligne de résultat d'une startup
+        try:
+            self.company_summary = company_summary(self.data_loader.store)
+        except Exception as e:
+            print(f"Error building the company summary: {e}")
+        self.build_indexes(self.fuzzy_indexes, 'fuzzy', FuzzyIndex)
+    
+    def build_indexes(self, indexes, prefix, index_class):
+        for table, columns in NAME_INDEXES.items():
+            frame = getattr(self.data_loader, table)
+            if frame is None:
+                continue
+            try:
+                indexes[table] = self.data_loader.snapshot(
+                    f"{prefix}_{table}", [table], lambda: index_class.from_frame(frame, columns),
+                    params=columns)
+            except Exception as e:
+                print(f"Error indexing {table}: {e}")
+    
+    def rank_matches(self, table, search_term, rank_by=None, candidates=None, cancelled=None):
+        """Return every match of a search with its rank: the rows whose name contains
+        the term, or if there are none, the rows with the closest names
+        Args:
+            table (str): 'people', 'objects' or 'funds', see NAME_INDEXES.
+            search_term (str): Name, or part of a name, to look for.
+            rank_by (str, optional): Column ordering the matches of a same rank, see SEARCHES.
+            candidates (array, optional): Sorted positions the names containing the term are among.
+            cancelled (callable, optional): Returns True once the search is abandoned.
+        Returns:
+            tuple: (positions of the names containing the term, positions of the matches,
+                ranks, tie-breaker values or None), see top_k; None if the search was abandoned.
+        """
+        frame = getattr(self.data_loader, table)
+        name_matches = self.find_by_name(table, search_term, candidates)
+        if cancelled is not None and cancelled():
+            return None
+        if len(name_matches):
+            index = self.name_indexes.get(table)
+            if index is not None and len(index) == len(frame):
+                ranks = index.ranks(name_matches, search_term)
+            else:
+                ranks = scan_ranks(frame, NAME_INDEXES[table], name_matches, search_term)
+            return name_matches, name_matches, ranks, self.tie_breaker(frame, name_matches, rank_by)
+        # Aucun nom ne contient le terme : faute de frappe probable, les plus proches d'abord
+        positions, scores = self.find_similar(table, search_term)
+        return name_matches, positions, np.full(len(positions), RANK_FUZZY), scores
+    
+    def tie_breaker(self, frame, positions, column):
+        """Return the values of a column for the given rows, taken from the company
+        summary when the table lacks it (total raised of a startup), or None"""
+        if column is None:
+            return None
+        if column in frame:
+            return frame[column].to_numpy(dtype=float, na_value=np.nan)[positions]
+        if self.company_summary is not None and column in self.company_summary:
+            ids = frame['id'].iloc[positions]
+            return self.company_summary[column].reindex(ids).to_numpy(dtype=float, na_value=np.nan)
+        return None
+    
+    def find_page(self, table, search_term, rank_by, start, stop, ranking=None, previous=None,
+                  cancelled=lambda: False):
+        """Return the matches of a search ranked between start and stop, best first,
+        with the number of matches and the ranking, see self.ranking.
+
+        Every match is ranked once per search, but only the first `stop` are
+        selected and sorted, see top_k. Runs on the search worker's thread and
+        changes nothing in the tab: the worker hands the ranking back.
+        Args:
+            ranking (tuple, optional): Ranking of an earlier page, reused if it is this search's.
+            previous (tuple, optional): Earlier search on the table, see self.previous_matches;
+                if the term extends it, only its matches are checked.
+            cancelled (callable): Returns True once the search is abandoned; None is
+                then returned.
+        """
+        frame = getattr(self.data_loader, table)
+        if ranking is None or ranking[0] != (table, search_term) or ranking[1] is not frame:
+            # Terme prolongé ("mar" -> "mart") : les résultats sont parmi les précédents,
+            # il suffit de vérifier ceux-là
+            candidates = None
+            if previous is not None and previous[0] in search_term and previous[1] is frame:
+                candidates = previous[2]
+            ranked = self.rank_matches(table, search_term, rank_by, candidates, cancelled)
+            if ranked is None:
+                return None
+            ranking = ((table, search_term), frame) + ranked
+        _, _, _, positions, ranks, values = ranking
+        if cancelled():
+            return None
+        order = top_k(ranks, stop, values)
+        if cancelled():
+            return None
+        return frame.iloc[positions[order[start:]]], len(positions), ranking
+    
+    def find_similar(self, table, search_term):
+        """Return the positions of the FUZZY_RESULTS rows of a table whose names are closest
+        to the search term, best first, and their scores; empty until the table's fuzzy index is built"""
+        frame = getattr(self.data_loader, table)
+        index = self.fuzzy_indexes.get(table)
+        if index is None or len(index) != len(frame):
+            return np.array([], dtype=np.int64), np.array([])
+        return index.search(search_term, FUZZY_RESULTS)
+    
+    def find_by_name(self, table, search_term, candidates=None):
+        """Return the sorted positions of the rows of a table whose indexed name columns contain the search term
+        Args:
+            table (str): 'people', 'objects' or 'funds', see NAME_INDEXES.
+            search_term (str): Substring to look for, case-insensitively.
+            candidates (array, optional): Sorted positions the matches are among; if None, every row.
+        """
+        frame = getattr(self.data_loader, table)
+        index = self.name_indexes.get(table)
+        if index is not None and len(index) == len(frame):
+            return index.search(search_term, candidates)
+        # Index pas encore prêt : parcours des colonnes
+        return scan_search(frame, NAME_INDEXES[table], search_term, candidates)
+    
     def init_ui(self):
         # Configuration de la mise en page principale
         layout = QVBoxLayout(self)
@@ -35,6 +368,7 @@ class SearchTab(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Entrez un nom à rechercher...")
         self.search_input.returnPressed.connect(self.perform_search)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
         search_layout.addWidget(QLabel("Nom:"))
         search_layout.addWidget(self.search_input)
         
@@ -44,6 +378,12 @@ class SearchTab(QWidget):
         
         layout.addLayout(search_layout)
         
+        # Recherche pendant la frappe, lancée quand la saisie marque une pause
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.perform_search)
+        
         # Configuration des filtres
         self.filter_layout = QHBoxLayout()
         layout.addLayout(self.filter_layout)
@@ -54,17 +394,30 @@ class SearchTab(QWidget):
         layout.addWidget(self.progress_bar)
         
         # Table de résultats
-        self.results_table = QTableWidget()
+        self.results = ResultsModel()
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results)
+        self.results_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.results_table.setWordWrap(False)
+        self.results_table.setMouseTracking(True)
+        self.url_delegate = UrlDelegate(self.results_table)
+        self.url_delegate.clicked.connect(self.open_url)
+        self.results_table.setItemDelegate(self.url_delegate)
         self.setup_person_table()  # Table par défaut pour la recherche de personnes
         layout.addWidget(self.results_table)
         
+        # Page suivante des résultats, construite à la demande
+        self.more_button = QPushButton("Plus de résultats")
+        self.more_button.setVisible(False)
+        self.more_button.clicked.connect(self.load_more)
+        layout.addWidget(self.more_button)
+        
     def setup_person_table(self):
         columns = ["Nom", "Prénom", "Titre", "Diplôme", "Institution", "Année d'obtention"]
         self.setup_table(columns)
     
     def setup_startup_table(self):
-        self.results_table.setColumnCount(8)
-        self.results_table.setHorizontalHeaderLabels([
+        self.setup_table([
             "Nom de la Startup", "Catégorie", "Statut", "Date de Création",
             "Étape", "Tour de Financement", "Montant Levé", "Valorisation"
         ])
@@ -85,8 +438,7 @@ class SearchTab(QWidget):
         for i in reversed(range(self.filter_layout.count())): 
             self.filter_layout.itemAt(i).widget().setParent(None)
         
-        self.results_table.setColumnCount(len(columns))
-        self.results_table.setHorizontalHeaderLabels(columns)
+        self.results.set_columns(columns)
         
         # Add filter checkboxes for each column
         for i, column in enumerate(columns):
@@ -99,42 +451,16 @@ class SearchTab(QWidget):
         for i in range(len(columns)):
             self.results_table.setColumnWidth(i, 150)
     
+    def filter_states(self):
+        return [self.filter_layout.itemAt(i).widget().isChecked()
+                for i in range(self.filter_layout.count())]
+    
     def apply_filters(self):
-        if not self.current_results:
-            return
-            
-        # Get filter states
-        filters = []
-        for i in range(self.filter_layout.count()):
-            checkbox = self.filter_layout.itemAt(i).widget()
-            filters.append(checkbox.isChecked())
-        
-        # Clear current table
-        self.results_table.setRowCount(0)
-        
-        # Apply filters and display results
-        row_index = 0
-        for result in self.current_results:
-            # Check if row should be shown based on filters
-            show_row = True
-            for col, (value, show_na) in enumerate(zip(result, filters)):
-                if not show_na and str(value) == 'N/A':
-                    show_row = False
-                    break
-            
-            if show_row:
-                self.results_table.insertRow(row_index)
-                for col, value in enumerate(result):
-                    if isinstance(value, tuple) and len(value) == 2:  # For URL buttons
-                        url_button = QPushButton("View")
-                        url_button.clicked.connect(lambda checked, url=value[1]: self.open_url(url))
-                        self.results_table.setCellWidget(row_index, col, url_button)
-                    else:
-                        item = QTableWidgetItem(str(value))
-                        self.results_table.setItem(row_index, col, item)
-                row_index += 1
+        self.results.set_hidden_na([not show_na for show_na in self.filter_states()])
     
     def on_search_type_changed(self, search_type):
+        self.cancel_search()
+        self.progress_bar.setVisible(False)
         if search_type == "Search Person":
             self.setup_person_table()
             self.search_input.setPlaceholderText("Entrez le nom d'une personne...")
@@ -144,242 +470,120 @@ class SearchTab(QWidget):
         else:
             self.setup_fund_table()
             self.search_input.setPlaceholderText("Entrez le nom d'un fonds...")
-        self.results_table.setRowCount(0)
+        self.results.clear()
+    
+    def on_search_text_changed(self, text):
+        # Chaque frappe repousse la recherche en attente : une requête dépassée
+        # par une saisie plus récente n'est jamais exécutée
+        self.search_timer.stop()
+        if len(text.strip()) >= LIVE_SEARCH_MIN_CHARS:
+            self.search_timer.start()
     
     def perform_search(self):
-        search_term = self.search_input.text().lower().strip()
+        self.search_timer.stop()
+        search_term = normalize_term(self.search_input.text())
         if not search_term:
             return
         
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-        self.results_table.setRowCount(0)
+        # La recherche précédente, si elle tourne encore, est abandonnée
+        self.cancel_search()
+        search_type = self.search_type.currentText()
+        table = SEARCHES[search_type][0]
+        if getattr(self.data_loader, table) is None:
+            return
+        self.results.clear()
+        self.apply_filters()
         
-        if self.search_type.currentText() == "Search Person":
-            self.search_person(search_term)
-        elif self.search_type.currentText() == "Search Startup":
-            self.search_startup(search_term)
-        else:
-            self.search_fund(search_term)
+        # Même recherche sur les mêmes données : résultats déjà construits
+        version = self.data_versions.get(search_type)
+        self.current_search = (search_type, search_term, version)
+        cached = self.result_cache.get(search_type, search_term, version) if version is not None else None
+        if cached is not None:
+            rows, self.n_matches = cached
+            self.shown_rows = list(rows)
+            self.results.append_rows(self.shown_rows)
+            self.show_more_button()
+            return
+        self.shown_rows = []
+        self.load_page()
     
-    def search_person(self, search_term):
-        try:
-            if self.data_loader.people is not None:
-                self.progress_bar.setValue(20)
-                
-                # Find matching people
-                people_matches = self.data_loader.people[
-                    self.data_loader.people['first_name'].astype(str).str.lower().str.contains(search_term, na=False) |
-                    self.data_loader.people['last_name'].astype(str).str.lower().str.contains(search_term, na=False)
-                ]
-                
-                results = []
-                self.progress_bar.setValue(40)
-                
-                # Process each matching person
-                for _, person in people_matches.iterrows():
-                    name = f"{person.get('first_name', '')} {person.get('last_name', '')}".strip()
-                    company = person.get('affiliation_name', 'N/A')
-                    object_id = person.get('object_id', '')
-                    
-                    # Get degree information
-                    degree_info = "N/A"
-                    university = "N/A"
-                    if self.data_loader.degrees is not None and object_id:
-                        person_degrees = self.data_loader.degrees[
-                            self.data_loader.degrees['object_id'] == object_id
-                        ]
-                        if not person_degrees.empty:
-                            degree = person_degrees.iloc[0]
-                            degree_type = degree.get('degree_type', '')
-                            subject = degree.get('subject', '')
-                            degree_info = f"{degree_type} in {subject}".strip()
-                            university = degree.get('institution', 'N/A')
-                    
-                    # Get title from relationships
-                    title = "N/A"
-                    if self.data_loader.relationships is not None and object_id:
-                        person_relationships = self.data_loader.relationships[
-                            self.data_loader.relationships['person_object_id'] == object_id
-                        ]
-                        if not person_relationships.empty:
-                            # Get the first non-null title
-                            titles = person_relationships['title'].dropna()
-                            if not titles.empty:
-                                title = titles.iloc[0]
-                    
-                    results.append([name, company, degree_info, university, title])
-                
-                self.progress_bar.setValue(80)
-                
-                # Display results
-                self.results_table.setRowCount(len(results))
-                for i, result in enumerate(results):
-                    for j, value in enumerate(result):
-                        item = QTableWidgetItem(str(value))
-                        self.results_table.setItem(i, j, item)
-                
-                if len(results) == 0:
-                    self.results_table.setRowCount(1)
-                    self.results_table.setItem(0, 0, QTableWidgetItem("No results found"))
-                
-                self.progress_bar.setValue(100)
-                
-                # Store results for filtering
-                self.current_results = results
-                
-                # Apply filters
-                self.apply_filters()
-        
-        except Exception as e:
-            print(f"Error during person search: {str(e)}")
-            traceback.print_exc()
-            self.results_table.setRowCount(1)
-            self.results_table.setItem(0, 0, QTableWidgetItem(f"Error during search: {str(e)}"))
+    def load_more(self):
+        """Build and show the next page of results of the current search"""
+        if self.current_search is not None and self.search_worker is None:
+            self.load_page()
     
-    def search_startup(self, search_term):
-        try:
-            if self.data_loader.objects is not None:
-                self.progress_bar.setValue(20)
-                
-                # Find matching startups
-                startup_matches = self.data_loader.objects[
-                    self.data_loader.objects['name'].astype(str).str.lower().str.contains(search_term, na=False)
-                ]
-                
-                results = []
-                self.progress_bar.setValue(40)
-                
-                # Process each matching startup
-                for _, startup in startup_matches.iterrows():
-                    name = startup.get('name', '')
-                    category = startup.get('category_code', 'N/A')
-                    status = startup.get('status', 'N/A')
-                    founded_date = startup.get('founded_at', 'N/A')
-                    object_id = startup.get('id', '')  # This is the c: id
-                    
-                    # Get milestone information
-                    milestone_url = "N/A"
-                    if self.data_loader.milestones is not None and object_id:
-                        startup_milestones = self.data_loader.milestones[
-                            self.data_loader.milestones['object_id'] == object_id
-                        ]
-                        if not startup_milestones.empty:
-                            milestone_url = startup_milestones.iloc[0].get('source_url', 'N/A')
-                    
-                    # Get funding information
-                    funding_round = "N/A"
-                    raised_amount = "N/A"
-                    valuation = "N/A"
-                    if self.data_loader.funding_rounds is not None and object_id:
-                        startup_funding = self.data_loader.funding_rounds[
-                            self.data_loader.funding_rounds['object_id'] == object_id
-                        ]
-                        if not startup_funding.empty:
-                            latest_funding = startup_funding.iloc[-1]  # Get the latest funding round
-                            funding_round = latest_funding.get('funding_round_code', 'N/A')
-                            
-                            # Format monetary values
-                            raised_amount_val = latest_funding.get('raised_amount', 'N/A')
-                            if raised_amount_val != 'N/A':
-                                raised_amount = f"${raised_amount_val:,.2f}"
-                                
-                            valuation_val = latest_funding.get('pre_money_valuation_usd', 'N/A')
-                            if valuation_val != 'N/A':
-                                valuation = f"${valuation_val:,.2f}"
-                    
-                    results.append([name, category, status, founded_date, 
-                                  ('View', milestone_url) if milestone_url != 'N/A' else 'N/A',
-                                  funding_round, raised_amount, valuation])
-                
-                self.progress_bar.setValue(80)
-                
-                # Display results
-                self.results_table.setRowCount(len(results))
-                for i, result in enumerate(results):
-                    for j, value in enumerate(result):
-                        if j == 4 and isinstance(value, tuple) and len(value) == 2:  # Milestone column with URL
-                            url_button = QPushButton("View")
-                            url_button.clicked.connect(lambda checked, url=value[1]: self.open_url(url))
-                            self.results_table.setCellWidget(i, j, url_button)
-                        else:
-                            item = QTableWidgetItem(str(value))
-                            self.results_table.setItem(i, j, item)
-                
-                if len(results) == 0:
-                    self.results_table.setRowCount(1)
-                    self.results_table.setItem(0, 0, QTableWidgetItem("No results found"))
-                
-                self.progress_bar.setValue(100)
-                
-                # Store results for filtering
-                self.current_results = results
-                
-                # Apply filters
-                self.apply_filters()
-        
-        except Exception as e:
-            print(f"Error during startup search: {str(e)}")
-            traceback.print_exc()
-            self.results_table.setRowCount(1)
-            self.results_table.setItem(0, 0, QTableWidgetItem(f"Error during search: {str(e)}"))
+    def load_page(self):
+        search_type, search_term, _ = self.current_search
+        table, make_row, row_context, rank_by = SEARCHES[search_type]
+        start = len(self.shown_rows)
         
-        finally:
-            self.progress_bar.setVisible(False)
-
-    def search_fund(self, search_term):
-        try:
-            if self.data_loader.funds is not None:
-                self.progress_bar.setValue(20)
-                
-                # Find matching funds
-                funds_matches = self.data_loader.funds[
-                    self.data_loader.funds['name'].astype(str).str.lower().str.contains(search_term, na=False)
-                ]
-                
-                # Sort by date
-                funds_matches = funds_matches.sort_values('funded_at', ascending=False)
-                
-                results = []
-                self.progress_bar.setValue(40)
-                
-                # Process each matching fund
-                for _, fund in funds_matches.iterrows():
-                    # Fund name
-                    name = str(fund['name'])
-                    
-                    # Date
-                    date_str = str(fund['funded_at']).split()[0] if pd.notna(fund['funded_at']) else 'N/A'
-                    
-                    # Amount
-                    amount_str = f"${fund['raised_amount']:,.2f}" if pd.notna(fund['raised_amount']) else 'N/A'
-                    
-                    # Source description
-                    source = str(fund['source_description'])
-                    
-                    # URL (stored as tuple for special handling)
-                    url = ('View', fund['source_url']) if pd.notna(fund['source_url']) else 'N/A'
-                    
-                    results.append([name, date_str, amount_str, source, url])
-                
-                self.progress_bar.setValue(80)
-                
-                # Store results for filtering
-                self.current_results = results
-                
-                # Apply filters
-                self.apply_filters()
-                
-                self.progress_bar.setValue(100)
-            
-        except Exception as e:
-            print(f"Error during fund search: {str(e)}")
-            traceback.print_exc()
-            self.results_table.setRowCount(1)
-            self.results_table.setItem(0, 0, QTableWidgetItem(f"Error during search: {str(e)}"))
+        self.search_generation += 1
+        self.more_button.setVisible(False)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
         
-        finally:
-            self.progress_bar.setVisible(False)
+        # État des recherches précédentes, lu par le worker sans le modifier
+        ranking, previous = self.ranking, self.previous_matches.get(table)
+        self.search_worker = SearchWorker(
+            self.search_generation, self.data_loader,
+            lambda cancelled: self.find_page(table, search_term, rank_by, start, start + SEARCH_PAGE_ROWS,
+                                             ranking, previous, cancelled),
+            make_row, row_context, self)
+        self.search_worker.batch.connect(self.on_search_batch)
+        self.search_worker.progress.connect(self.on_search_progress)
+        self.search_worker.done.connect(self.on_search_done)
+        self.search_worker.failed.connect(self.on_search_failed)
+        self.search_worker.finished.connect(self.search_worker.deleteLater)
+        self.search_worker.start()
+    
+    def cancel_search(self):
+        if self.search_worker is not None:
+            self.search_worker.requestInterruption()
+            self.search_worker = None
+        self.search_generation += 1
+        self.current_search = None
+        self.shown_rows = []
+        self.more_button.setVisible(False)
+    
+    def show_more_button(self):
+        remaining = self.n_matches - len(self.shown_rows)
+        self.more_button.setText(f"Plus de résultats ({len(self.shown_rows)} sur {self.n_matches})")
+        self.more_button.setVisible(remaining > 0)
+        if not self.shown_rows:
+            self.results.set_message("No results found")
+    
+    def on_search_batch(self, generation, results):
+        if generation != self.search_generation:
+            return  # Résultats d'une recherche remplacée
+        self.shown_rows.extend(results)
+        self.results.append_rows(results)
+    
+    def on_search_progress(self, generation, percent):
+        if generation == self.search_generation:
+            self.progress_bar.setValue(percent)
+    
+    def on_search_done(self, generation, n_matches, ranking):
+        if generation != self.search_generation:
+            return
+        self.search_worker = None
+        self.progress_bar.setVisible(False)
+        self.n_matches = n_matches
+        # Classement gardé pour les pages suivantes, noms trouvés pour restreindre un terme prolongé
+        self.ranking = ranking
+        (table, search_term), frame, name_matches = ranking[:3]
+        self.previous_matches[table] = (search_term, frame, name_matches)
+        # Pas de résultat peut venir d'un index approximatif pas encore prêt : rien n'est gardé
+        if self.shown_rows and self.current_search[2] is not None:
+            self.result_cache.put(*self.current_search, list(self.shown_rows), self.n_matches)
+        self.show_more_button()
+    
+    def on_search_failed(self, generation, message):
+        if generation != self.search_generation:
+            return
+        self.search_worker = None
+        self.progress_bar.setVisible(False)
+        self.results.set_message(f"Error during search: {message}")
 
     def open_url(self, url):
         try:
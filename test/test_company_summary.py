@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import pandas as pd
+from company_summary import company_row, company_summary
+from data_loader import DataLoader, DataStore
+from search_worker import startup_row, startup_summary
+from test_data_loader import write_sample_data
+
+
+class TestCompanySummary(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        write_sample_data(self.data_dir)
+        # Le tour le plus récent de c:1 n'est pas le dernier du fichier
+        pd.DataFrame({
+            'id': [1, 2, 3, 4],
+            'object_id': ['c:1', 'c:1', 'c:1', 'c:2'],
+            'funded_at': ['2005-01-01', '2009-06-01', '2007-03-01', None],
+            'funding_round_code': ['seed', 'b', 'a', 'angel'],
+            'raised_amount': [1000.0, 5000.0, 2000.0, None],
+            'raised_amount_usd': [1000.0, 5000.0, 2000.0, None],
+            'pre_money_valuation_usd': [None, None, 8000.0, None],
+        }).to_csv(os.path.join(self.data_dir, 'funding_rounds.csv'), index=False)
+        pd.DataFrame({
+            'id': [1, 2, 3],
+            'object_id': ['c:1', 'c:1', 'c:2'],
+            'milestone_at': ['2010-01-01', '2003-01-01', '2004-01-01'],
+            'source_url': ['http://late', 'http://early', None],
+        }).to_csv(os.path.join(self.data_dir, 'milestones.csv'), index=False)
+        self.store = DataStore(self.data_dir)
+        self.summary = company_summary(self.store)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def company(self, company_id):
+        loader = DataLoader(self.store)
+        return company_row(self.summary, loader.id_keys([company_id])[0])
+
+    def test_latest_round_by_date(self):
+        acme = self.company('c:1')
+        self.assertEqual(acme['name'], 'Acme')
+        self.assertEqual(acme['latest_round_code'], 'b')
+        self.assertEqual(acme['latest_raised_amount'], 5000.0)
+        self.assertEqual(acme['total_raised_usd'], 8000.0)
+        self.assertEqual(acme['last_valuation_usd'], 8000.0)
+
+    def test_first_milestone_and_primary_office(self):
+        acme, globex = self.company('c:1'), self.company('c:2')
+        self.assertEqual(acme['milestone_url'], 'http://early')
+        self.assertEqual(acme['city'], 'Boston')
+        self.assertEqual(globex['city'], 'Paris')
+        self.assertTrue(pd.isna(globex['milestone_url']))
+        # Aucun montant connu : pas de total
+        self.assertEqual(globex['latest_round_code'], 'angel')
+        self.assertTrue(pd.isna(globex['total_raised_usd']))
+
+    def test_built_summary_without_reading(self):
+        self.assertIs(company_summary(self.store, build=False), self.summary)
+        other_dir = tempfile.mkdtemp()
+        try:
+            self.assertIsNone(company_summary(DataStore(other_dir), build=False))
+        finally:
+            shutil.rmtree(other_dir)
+
+    def test_unknown_company(self):
+        self.assertIsNone(self.company('c:99'))
+
+    def test_startup_row(self):
+        loader = DataLoader(self.store)
+        loader.load(['objects'], n_rows=None)
+        acme = loader.objects.iloc[0].to_dict()
+        self.assertEqual(startup_row(loader, acme, startup_summary(loader)),
+                         ['Acme', 'web', 'operating', '2001-05-01', ('View', 'http://early'),
+                          'b', '$5,000.00', '$8,000.00'])
+        # Sans résumé : les seules colonnes de l'entreprise
+        self.assertEqual(startup_row(loader, acme, None)[:5], ['Acme', 'web', 'operating', '2001-05-01', 'N/A'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,8 +5,58 @@ import os
 # Ajout du chemin du projet au PYTHONPATH
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import shutil
+import tempfile
+from unittest.mock import patch
+import numpy as np
 import pandas as pd
-from data_loader import DataLoader  
+from data_loader import (DataLoader, DataStore, RowIndex, SchemaError, apply_schema, decode_frame,
+                         decode_id, decode_ids, encode_id, encode_ids, feather,
+                         schema_signature, stream_filter, stream_group_count,
+                         stream_group_sum, stream_top_k)
+
+
+def write_sample_data(data_dir):
+    """Write a tiny Crunchbase-like dataset into data_dir"""
+    pd.DataFrame({
+        'id': [1, 2, 3],
+        'object_id': ['p:1', 'p:2', 'p:3'],
+        'first_name': ['John', 'Jane', 'Omar'],
+        'last_name': ['Smith', 'Doe', 'Khan'],
+        'affiliation_name': ['Acme', None, 'Globex'],
+    }).to_csv(os.path.join(data_dir, 'people.csv'), index=False)
+    pd.DataFrame({
+        'id': ['c:1', 'c:2'],
+        'name': ['Acme', 'Globex'],
+        'category_code': ['web', 'biotech'],
+        'status': ['operating', 'ipo'],
+        'founded_at': ['2001-05-01', None],
+    }).to_csv(os.path.join(data_dir, 'objects.csv'), index=False)
+    pd.DataFrame({
+        'id': [1, 2, 3],
+        'object_id': ['p:1', 'p:1', 'p:3'],
+        'degree_type': ['BS', 'MBA', 'PhD'],
+        'subject': ['CS', None, 'Biology'],
+        'institution': ['MIT', 'Stanford University', 'Harvard University'],
+        'graduated_at': ['1995-01-01', '2000-01-01', None],
+    }).to_csv(os.path.join(data_dir, 'degrees.csv'), index=False)
+    pd.DataFrame({
+        'id': [1, 2, 3],
+        'object_id': ['c:1', 'c:2', 'c:2'],
+        'city': ['Boston', 'Paris', 'Lyon'],
+        'state_code': ['MA', None, None],
+        'country_code': ['USA', 'FRA', 'FRA'],
+        'latitude': [42.3, 48.8, None],
+        'longitude': [-71.0, 2.3, None],
+        'region': ['Boston', 'Paris', 'Lyon'],
+    }).to_csv(os.path.join(data_dir, 'offices.csv'), index=False)
+    pd.DataFrame({
+        'id': [1, 2],
+        'relationship_id': [1, 2],
+        'person_object_id': ['p:1', 'p:3'],
+        'relationship_object_id': ['c:1', 'c:2'],
+        'title': ['Founder', 'CEO'],
+    }).to_csv(os.path.join(data_dir, 'relationships.csv'), index=False)
 
 class TestDataLoader(unittest.TestCase):
     def setUp(self):
@@ -45,5 +95,338 @@ class TestDataLoader(unittest.TestCase):
         except Exception as e:
             self.fail(f"Data type check raised {type(e).__name__} unexpectedly!")
 
+
+class TestDataStore(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        write_sample_data(self.data_dir)
+        self.store = DataStore(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_tables_are_shared(self):
+        first = DataLoader(self.store)
+        second = DataLoader(self.store)
+        first.load_data_map()
+        second.load_data_map()
+        self.assertIs(first.offices, second.offices)
+
+    def test_largest_budget_is_served(self):
+        small = DataLoader(self.store)
+        large = DataLoader(self.store)
+        small.load_data_network(n_rows=1)
+        self.assertEqual(len(small.people), 1)
+        large.load_data_network(n_rows=None)
+        self.assertEqual(len(large.people), 3)
+        self.assertEqual(self.store.loaded_tables()['people'], None)
+        # Le petit consommateur garde son budget, en vue sur le tableau partagé
+        self.assertEqual(len(small.people), 1)
+        self.assertTrue(np.shares_memory(small.people['id'].to_numpy(), large.people['id'].to_numpy()))
+
+    def test_widened_budget_stays_per_table(self):
+        loader = DataLoader(self.store)
+        loader.load(['people'], n_rows=None)
+        loader.load(['people', 'degrees'], n_rows=1)
+        self.assertEqual(len(loader.people), 3)
+        self.assertEqual(len(loader.degrees), 1)
+
+    def test_loaded_table_taken_on_declaration(self):
+        first = DataLoader(self.store)
+        first.load(['people'], n_rows=None)
+        self.assertIsNotNone(first.people)
+        # Déjà chargée : prise dès la déclaration, elle survit au départ du premier
+        second = DataLoader(self.store)
+        second.load(['people'], n_rows=2, columns={'people': ['id']})
+        first.release()
+        self.assertEqual(set(self.store.loaded_tables()), {'people'})
+        # Pas encore chargée : rien n'est lu avant le premier accès
+        second.load(['degrees'])
+        self.assertFalse(self.store.is_loaded('degrees'))
+
+    def test_projections_are_merged(self):
+        map_loader = DataLoader(self.store)
+        search_loader = DataLoader(self.store)
+        map_loader.load_data_map(columns={'objects': ['id', 'name']})
+        self.assertEqual(list(map_loader.objects.columns), ['id', 'name'])
+        search_loader.load_data_map(columns={'objects': ['id', 'status']})
+        self.assertEqual(list(search_loader.objects.columns), ['id', 'name', 'status'])
+        self.assertEqual(list(map_loader.objects.columns), ['id', 'name', 'status'])
+        self.assertEqual(list(map_loader.offices.columns)[:2], ['id', 'object_id'])
+
+    def test_projection_ignores_unknown_columns(self):
+        loader = DataLoader(self.store)
+        loader.load_data_map(columns={'objects': ['id', 'unknown']})
+        self.assertEqual(list(loader.objects.columns), ['id'])
+        strict = DataLoader(DataStore(self.data_dir, schema='strict'))
+        strict.load_data_map(columns={'objects': ['id', 'unknown']})
+        self.assertIsNone(strict.objects)
+
+    def test_release_evicts_unused_tables(self):
+        first = DataLoader(self.store)
+        second = DataLoader(self.store)
+        first.load_data_map()
+        second.load_data_map()
+        first.release()
+        self.assertIsNone(first.offices)
+        self.assertIsNotNone(second.offices)
+        second.release()
+        self.assertEqual(self.store.loaded_tables(), {})
+
+    def test_tables_load_on_first_access(self):
+        loader = DataLoader(self.store)
+        loader.load_data_map()
+        self.assertEqual(self.store.loaded_tables(), {})
+        self.assertIsNotNone(loader.objects)
+        self.assertEqual(list(self.store.loaded_tables()), ['objects'])
+
+    def test_prefetch(self):
+        loader = DataLoader(self.store)
+        loader.load_data_network()
+        loader.prefetch(['people', 'degrees']).join()
+        self.assertTrue(self.store.is_loaded('people'))
+        self.assertTrue(self.store.is_loaded('degrees'))
+        self.assertFalse(self.store.is_loaded('relationships'))
+
+    def test_load_all_reports_progress(self):
+        loader = DataLoader(self.store)
+        loader.load_data_network()
+        progress = []
+        self.assertTrue(loader.load_all(workers=2, progress=lambda *args: progress.append(args)))
+        self.assertEqual(sorted(name for name, _, _ in progress), ['degrees', 'people', 'relationships'])
+        self.assertEqual([(done, total) for _, done, total in progress], [(1, 3), (2, 3), (3, 3)])
+        self.assertEqual(sorted(self.store.loaded_tables()), ['degrees', 'people', 'relationships'])
+
+    def test_load_all_fails_on_unreadable_table(self):
+        with open(os.path.join(self.data_dir, 'relationships.csv'), 'w') as f:
+            f.write('')
+        loader = DataLoader(self.store)
+        loader.load_data_network()
+        self.assertFalse(loader.load_all())
+        self.assertIsNotNone(loader.people)
+
+    def test_concurrent_access_loads_once(self):
+        reads = []
+        read = self.store._read
+        self.store._read = lambda *args: reads.append(args[0]) or read(*args)
+        loaders = [DataLoader(self.store) for _ in range(4)]
+        for loader in loaders:
+            loader.load_data_network()
+        threads = [loader.prefetch(['people']) for loader in loaders]
+        for thread in threads:
+            thread.join()
+        self.assertEqual(reads, ['people'])
+
+    def test_missing_file(self):
+        loader = DataLoader(self.store)
+        self.assertFalse(loader.load_data())
+
+    def test_startup_locations(self):
+        loader = DataLoader(self.store)
+        loader.load_data_map()
+        locations = loader.get_startup_locations()
+        self.assertEqual(list(locations['city']), ['Boston', 'Paris'])
+
+
+class TestSchema(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        write_sample_data(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_declared_dtypes(self):
+        loader = DataLoader(DataStore(self.data_dir))
+        loader.load_data_map()
+        self.assertEqual(loader.objects['status'].dtype, 'category')
+        self.assertEqual(loader.offices['country_code'].dtype, 'category')
+        self.assertEqual(loader.offices['latitude'].dtype, 'float32')
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(loader.objects['founded_at']))
+        self.assertTrue(pd.isna(loader.objects['founded_at'].iloc[1]))
+
+    def test_infer_mode_keeps_pandas_dtypes(self):
+        loader = DataLoader(DataStore(self.data_dir, schema='infer'))
+        loader.load_data_map()
+        self.assertEqual(loader.objects['status'].dtype, object)
+
+    def test_typed_mode_tolerates_bad_values(self):
+        frame = pd.DataFrame({'id': [1, 2], 'graduated_at': ['2001-01-01', 'someday']})
+        typed = apply_schema(frame.copy(), 'degrees')
+        self.assertTrue(pd.isna(typed['graduated_at'].iloc[1]))
+
+    def test_typed_mode_nullable_ints(self):
+        # Entiers avec valeurs manquantes : type nullable plutôt que float64
+        typed = apply_schema(pd.DataFrame({'id': [1, None, 3]}), 'people')
+        self.assertEqual(typed['id'].dtype, 'Int32')
+        self.assertTrue(pd.isna(typed['id'].iloc[1]))
+        # Valeurs invalides : type inféré gardé, et signalé
+        with patch('builtins.print') as report:
+            typed = apply_schema(pd.DataFrame({'id': ['1', 'x']}), 'people')
+        self.assertEqual(typed['id'].dtype, object)
+        self.assertIn('people.id', report.call_args[0][0])
+
+    def test_strict_mode(self):
+        frame = pd.DataFrame({'id': [1, 2], 'graduated_at': ['2001-01-01', 'someday']})
+        with self.assertRaises(SchemaError):
+            apply_schema(frame, 'degrees', strict=True)
+        with self.assertRaises(ValueError):
+            DataStore(self.data_dir, schema='guess')
+
+
+class TestIds(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        write_sample_data(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_round_trip(self):
+        keys = encode_ids(['p:1697', 'c:123', None, 'bad', 'p:1697'])
+        self.assertEqual(keys.dtype, 'Int64')
+        self.assertEqual(keys[0], keys[4])
+        self.assertNotEqual(encode_id('p:1'), encode_id('c:1'))
+        self.assertTrue(keys[2:4].isna().all())
+        self.assertEqual(list(decode_ids(keys)[:2]), ['p:1697', 'c:123'])
+        self.assertEqual(decode_id(encode_id('fin:42')), 'fin:42')
+        self.assertEqual(decode_id('p:3'), 'p:3')
+
+    def test_ids_join_across_tables(self):
+        for use_cache in (True, False):
+            loader = DataLoader(DataStore(self.data_dir, use_cache=use_cache))
+            loader.load_data_network()
+            self.assertEqual(loader.degrees['object_id'].dtype, 'Int64')
+            merged = loader.degrees.merge(loader.people, on='object_id')
+            self.assertEqual(list(merged['first_name']), ['John', 'John', 'Omar'])
+            self.assertEqual(loader.id_keys(['p:3', 'oops']), [loader.people['object_id'][2]])
+            self.assertEqual(list(decode_frame(loader.people, 'people')['object_id']),
+                             ['p:1', 'p:2', 'p:3'])
+
+    def test_row_index(self):
+        index = RowIndex(pd.Series(['b', 'a', None, 'b', 'c', 'b']))
+        self.assertEqual(len(index), 3)
+        self.assertEqual(list(index.rows('b')), [0, 3, 5])
+        self.assertEqual(list(index.rows('b', limit=4)), [0, 3])
+        self.assertEqual(list(index.rows('z')), [])
+        self.assertNotIn(None, index)
+
+    def test_lookup(self):
+        loader = DataLoader(DataStore(self.data_dir))
+        loader.load_data_network()
+        degrees = loader.lookup('degrees', encode_id('p:1'))
+        self.assertEqual(list(degrees['degree_type']), ['BS', 'MBA'])
+        self.assertTrue(loader.lookup('degrees', encode_id('p:2')).empty)
+        self.assertEqual(list(loader.lookup('relationships', encode_id('p:3'))['title']), ['CEO'])
+        self.assertIs(loader.store.index('degrees', 'object_id'),
+                      loader.store.index('degrees', 'object_id'))
+        # Un loader au budget plus petit ne voit que son préfixe
+        small = DataLoader(loader.store)
+        small.load(['degrees'], n_rows=1)
+        self.assertEqual(list(small.lookup('degrees', encode_id('p:1'))['degree_type']), ['BS'])
+        self.assertIsNone(small.lookup('people', encode_id('p:1')))
+
+    def test_strict_mode_rejects_bad_ids(self):
+        frame = pd.DataFrame({'object_id': ['p:1', 'nope']})
+        with self.assertRaises(SchemaError):
+            apply_schema(frame, 'degrees', strict=True)
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        write_sample_data(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def chunks(self, name, columns=None, use_cache=True):
+        loader = DataLoader(DataStore(self.data_dir, use_cache=use_cache))
+        return loader.iter_chunks(name, columns, chunksize=2)
+
+    def test_chunks_cover_the_table(self):
+        for use_cache in (True, False):
+            chunks = list(self.chunks('offices', ['city', 'country_code'], use_cache))
+            self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+            self.assertEqual(list(chunks[0].columns), ['city', 'country_code'])
+            self.assertEqual(chunks[1]['country_code'].dtype, 'category')
+
+    def test_group_count_and_sum(self):
+        counts = stream_group_count(self.chunks('offices'), 'country_code')
+        self.assertEqual(counts.to_dict(), {'FRA': 2, 'USA': 1})
+        sums = stream_group_sum(self.chunks('offices'), 'country_code', 'latitude')
+        self.assertAlmostEqual(sums['FRA'], 48.8, places=4)
+        by_year = stream_group_count(self.chunks('objects'),
+                                     lambda chunk: chunk['founded_at'].dt.year,
+                                     where=lambda chunk: chunk['status'] == 'operating')
+        self.assertEqual(by_year.to_dict(), {2001: 1})
+
+    def test_top_k_and_filter(self):
+        top = stream_top_k(self.chunks('offices'), 'latitude', 1)
+        self.assertEqual(list(top['city']), ['Paris'])
+        matched = stream_filter(self.chunks('degrees'), lambda chunk: chunk['object_id'] == encode_id('p:1'))
+        self.assertEqual(list(matched['degree_type']), ['BS', 'MBA'])
+        empty = stream_filter(self.chunks('degrees'), lambda chunk: chunk['object_id'] == encode_id('p:9'))
+        self.assertIn('degree_type', empty.columns)
+
+
+@unittest.skipIf(feather is None, "pyarrow is not installed")
+class TestTableCache(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        write_sample_data(self.data_dir)
+        self.csv_path = os.path.join(self.data_dir, 'people.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def load_people(self, n_rows=None):
+        return DataStore(self.data_dir).acquire(self, 'people', n_rows)
+
+    def is_fresh(self):
+        cache = DataStore(self.data_dir).cache
+        return cache.is_fresh('people', self.csv_path, schema_signature('people', 'typed'))
+
+    def test_cache_is_built_and_reused(self):
+        first = self.load_people(n_rows=2)
+        self.assertEqual(len(first), 2)
+        self.assertTrue(self.is_fresh())
+        second = self.load_people()
+        self.assertEqual(list(second['first_name']), ['John', 'Jane', 'Omar'])
+
+    def test_cache_rebuilt_when_csv_changes(self):
+        self.load_people()
+        with open(self.csv_path, 'a') as f:
+            f.write("4,p:4,Anna,Lee,\n")
+        self.assertEqual(len(self.load_people()), 4)
+
+    def test_cached_dtypes_match_csv(self):
+        pd.DataFrame({
+            'id': [1, 2, 3],
+            'relationship_id': [1, None, 3],
+            'person_object_id': ['p:1', 'p:2', 'p:3'],
+            'relationship_object_id': ['c:1', 'c:2', 'c:2'],
+            'is_past': [1, None, 0],
+            'title': ['Founder', 'CEO', None],
+        }).to_csv(os.path.join(self.data_dir, 'relationships.csv'), index=False)
+        uncached = DataStore(self.data_dir, use_cache=False).acquire(self, 'relationships')
+        cached = DataStore(self.data_dir).acquire(self, 'relationships')
+        self.assertTrue(DataStore(self.data_dir).cache.is_fresh(
+            'relationships', os.path.join(self.data_dir, 'relationships.csv'),
+            schema_signature('relationships', 'typed')))
+        self.assertEqual(uncached['is_past'].dtype, 'Int8')
+        self.assertEqual(uncached['relationship_id'].dtype, 'Int32')
+        self.assertEqual(uncached['id'].dtype, 'int32')
+        pd.testing.assert_series_equal(cached.dtypes, uncached.dtypes)
+        for column in ('id', 'relationship_id', 'is_past'):
+            pd.testing.assert_series_equal(cached[column], uncached[column])
+
+    def test_touch_keeps_cache(self):
+        self.load_people()
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertTrue(self.is_fresh())
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,51 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from PyQt5.QtCore import Qt
+from data_loader import encode_ids
+from tabs.data_tab import BLOCK_ROWS, FETCH_ROWS, PandasModel
+
+
+class TestPandasModel(unittest.TestCase):
+    def setUp(self):
+        n_rows = FETCH_ROWS + BLOCK_ROWS + 5
+        self.frame = pd.DataFrame({
+            'object_id': encode_ids([f"p:{i}" if i % 7 else None for i in range(n_rows)]),
+            'amount': [i * 1.5 for i in range(n_rows)],
+            'name': [f"name {i}" for i in range(n_rows)],
+        })
+        self.model = PandasModel(self.frame, ['object_id'])
+
+    def cell(self, row, column):
+        return self.model.data(self.model.index(row, column))
+
+    def test_cells_match_str(self):
+        for row in (0, 1, BLOCK_ROWS - 1, BLOCK_ROWS, 3 * BLOCK_ROWS + 2):
+            self.assertEqual(self.cell(row, 0), f"p:{row}" if row % 7 else '<NA>')
+            self.assertEqual(self.cell(row, 1), str(self.frame['amount'].iloc[row]))
+            self.assertEqual(self.cell(row, 2), f"name {row}")
+
+    def test_rows_fetched_incrementally(self):
+        self.assertEqual(self.model.rowCount(), FETCH_ROWS)
+        self.assertTrue(self.model.canFetchMore())
+        self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(), len(self.frame))
+        self.assertFalse(self.model.canFetchMore())
+        last = len(self.frame) - 1
+        self.assertEqual(self.cell(last, 2), f"name {last}")
+
+    def test_sort_and_filter_through_view(self):
+        self.model.sort(1, Qt.DescendingOrder)
+        self.assertEqual(self.cell(0, 2), f"name {len(self.frame) - 1}")
+        self.model.set_filter('name', 'name 12')
+        self.assertEqual(self.model.rowCount(), len(self.model.view))
+        self.assertEqual([self.cell(row, 2) for row in range(2)], ["name 1299", "name 1298"])
+
+
+if __name__ == '__main__':
+    unittest.main()
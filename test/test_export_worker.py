@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QCoreApplication
+from data_loader import DataStore, encode_ids
+from export_worker import ExportCancelled, ExportWorker, export_chunks, view_chunks
+from test_data_loader import write_sample_data
+
+
+class TestExport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.frame = pd.DataFrame({
+            'object_id': encode_ids(['p:1', 'p:2', None, 'p:4', 'p:5']),
+            'name': ['a', 'b', 'c', None, 'e'],
+            'amount': [1.0, 2.0, np.nan, 4.0, 5.0],
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_formats_round_trip_filtered_rows(self):
+        rows = np.array([4, 0, 3])
+        expected = ['p:5', 'p:1', 'p:4']
+        for file_format, read in (('csv', pd.read_csv), ('parquet', pd.read_parquet),
+                                  ('xlsx', pd.read_excel)):
+            path = self.path(f"export.{file_format}")
+            n_rows = export_chunks(path, file_format, view_chunks(self.frame, rows, chunksize=2), 'people')
+            self.assertEqual(n_rows, 3)
+            exported = read(path)
+            self.assertEqual(exported['object_id'].tolist(), expected, file_format)
+            self.assertTrue(pd.isna(exported['name'].iloc[2]), file_format)
+            self.assertEqual(os.listdir(self.directory), [f"export.{file_format}"])
+            os.remove(path)
+
+    def test_cancelled_export_leaves_nothing(self):
+        progress = []
+        with self.assertRaises(ExportCancelled):
+            export_chunks(self.path('export.csv'), 'csv', view_chunks(self.frame, np.arange(5), chunksize=2),
+                          progress=progress.append, cancelled=lambda: len(progress) == 2)
+        self.assertEqual(progress, [2, 4])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_worker_exports_full_table(self):
+        write_sample_data(self.directory)
+        store = DataStore(self.directory)
+        path = self.path('people_export.csv')
+        worker = ExportWorker(path, 'csv', lambda: store.iter_chunks('people', chunksize=2),
+                              'people', store.row_count('people'))
+        progress, results = [], []
+        worker.progress.connect(lambda percent, message: progress.append(percent))
+        worker.done.connect(lambda success, message: results.append(success))
+        worker.run()
+        self.assertEqual(results, [True])
+        self.assertEqual(progress[-1], 100)
+        self.assertEqual(pd.read_csv(path)['object_id'].tolist(), ['p:1', 'p:2', 'p:3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
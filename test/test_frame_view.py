@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from data_loader import encode_ids
+from frame_view import FrameView
+
+
+class TestFrameView(unittest.TestCase):
+    def setUp(self):
+        self.frame = pd.DataFrame({
+            'object_id': encode_ids(['p:3', 'p:10', None, 'c:2', 'p:1']),
+            'name': ['Bob', 'alice', 'Carol', None, 'Dave'],
+            'amount': [300.0, np.nan, 100.0, 200.0, 50.0],
+        })
+        self.view = FrameView(self.frame, ['object_id'])
+
+    def names(self):
+        return self.frame['name'].take(self.view.rows).tolist()
+
+    def test_sort_missing_values_last(self):
+        self.view.sort('amount')
+        self.assertEqual(self.view.rows.tolist(), [4, 2, 3, 0, 1])
+        self.view.sort('amount', ascending=False)
+        self.assertEqual(self.view.rows.tolist(), [0, 3, 2, 4, 1])
+        self.assertEqual(len(self.view._orders), 1)
+        self.view.sort(None)
+        self.assertEqual(self.view.rows.tolist(), [0, 1, 2, 3, 4])
+
+    def test_text_and_comparison_filters(self):
+        self.view.set_filter('name', 'A')
+        self.assertEqual(self.names(), ['alice', 'Carol', 'Dave'])
+        self.view.set_filter('amount', '>= 100')
+        self.assertEqual(self.names(), ['Carol'])
+        self.view.set_filter('name', '')
+        self.view.sort('amount', ascending=False)
+        self.assertEqual(self.names(), ['Bob', None, 'Carol'])
+        self.view.clear_filters()
+        self.assertEqual(len(self.view), len(self.frame))
+
+    def test_id_filters(self):
+        self.view.set_filter('object_id', '= p:10')
+        self.assertEqual(self.view.rows.tolist(), [1])
+        self.view.set_filter('object_id', 'p:1')
+        self.assertEqual(self.view.rows.tolist(), [1, 4])
+        with self.assertRaises(ValueError):
+            self.view.set_filter('object_id', '= nope')
+        with self.assertRaises(ValueError):
+            self.view.set_filter('amount', '> abc')
+
+    def test_categorical_column(self):
+        # Catégories dans l'ordre d'apparition, comme celles lues dans le cache Feather
+        countries = pd.Categorical(['USA', 'FRA', None, 'DEU', 'ARG'], categories=['USA', 'FRA', 'DEU', 'ARG'])
+        view = FrameView(pd.DataFrame({'country_code': countries}))
+        view.sort('country_code')
+        self.assertEqual(view.rows.tolist(), [4, 3, 1, 0, 2])
+        view.sort('country_code', ascending=False)
+        self.assertEqual(view.rows.tolist(), [0, 1, 3, 4, 2])
+        view.set_filter('country_code', '> DEU')
+        self.assertEqual(view.rows.tolist(), [0, 1])
+        view.set_filter('country_code', 'us')
+        self.assertEqual(view.rows.tolist(), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
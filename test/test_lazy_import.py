@@ -0,0 +1,42 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+from lazy_import import import_report, lazy_import
+
+
+class TestLazyImport(unittest.TestCase):
+    def setUp(self):
+        self.module_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.module_dir, 'lazy_sample.py'), 'w') as f:
+            f.write("class Thing:\n    def __init__(self, value):\n        self.value = value\n"
+                    "ANSWER = 42\n")
+        sys.path.insert(0, self.module_dir)
+
+    def tearDown(self):
+        sys.path.remove(self.module_dir)
+        sys.modules.pop('lazy_sample', None)
+        shutil.rmtree(self.module_dir)
+
+    def test_module_imported_on_first_use(self):
+        sample = lazy_import('lazy_sample')
+        Thing = lazy_import('lazy_sample', 'Thing')
+        self.assertNotIn('lazy_sample', sys.modules)
+        self.assertEqual(Thing(3).value, 3)
+        self.assertIn('lazy_sample', sys.modules)
+        self.assertEqual(sample.ANSWER, 42)
+        self.assertIn('lazy_sample', dict(import_report()))
+
+    def test_missing_module_fails_on_use(self):
+        missing = lazy_import('no_such_module_here')
+        with self.assertRaises(ImportError):
+            missing.anything
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from data_loader import DataLoader, DataStore
+from profile_index import PROFILE_COLUMNS, ProfileIndex
+from search_index import TokenIndex, intersect_sorted
+from test_data_loader import write_sample_data
+
+
+class TestTokenIndex(unittest.TestCase):
+    def test_word_prefixes_and_accents(self):
+        index = TokenIndex(pd.Series(['Stanford University', 'Université de Paris', None, 'Stanford GSB']),
+                           [0, 1, 1, 0], 3)
+        self.assertEqual(list(index.search('univ')), [0, 1])
+        self.assertEqual(list(index.search('UNIVERSITE paris')), [1])
+        self.assertEqual(list(index.search('stan univ')), [0])
+        self.assertEqual(list(index.search('oxford')), [])
+        self.assertEqual(index.values(0), ['Stanford University', 'Stanford GSB'])
+        self.assertEqual(index.values(2), [])
+
+    def test_intersect_sorted(self):
+        lists = [np.array([1, 3, 5, 7, 9]), np.array([3, 4, 9]), np.array([0, 3, 9, 12])]
+        self.assertEqual(list(intersect_sorted(lists)), [3, 9])
+
+
+class TestProfileIndex(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        write_sample_data(self.data_dir)
+        loader = DataLoader(DataStore(self.data_dir))
+        loader.load(list(PROFILE_COLUMNS), n_rows=None, columns=PROFILE_COLUMNS)
+        self.people = loader.people
+        self.index = ProfileIndex(loader.people, loader.degrees, loader.relationships, loader.offices)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def names(self, criteria):
+        return [self.index.values('name', position)[0] for position in self.index.search(criteria)]
+
+    def test_single_fields(self):
+        self.assertEqual(self.names({'name': 'jo'}), ['John Smith'])
+        self.assertEqual(self.names({'institution': 'university'}), ['John Smith', 'Omar Khan'])
+        # Ville des bureaux des entreprises liées à la personne
+        self.assertEqual(self.names({'city': 'lyon'}), ['Omar Khan'])
+
+    def test_conjunctive_query(self):
+        self.assertEqual(self.names({'institution': 'univ', 'city': 'boston'}), ['John Smith'])
+        self.assertEqual(self.names({'name': 'omar', 'institution': 'mit'}), [])
+        self.assertEqual(self.names({'name': 'omar', 'institution': '', 'city': 'paris'}), ['Omar Khan'])
+        self.assertEqual(len(self.index.search({})), len(self.people))
+
+    def test_values(self):
+        omar = self.index.search({'name': 'khan'})[0]
+        self.assertEqual(self.index.values('institution', omar), ['Harvard University'])
+        self.assertEqual(self.index.values('city', omar), ['Paris', 'Lyon'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_cache import ResultCache, normalize_term, rows_size
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.rows = [['Acme', 'web', ('View', 'http://a')], ['Globex', 'N/A', 'N/A']]
+        self.cache = ResultCache(max_bytes=3 * rows_size(self.rows))
+
+    def test_hits_and_misses(self):
+        self.assertIsNone(self.cache.get("Search Startup", "acme", 'v1'))
+        self.cache.put("Search Startup", "acme", 'v1', self.rows)
+        self.assertEqual(self.cache.get("Search Startup", "  ACME ", 'v1'), (self.rows, 2))
+        self.cache.put("Search Startup", "acme", 'v1', self.rows, n_matches=40)
+        self.assertEqual(self.cache.get("Search Startup", "acme", 'v1')[1], 40)
+        self.assertIsNone(self.cache.get("Search Fund", "acme", 'v1'))
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+
+    def test_least_recently_used_evicted(self):
+        for term in ("a", "b", "c"):
+            self.cache.put("Search Person", term, 'v1', list(self.rows))
+        self.cache.get("Search Person", "a", 'v1')
+        self.cache.put("Search Person", "d", 'v1', list(self.rows))
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get("Search Person", "b", 'v1'))
+        self.assertIsNotNone(self.cache.get("Search Person", "a", 'v1'))
+        self.assertLessEqual(self.cache.n_bytes, self.cache.max_bytes)
+        # Un résultat plus gros que le plafond n'est pas gardé
+        self.cache.put("Search Person", "e", 'v1', self.rows * 10)
+        self.assertIsNone(self.cache.get("Search Person", "e", 'v1'))
+
+    def test_new_data_version_invalidates(self):
+        self.cache.put("Search Startup", "acme", 'v1', self.rows)
+        self.cache.put("Search Fund", "acme", 'v1', self.rows)
+        self.assertIsNone(self.cache.get("Search Startup", "acme", 'v2'))
+        self.assertEqual(len(self.cache), 1)
+        self.assertIsNotNone(self.cache.get("Search Fund", "acme", 'v1'))
+        self.cache.invalidate()
+        self.assertEqual((len(self.cache), self.cache.n_bytes), (0, 0))
+
+    def test_normalize_term(self):
+        self.assertEqual(normalize_term("  Sarah \t Martin "), "sarah martin")
+
+
+if __name__ == '__main__':
+    unittest.main()
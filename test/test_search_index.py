@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import numpy as np
+import pandas as pd
+from search_index import (RANK_EXACT, RANK_PREFIX, RANK_SUBSTRING, FuzzyIndex, TrigramIndex,
+                          edit_distance, scan_ranks, scan_search, top_k)
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+        syllables = ['an', 'na', 'ber', 'Lé', 'son', 'ma', 'ri', 'o ', '-t']
+        names = [''.join(random.choices(syllables, k=random.randint(1, 4))) for _ in range(40)]
+        self.frame = pd.DataFrame({
+            'first_name': random.choices(names, k=500),
+            'last_name': random.choices(names + [None], k=500),
+        })
+        self.index = TrigramIndex.from_frame(self.frame, ['first_name', 'last_name'])
+
+    def test_same_rows_as_scan(self):
+        terms = ['ber', 'BERSON', 'anna', 'lé', 'o -t', 'ri', 'a', 'zzz', 'maria', 'on']
+        for term in terms:
+            expected = [position for position, names in enumerate(self.frame.itertuples(index=False))
+                        if any(pd.notna(name) and term.lower() in name.lower() for name in names)]
+            self.assertEqual(self.index.search(term).tolist(), expected, term)
+            self.assertEqual(scan_search(self.frame, ['first_name', 'last_name'], term).tolist(), expected, term)
+
+    def test_narrowing_from_previous_matches(self):
+        columns = ['first_name', 'last_name']
+        previous = self.index.search('be')
+        for term in ['ber', 'bers', 'berson']:
+            narrowed = self.index.search(term, previous)
+            self.assertEqual(narrowed.tolist(), self.index.search(term).tolist(), term)
+            self.assertEqual(scan_search(self.frame, columns, term, previous).tolist(), narrowed.tolist(), term)
+            previous = narrowed
+
+    def test_terms_do_not_span_columns(self):
+        frame = pd.DataFrame({'first_name': ['John', 'Ann'], 'last_name': ['Smith', None]})
+        index = TrigramIndex.from_frame(frame, ['first_name', 'last_name'])
+        self.assertEqual(index.search('nsm').tolist(), [])
+        self.assertEqual(index.search('ohn').tolist(), [0])
+        self.assertEqual(index.search('none').tolist(), [])
+
+    def test_empty_and_short_texts(self):
+        index = TrigramIndex(['ab', None, np.nan, ''])
+        self.assertEqual(index.search('abc').tolist(), [])
+        self.assertEqual(index.search('ab').tolist(), [0])
+        self.assertEqual(len(TrigramIndex([]).search('abc')), 0)
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self):
+        self.frame = pd.DataFrame({
+            'first_name': ['John', 'Jon', 'Jane', 'Johnny', None, 'Maria'],
+            'last_name': ['Smith', 'Smyth', 'Smith', 'Walker', 'Smith', 'Garcia-Lopez'],
+        })
+        self.index = FuzzyIndex.from_frame(self.frame, ['first_name', 'last_name'])
+
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance('jonh', 'john', 2), 1)
+        self.assertEqual(edit_distance('smith', 'smyth', 2), 1)
+        self.assertEqual(edit_distance('smith', 'smith', 2), 0)
+        self.assertEqual(edit_distance('walker', 'smith', 2), 3)
+
+    def test_typos_ranked_by_score(self):
+        positions, scores = self.index.search('jonh smith')
+        self.assertEqual(positions[0], 0)
+        self.assertAlmostEqual(scores[0], (0.75 + 1) / 2)
+        self.assertEqual(list(scores), sorted(scores, reverse=True))
+        self.assertNotIn(3, positions)
+        positions, scores = self.index.search('John Smith', k=1)
+        self.assertEqual((positions.tolist(), scores.tolist()), ([0], [1.0]))
+
+    def test_words_of_each_column(self):
+        positions, _ = self.index.search('lopes')
+        self.assertEqual(positions.tolist(), [5])
+        self.assertEqual(len(self.index.search('zzzzzz')[0]), 0)
+        self.assertEqual(len(self.index.search('')[0]), 0)
+
+
+
+class TestRanking(unittest.TestCase):
+    def test_match_ranks(self):
+        frame = pd.DataFrame({'first_name': ['John', 'Johnny', 'Mary', 'Ajohn', None],
+                              'last_name': ['Smith', 'Smith', 'Johnson', 'Doe', 'John']})
+        index = TrigramIndex.from_frame(frame, ['first_name', 'last_name'])
+        positions = index.search('john')
+        expected = [RANK_EXACT, RANK_PREFIX, RANK_PREFIX, RANK_SUBSTRING, RANK_EXACT]
+        self.assertEqual(list(index.ranks(positions, 'john')), expected)
+        self.assertEqual(list(scan_ranks(frame, ['first_name', 'last_name'], positions, 'john')), expected)
+
+    def test_top_k_same_as_full_sort(self):
+        rng = np.random.default_rng(5)
+        for _ in range(200):
+            n = int(rng.integers(1, 50))
+            ranks = rng.integers(0, 4, n)
+            values = rng.choice([np.nan, 1.0, 2.0, 3.0], n)
+            k = int(rng.integers(0, n + 2))
+            order = np.lexsort((np.arange(n), -np.nan_to_num(values, nan=-np.inf), ranks))
+            self.assertEqual(list(top_k(ranks, k, values)), list(order[:k]))
+            self.assertEqual(list(top_k(ranks, k)), list(np.lexsort((np.arange(n), ranks))[:k]))
+
+
+if __name__ == '__main__':
+    unittest.main()
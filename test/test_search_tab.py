@@ -0,0 +1,51 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabs.search_tab import URL_ROLE, ResultsModel
+
+
+class TestResultsModel(unittest.TestCase):
+    def setUp(self):
+        self.model = ResultsModel(["Nom", "Date", "Lien"])
+        self.model.append_rows([['A', '2001', ('View', 'http://a')],
+                                ['B', 'N/A', 'N/A']])
+        self.model.append_rows([['C', '2003', 'N/A'],
+                                ['D', 'N/A', ('View', 'http://d')]])
+
+    def column(self, column):
+        return [self.model.data(self.model.index(row, column)) for row in range(self.model.rowCount())]
+
+    def test_rows_and_links(self):
+        self.assertEqual(self.column(0), ['A', 'B', 'C', 'D'])
+        self.assertEqual(self.column(2), ['View', 'N/A', 'N/A', 'View'])
+        self.assertEqual(self.model.data(self.model.index(3, 2), URL_ROLE), 'http://d')
+        self.assertIsNone(self.model.data(self.model.index(1, 2), URL_ROLE))
+
+    def test_na_filter(self):
+        self.model.set_hidden_na([False, True, False])
+        self.assertEqual(self.column(0), ['A', 'C'])
+        self.model.set_hidden_na([False, True, True])
+        self.assertEqual(self.column(0), ['A'])
+        # Les lots suivants sont filtrés à leur arrivée
+        self.model.append_rows([['E', '2005', ('View', 'http://e')], ['F', '2006', 'N/A']])
+        self.assertEqual(self.column(0), ['A', 'E'])
+        self.model.set_hidden_na([False, False, False])
+        self.assertEqual(len(self.model), 6)
+        self.assertEqual(self.column(0), ['A', 'B', 'C', 'D', 'E', 'F'])
+
+    def test_growth_and_message(self):
+        self.model.append_rows([[str(i), 'N/A' if i % 2 else '2000', 'N/A'] for i in range(5000)])
+        self.model.set_hidden_na([False, True, False])
+        self.assertEqual(self.model.rowCount(), 2 + 2500)
+        self.model.clear()
+        self.model.set_message("No results found")
+        self.assertEqual(self.model.rowCount(), 1)
+        self.assertEqual(self.column(0), ["No results found"])
+
+
+if __name__ == '__main__':
+    unittest.main()
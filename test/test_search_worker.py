@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from PyQt5.QtCore import QCoreApplication
+from search_worker import SEARCH_BATCH_ROWS, SearchWorker, fund_row
+
+
+class TestSearchWorker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        n_funds = 2 * SEARCH_BATCH_ROWS + 10
+        self.funds = pd.DataFrame({
+            'name': [f"Fund {i}" for i in range(n_funds)],
+            'funded_at': pd.date_range('2000-01-01', periods=n_funds, freq='D'),
+            'raised_amount': [1000.0] * (n_funds - 1) + [None],
+            'source_description': ['press'] * n_funds,
+            'source_url': [None] + ['http://example.com'] * (n_funds - 1),
+        })
+
+    def run_worker(self, find, interrupt_after=None, make_row=fund_row, row_context=None):
+        worker = SearchWorker(7, None, find, make_row, row_context)
+        batches, progress, done, failed = [], [], [], []
+        if interrupt_after is not None:
+            # run() est appelé directement : on simule requestInterruption()
+            worker.isInterruptionRequested = lambda: len(batches) >= interrupt_after
+        worker.batch.connect(lambda generation, rows: batches.append((generation, rows)))
+        worker.progress.connect(lambda generation, percent: progress.append(percent))
+        worker.done.connect(lambda generation, n_matches, state: done.append((generation, n_matches, state)))
+        worker.failed.connect(lambda generation, message: failed.append(message))
+        worker.run()
+        return batches, progress, done, failed
+
+    def test_results_streamed_in_batches(self):
+        batches, progress, done, failed = self.run_worker(lambda cancelled: (self.funds, len(self.funds), None))
+        self.assertEqual([len(rows) for _, rows in batches], [SEARCH_BATCH_ROWS, SEARCH_BATCH_ROWS, 10])
+        self.assertTrue(all(generation == 7 for generation, _ in batches))
+        self.assertEqual(batches[0][1][0], ['Fund 0', '2000-01-01', '$1,000.00', 'press', 'N/A'])
+        self.assertEqual(batches[-1][1][-1][:3], [f"Fund {len(self.funds) - 1}", '2000-07-28', 'N/A'])
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(progress[-1], 100)
+        self.assertEqual(done, [(7, len(self.funds), None)])
+        self.assertEqual(failed, [])
+
+    def test_match_count_of_a_page(self):
+        # Une page des premiers résultats : done donne le nombre total de correspondances
+        batches, _, done, _ = self.run_worker(lambda cancelled: (self.funds.iloc[:10], 500, 'state'))
+        self.assertEqual(sum(len(rows) for _, rows in batches), 10)
+        self.assertEqual(done, [(7, 500, 'state')])
+
+    def test_row_context_read_once(self):
+        contexts = []
+
+        def row_context(data_loader):
+            contexts.append(data_loader)
+            return 'context'
+        batches, _, done, _ = self.run_worker(lambda cancelled: (self.funds, len(self.funds), None),
+                                              make_row=lambda data_loader, fund, context: [fund['name'], context],
+                                              row_context=row_context)
+        self.assertEqual(contexts, [None])
+        self.assertEqual(batches[0][1][0], ['Fund 0', 'context'])
+        self.assertEqual(done, [(7, len(self.funds), None)])
+
+    def test_interrupted_search_stops(self):
+        batches, progress, done, failed = self.run_worker(lambda cancelled: (self.funds, len(self.funds), None),
+                                                          interrupt_after=1)
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(done, [])
+
+    def test_search_cancelled_while_finding(self):
+        # find s'arrête de lui-même : rien n'est émis
+        def find(cancelled):
+            return None if cancelled() else (self.funds, len(self.funds), None)
+        batches, progress, done, failed = self.run_worker(find, interrupt_after=0)
+        self.assertEqual((batches, progress, done, failed), ([], [], [], []))
+
+    def test_error_reported(self):
+        def find(cancelled):
+            raise KeyError('name')
+        batches, progress, done, failed = self.run_worker(find)
+        self.assertEqual((batches, done), ([], []))
+        self.assertEqual(len(failed), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+from data_loader import DataLoader, DataStore
+from snapshot import MISSING, SnapshotStore, snapshot_key
+from test_data_loader import write_sample_data
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.snapshots = SnapshotStore(os.path.join(self.directory, 'snapshots'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        key = snapshot_key([['people', 'v1', None, None]], {'BS': 1})
+        self.assertIs(self.snapshots.load('model', key), MISSING)
+        self.assertTrue(self.snapshots.save('model', key, {'answer': 42}))
+        self.assertEqual(self.snapshots.load('model', key), {'answer': 42})
+        self.assertIs(self.snapshots.load('model', snapshot_key([['people', 'v2', None, None]])), MISSING)
+        self.snapshots.clear()
+        self.assertIs(self.snapshots.load('model', key), MISSING)
+
+    def test_corrupt_file_is_ignored(self):
+        os.makedirs(self.snapshots.directory)
+        with open(os.path.join(self.snapshots.directory, 'model.pkl'), 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertIs(self.snapshots.load('model', 'key'), MISSING)
+
+
+class TestLoaderSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        write_sample_data(self.data_dir)
+        self.calls = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def count_people(self, loader):
+        def compute():
+            self.calls += 1
+            return len(loader.people)
+        return loader.snapshot('people_count', ['people'], compute)
+
+    def new_loader(self):
+        loader = DataLoader(DataStore(self.data_dir))
+        loader.load(['people'], n_rows=None)
+        return loader
+
+    def test_restored_until_data_changes(self):
+        self.assertEqual(self.count_people(self.new_loader()), 3)
+        self.assertEqual(self.count_people(self.new_loader()), 3)
+        self.assertEqual(self.calls, 1)
+        with open(os.path.join(self.data_dir, 'people.csv'), 'a') as f:
+            f.write("4,p:4,Anna,Lee,\n")
+        self.assertEqual(self.count_people(self.new_loader()), 4)
+        self.assertEqual(self.calls, 2)
+
+    def test_row_budget_is_part_of_the_key(self):
+        self.count_people(self.new_loader())
+        loader = DataLoader(DataStore(self.data_dir))
+        loader.load(['people'], n_rows=2)
+        self.assertEqual(self.count_people(loader), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
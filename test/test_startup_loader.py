@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+from PyQt5.QtCore import QCoreApplication, Qt
+from data_loader import DataLoader, DataStore
+from startup_loader import StartupLoader
+from test_data_loader import write_sample_data
+
+
+class MapLikeTab:
+    DATA_REQUESTS = {'offices': (2, ['object_id', 'city']), 'objects': (None, None)}
+
+
+# Stores reçus par la construction des données dérivées
+derived_stores = []
+
+
+def build_derived(store):
+    derived_stores.append(store)
+
+
+class SearchLikeTab:
+    DATA_REQUESTS = {'offices': (None, ['object_id', 'country_code']),
+                     'funds': (10, None)}  # pas de fichier funds.csv
+    STREAMED_TABLES = ['degrees']
+    DERIVED_DATA = [build_derived]
+
+
+class TestStartupLoader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        write_sample_data(self.data_dir)
+        self.store = DataStore(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def run_loader(self, process_events=True, on_stage_ready=None):
+        loader = StartupLoader([('map', "Carte", MapLikeTab), ('search', "Recherche", SearchLikeTab)],
+                               self.store)
+        progress, stages = [], []
+        loader.progress.connect(lambda value, message: progress.append(value))
+        loader.stage_ready.connect(stages.append)
+        loader.derived_ready.connect(lambda key: stages.append(f"{key} derived"))
+        if on_stage_ready is not None:
+            # Appelé sur le thread du loader, au moment même de l'émission
+            loader.stage_ready.connect(on_stage_ready, Qt.DirectConnection)
+        loader.start()
+        self.assertTrue(loader.wait(10000))
+        if process_events:
+            QCoreApplication.processEvents()
+        return loader, progress, stages
+
+    def test_stages_report_real_progress(self):
+        loader, progress, stages = self.run_loader()
+        self.assertEqual(stages, ['map', 'map derived', 'search', 'search derived'])
+        self.assertIs(derived_stores[-1], self.store)
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(progress[-1], 100)
+
+    def test_each_stage_loads_its_own_tables(self):
+        ready = {}
+
+        def on_stage_ready(key):
+            ready[key] = (self.store.loaded_tables(), set(self.store.get('offices').columns),
+                          len(derived_stores))
+        n_derived = len(derived_stores)
+        self.run_loader(process_events=False, on_stage_ready=on_stage_ready)
+        # La carte est prête avec ses seules tables, avant tout travail des onglets suivants
+        self.assertEqual(ready['map'], ({'offices': 2, 'objects': None}, {'object_id', 'city'}, n_derived))
+        # Puis offices est élargi aux besoins de la recherche ; ses données dérivées viennent après
+        self.assertEqual(ready['search'], ({'offices': None, 'objects': None},
+                                           {'object_id', 'city', 'country_code'}, n_derived))
+
+    def test_tables_loaded_with_every_tab_needs(self):
+        # Signaux pas encore traités : le loader garde ses tables
+        loader, _, _ = self.run_loader(process_events=False)
+        # offices est servi avec l'union des lignes et des colonnes
+        self.assertEqual(self.store.loaded_tables(), {'offices': None, 'objects': None})
+        self.assertEqual(set(self.store.get('offices').columns), {'object_id', 'city', 'country_code'})
+        self.assertIsNotNone(self.store.index('offices', 'object_id'))
+        if self.store.cache is not None:
+            self.assertTrue(os.path.exists(os.path.join(self.data_dir, '.cache', 'degrees.feather')))
+
+    def tab_loader(self, tab):
+        loader = DataLoader(self.store)
+        for name, (n_rows, columns) in tab.DATA_REQUESTS.items():
+            if loader.has_table(name):
+                loader.load([name], n_rows, {name: columns})
+        return loader
+
+    def test_tab_built_after_finished_reads_nothing(self):
+        loader, _, _ = self.run_loader()
+        reads = []
+        read = self.store._read
+        self.store._read = lambda *args: reads.append(args) or read(*args)
+        tab_loader = self.tab_loader(MapLikeTab)
+        self.assertEqual(len(tab_loader.offices), 2)
+        self.assertIsNotNone(tab_loader.objects)
+        self.assertEqual(reads, [])
+
+    def test_stage_released_once_its_tab_holds_its_tables(self):
+        loader, _, _ = self.run_loader()
+        # Déclarées seulement : l'onglet prend déjà les tables chargées
+        tab_loader = self.tab_loader(MapLikeTab)
+        loader.release_stage('map')
+        loader.release_stage('search')
+        self.assertEqual(set(self.store.loaded_tables()), {'offices', 'objects'})
+        tab_loader.release()
+        self.assertEqual(self.store.loaded_tables(), {})
+
+if __name__ == '__main__':
+    unittest.main()